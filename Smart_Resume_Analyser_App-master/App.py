@@ -15,32 +15,30 @@ except LookupError:
 from nltk.tokenize import word_tokenize
 import base64, random
 import datetime
-from custom_parser import CustomResumeParser
+import tempfile
 from resume_scorer import ResumeScorer
-from course_recommender import CourseRecommender
-from constants import UPLOAD_DIR, DB_PATH, DB_FILE
+from constants import (
+    UPLOAD_DIR, APPLICATION_STATUSES, APPLICATION_PAGE_SIZES,
+    JOB_POLL_SECONDS, ANALYSIS_VERSION, EXPORT_DIR, EXPORT_MAX_DOWNLOAD_BYTES
+)
 from database_utils import (
-    init_db, get_user_data, delete_user, delete_admin,
-    insert_user_data
+    get_user_data, get_user_data_values, delete_user, delete_admin
 )
 from ui_utils import (
     get_custom_css, 
     show_header,
-    get_table_download_link,
     create_score_bar
 )
 from streamlit_tags import st_tags
 from PIL import Image
-import sqlite3
 import plotly.express as px
 import plotly.graph_objects as go
-from Courses import ds_course, web_course, android_course, ios_course, uiux_course, resume_videos, interview_videos
-from pdfminer3.layout import LAParams, LTTextBox
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager
-from pdfminer3.pdfinterp import PDFPageInterpreter
-from pdfminer3.converter import TextConverter
-import io
+from Courses import resume_videos, interview_videos
+from nlp_models import preload_models
+from db_migrations import run_migrations
+from user_data_io import export_user_data, prune_exports
+from analysis_jobs import submit_job, get_job, start_workers, JOB_DONE, ACTIVE_STATUSES
+from resume_analysis import ResumeAnalysis, get_or_build_analysis
 import requests
 try:
     from login import LoginUI
@@ -74,55 +72,37 @@ if 'admin_view' not in st.session_state:
 # Create necessary directories if they don't exist
 try:
     os.makedirs(UPLOAD_DIR, exist_ok=True)
-    os.makedirs(DB_PATH, exist_ok=True)
 except Exception as e:
     st.warning(f"Note: Directory creation failed - this is normal in Streamlit Cloud. Error: {e}")
 
+@st.cache_resource
+def init_databases():
+    """Copy legacy databases and apply pending migrations once per process."""
+    run_migrations()
+
+@st.cache_resource
+def get_login_ui():
+    """Build the login system once per process; its migrations run here."""
+    return LoginUI()
+
+@st.cache_resource
+def get_resume_scorer():
+    """Build the scorer's skill tables once per process."""
+    return ResumeScorer()
+
+# Bring every database to its latest schema before anything reads it
+init_databases()
+
 # Initialize login system
-login_ui = LoginUI()
+login_ui = get_login_ui()
+login_ui.init_session_state()
 
-# Initialize resume database
-def init_db():
-    """Initialize the database and create tables if they don't exist"""
-    try:
-        # Use absolute path for database in Streamlit Cloud
-        db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume_data.db')
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        
-        # Create user_data table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS user_data
-                    (ID TEXT PRIMARY KEY,
-                    Name TEXT,
-                    Email TEXT,
-                    Resume_Score TEXT,
-                    Timestamp TEXT,
-                    Total_Page TEXT,
-                    Predicted_Field TEXT,
-                    User_Level TEXT,
-                    Actual_Skills TEXT,
-                    Recommended_Skills TEXT,
-                    Recommended_Courses TEXT,
-                    PDF_Name TEXT,
-                    Original_Resume_Path TEXT)''')
-        
-        # Check if Original_Resume_Path column exists, if not add it
-        cursor = conn.execute('PRAGMA table_info(user_data)')
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'Original_Resume_Path' not in columns:
-            try:
-                c.execute('ALTER TABLE user_data ADD COLUMN Original_Resume_Path TEXT')
-                conn.commit()
-            except sqlite3.Error as e:
-                st.error(f"Error adding column: {e}")
-        
-        conn.commit()
-    except Exception as e:
-        st.error(f"Database initialization error: {e}")
-    finally:
-        if 'conn' in locals():
-            conn.close()
+# Warm the NLTK models in the background once per process so the first
+# upload after a deploy does not wait for them
+preload_models(background=True)
+
+# Uploads are analysed by background workers; started once per process
+start_workers()
 
 # Initialize session state
 if 'processed_files' not in st.session_state:
@@ -177,87 +157,6 @@ def navbar():
             if st.button("Sign Up"):
                 st.session_state.show_signup = True
 
-# Database functions
-def init_db():
-    """Initialize the database and create required tables if they don't exist."""
-    try:
-        conn = sqlite3.connect('resume_data.db', timeout=20)
-        cursor = conn.cursor()
-        
-        # Drop existing table if it exists
-        cursor.execute('DROP TABLE IF EXISTS user_data')
-        
-        # Create user_data table with correct structure
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_data (
-                ID TEXT PRIMARY KEY,
-                Name TEXT,
-                Email TEXT,
-                Resume_Score TEXT,
-                Timestamp TEXT,
-                Total_Page TEXT,
-                Predicted_Field TEXT,
-                User_Level TEXT,
-                Actual_Skills TEXT,
-                Recommended_Skills TEXT,
-                Recommended_Courses TEXT,
-                PDF_Name TEXT,
-                Original_Resume_Path TEXT
-            )
-        ''')
-        
-        conn.commit()
-        st.success("Database initialized successfully!")
-    except Exception as e:
-        st.error(f"Database initialization error: {str(e)}")
-    finally:
-        cursor.close()
-        conn.close()
-
-def extract_text_from_pdf(pdf_path):
-    """Extract text from uploaded PDF file"""
-    try:
-        # Create a PDF resource manager object
-        resource_manager = PDFResourceManager()
-        
-        # Create a string buffer object
-        fake_file_handle = io.StringIO()
-        
-        # Create a converter object
-        converter = TextConverter(
-            resource_manager, 
-            fake_file_handle, 
-            laparams=LAParams()
-        )
-        
-        # Create a PDF interpreter object
-        interpreter = PDFPageInterpreter(resource_manager, converter)
-        
-        # Open the PDF file using the full path
-        pdf_file_obj = open(pdf_path, 'rb')
-        
-        # Get pages from the PDF file
-        for page in PDFPage.get_pages(
-            pdf_file_obj, 
-            caching=True,
-            check_extractable=True
-        ):
-            interpreter.process_page(page)
-            
-        # Get the text from the StringIO buffer
-        text = fake_file_handle.getvalue()
-        
-        # Close all objects
-        converter.close()
-        fake_file_handle.close()
-        pdf_file_obj.close()
-        
-        return text
-        
-    except Exception as e:
-        st.error(f'Error processing PDF: {str(e)}')
-        return None
-
 def download_resume(resume_data, applicant_name):
     # Create a temporary file with the resume content
     import tempfile
@@ -276,197 +175,245 @@ def download_resume(resume_data, applicant_name):
     
     return content
 
-def process_resume(uploaded_file):
-    try:
-        # Save the original file
-        file_path = os.path.join("Uploaded_Resumes", uploaded_file.name)
-        os.makedirs("Uploaded_Resumes", exist_ok=True)
-        
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-            
-        # Process the resume content
-        resume_text = extract_text_from_pdf(file_path)
-        if resume_text:
-            parser = CustomResumeParser(file_path)
-            resume_data = parser.get_extracted_data()
-            if resume_data:
-                resume_data['original_resume_path'] = file_path  # Store the path to original resume
-                return resume_data
-        return None
-    except Exception as e:
-        st.error(f'Error processing PDF: {str(e)}')
-        return None
+def get_job_param():
+    """Return the analysis job id kept in the page URL, if any."""
+    if hasattr(st, 'query_params'):
+        return st.query_params.get('job')
+    return (st.experimental_get_query_params().get('job') or [None])[0]
 
-def display_applications():
-    """Display the applications view for admin."""
-    # Get applications for this admin
-    applications = login_ui.get_user_applications(st.session_state.username, 'admin')
-    
-    if applications:
-        # Convert to DataFrame for better display
-        applications_df = pd.DataFrame(
-            applications,
-            columns=['Applicant', 'Resume Data', 'Resume Score', 'Application Date', 'Status']
-        )
-        
-        # Summary statistics
-        st.markdown("### 📊 Summary Statistics")
-        col1, col2, col3 = st.columns(3)
-        
+def set_job_param(job_id):
+    """Keep the analysis job id in the page URL so a reload can pick it up."""
+    if hasattr(st, 'query_params'):
+        st.query_params['job'] = job_id
+    else:
+        st.experimental_set_query_params(job=job_id)
+
+def clear_job_param():
+    """Drop the analysis job id from the page URL."""
+    if hasattr(st, 'query_params'):
+        st.query_params.pop('job', None)
+    else:
+        st.experimental_set_query_params()
+
+def poll_analysis_job(job_id):
+    """Show a queued or running job's progress, or load a finished job's result.
+
+    Returns True while the job is still running; the caller should stop
+    rendering, and the page reruns after JOB_POLL_SECONDS.
+    """
+    job = get_job(job_id, st.session_state.username)
+    if job is None:
+        # Unknown, or another user's job (e.g. a URL kept from before a logout)
+        st.session_state.analysis_job = None
+        clear_job_param()
+        return False
+
+    if job['status'] in ACTIVE_STATUSES:
+        st.progress(job['progress'], text=f"Analysing {job['file_name']}: {job['stage']}...")
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+        return True
+
+    st.session_state.analysis_job = None
+    st.session_state.loaded_job = job_id
+    if job['status'] != JOB_DONE:
+        st.error(job['error'] or "Failed to extract data from resume")
+        return False
+
+    result = job['result']
+    st.session_state.resume_text = result['resume_text']
+    st.session_state.current_file = job['file_name']
+    st.session_state.processed_files.add(job['file_name'])
+    st.session_state.resume_data = result['resume_data']
+    # Jobs finished before analyses were stored get theirs built on first render
+    st.session_state.analysis = (ResumeAnalysis.from_dict(result['analysis'])
+                                 if result.get('analysis') else None)
+    for note in result['notes']:
+        st.info(note)
+    st.success("Resume processed and saved successfully!")
+    return False
+
+def render_summary_card(value, label):
+    """Render one of the summary statistic cards."""
+    st.markdown(f"""
+        <div style="
+            padding: 20px;
+            background: white;
+            border-radius: 10px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            text-align: center;
+        ">
+            <div style="font-size: 32px; color: #2b5876; font-weight: bold;">
+                {value}
+            </div>
+            <div style="color: #666;">{label}</div>
+        </div>
+    """, unsafe_allow_html=True)
+
+def render_application_filters():
+    """Render the filter widgets and return them as query keyword arguments."""
+    with st.expander("🔎 Filter Applications"):
+        col1, col2 = st.columns(2)
         with col1:
-            st.markdown(f"""
-                <div style="
-                    padding: 20px;
-                    background: white;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                    text-align: center;
-                ">
-                    <div style="font-size: 32px; color: #2b5876; font-weight: bold;">
-                        {len(applications_df)}
-                    </div>
-                    <div style="color: #666;">Total Applications</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
+            status = st.multiselect("Status", APPLICATION_STATUSES, key='applications_status_filter')
         with col2:
-            avg_score = applications_df['Resume Score'].astype(float).mean()
-            st.markdown(f"""
-                <div style="
-                    padding: 20px;
-                    background: white;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                    text-align: center;
-                ">
-                    <div style="font-size: 32px; color: #2b5876; font-weight: bold;">
-                        {avg_score:.1f}%
-                    </div>
-                    <div style="color: #666;">Average Score</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            pending_count = len(applications_df[applications_df['Status'] == 'pending'])
-            st.markdown(f"""
-                <div style="
-                    padding: 20px;
-                    background: white;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                    text-align: center;
-                ">
-                    <div style="font-size: 32px; color: #2b5876; font-weight: bold;">
-                        {pending_count}
-                    </div>
-                    <div style="color: #666;">Pending Applications</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        # Display applications
-        st.markdown("### 📝 Applications")
-        for index, row in applications_df.iterrows():
-            with st.expander(f"Application from {row['Applicant']} - {row['Application Date']}"):
-                st.markdown("""
-                <style>
-                .info-box {
-                    background-color: #f8f9fa;
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin: 10px 0;
-                }
-                .info-title {
-                    color: #2b5876;
-                    font-weight: bold;
-                    margin-bottom: 5px;
-                }
-                </style>
-                """, unsafe_allow_html=True)
+            min_score, max_score = st.slider("Resume Score (%)", 0, 100, (0, 100),
+                                             key='applications_score_filter')
+        date_from = date_to = None
+        if st.checkbox("Filter by application date", key='applications_use_dates'):
+            today = datetime.date.today()
+            dates = st.date_input("Application Date",
+                                  (today - datetime.timedelta(days=30), today),
+                                  key='applications_date_filter')
+            if len(dates) == 2:
+                date_from, date_to = dates
 
-                # Basic Information
-                st.markdown('<div class="info-box">', unsafe_allow_html=True)
-                st.markdown('<p class="info-title">📋 Basic Information</p>', unsafe_allow_html=True)
-                st.write(f"**Name:** {row['Applicant']}")
-                
-                # Parse resume data
-                try:
-                    resume_data = eval(row['Resume Data'])
-                    email = resume_data.get('email', 'Not provided')
-                    mobile = resume_data.get('mobile_number', 'Not provided')
-                    skills = resume_data.get('skills', [])
-                    
-                    st.write(f"**Email:** {email}")
-                    st.write(f"**Mobile:** {mobile}")
-                except:
-                    st.write("Error parsing resume data")
-                st.markdown('</div>', unsafe_allow_html=True)
+    filters = {'status': status, 'date_from': date_from, 'date_to': date_to}
+    # The full range means "no score filter", which also keeps unscored rows
+    if (min_score, max_score) != (0, 100):
+        filters.update(min_score=min_score, max_score=max_score)
+    return filters
 
-                # Skills and Score
-                st.markdown('<div class="info-box">', unsafe_allow_html=True)
-                st.markdown('<p class="info-title">🎯 Skills & Score</p>', unsafe_allow_html=True)
-                if 'skills' in locals():
-                    st.write("**Skills:**", ", ".join(skills) if skills else "No skills listed")
-                st.write(f"**Resume Score:** {row['Resume Score']}%")
-                st.write(f"**Current Status:** {row['Status'].title()}")
-                st.markdown('</div>', unsafe_allow_html=True)
+def render_resume_download(application_id, resume_data):
+    """Offer the original resume, reading the file only once it is requested."""
+    prepared = st.session_state.setdefault('prepared_downloads', set())
+    if application_id not in prepared:
+        if st.button("📄 Prepare Resume Download", key=f"prepare_download_{application_id}"):
+            prepared.add(application_id)
+        else:
+            return
 
-                # Download Resume Button
-                st.markdown('<div class="info-box">', unsafe_allow_html=True)
-                st.markdown('<p class="info-title">📄 Resume</p>', unsafe_allow_html=True)
-                
-                try:
-                    # Get resume data and original file path
-                    resume_data = eval(row['Resume Data'])
-                    original_resume_path = resume_data.get('original_resume_path')
-                    
-                    if original_resume_path and os.path.exists(original_resume_path):
-                        with open(original_resume_path, 'rb') as file:
-                            resume_content = file.read()
-                            file_name = os.path.basename(original_resume_path)
-                            
-                        st.download_button(
-                            label="📥 Download Original Resume",
-                            data=resume_content,
-                            file_name=file_name,
-                            mime="application/pdf",
-                            help="Click to download the original resume",
-                            key=f"download_{index}"
-                        )
-                    else:
-                        st.warning("Original resume file not available")
-                except Exception as e:
-                    st.error(f"Error preparing resume download: {str(e)}")
-                    
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                if row['Status'] == 'pending':
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button('Accept', key=f'accept_{index}'):
-                            if login_ui.update_application_status(row['Applicant'], st.session_state.username, 'accepted'):
-                                st.success('Application accepted!')
-                                st.rerun()
-                    with col2:
-                        if st.button('Reject', key=f'reject_{index}'):
-                            if login_ui.update_application_status(row['Applicant'], st.session_state.username, 'rejected'):
-                                st.success('Application rejected!')
-                                st.rerun()
-    else:
+    original_resume_path = resume_data.get('original_resume_path')
+    if not original_resume_path or not os.path.exists(original_resume_path):
+        st.warning("Original resume file not available")
+        return
+
+    with open(original_resume_path, 'rb') as file:
+        resume_content = file.read()
+    st.download_button(
+        label="📥 Download Original Resume",
+        data=resume_content,
+        file_name=os.path.basename(original_resume_path),
+        mime="application/pdf",
+        help="Click to download the original resume",
+        key=f"download_{application_id}"
+    )
+
+def display_applications():
+    """Display the applications view for admin."""
+    company = st.session_state.username
+    total, avg_score, pending_count = login_ui.get_application_summary(company)
+    
+    if not total:
         st.info("No applications received yet")
+        return
+
+    # Summary statistics
+    st.markdown("### 📊 Summary Statistics")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        render_summary_card(total, "Total Applications")
+    with col2:
+        render_summary_card(f"{avg_score:.1f}%", "Average Score")
+    with col3:
+        render_summary_card(pending_count, "Pending Applications")
+
+    # Display applications
+    st.markdown("### 📝 Applications")
+    filters = render_application_filters()
+    matching = login_ui.count_company_applications(company, **filters)
+    if not matching:
+        st.info("No applications match the selected filters")
+        return
+
+    # Only the current page is read from the database and rendered
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Applications per page", APPLICATION_PAGE_SIZES,
+                                 key='applications_page_size')
+    page_count = (matching + page_size - 1) // page_size
+    if st.session_state.get('applications_page', 1) > page_count:
+        st.session_state.applications_page = page_count
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=page_count, step=1,
+                               key='applications_page')
+    st.caption(f"Showing {min((page - 1) * page_size + 1, matching)}-"
+               f"{min(page * page_size, matching)} of {matching} applications")
+
+    applications = login_ui.get_company_applications(
+        company, limit=page_size, offset=(page - 1) * page_size, **filters)
+    applications_df = pd.DataFrame(
+        applications,
+        columns=['ID', 'Applicant', 'Resume Score', 'Application Date', 'Status']
+    )
+
+    st.markdown("""
+    <style>
+    .info-box {
+        background-color: #f8f9fa;
+        border-radius: 5px;
+        padding: 15px;
+        margin: 10px 0;
+    }
+    .info-title {
+        color: #2b5876;
+        font-weight: bold;
+        margin-bottom: 5px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    for _, row in applications_df.iterrows():
+        application_id = row['ID']
+        with st.expander(f"Application from {row['Applicant']} - {row['Application Date']}"):
+            # Basic Information
+            st.markdown('<div class="info-box">', unsafe_allow_html=True)
+            st.markdown('<p class="info-title">📋 Basic Information</p>', unsafe_allow_html=True)
+            st.write(f"**Name:** {row['Applicant']}")
+            
+            # Resume payloads live in their own table; each is decoded once and cached
+            resume_data = login_ui.get_application_resume(application_id) or {}
+            skills = resume_data.get('skills', [])
+            st.write(f"**Email:** {resume_data.get('email', 'Not provided')}")
+            st.write(f"**Mobile:** {resume_data.get('mobile_number', 'Not provided')}")
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Skills and Score
+            st.markdown('<div class="info-box">', unsafe_allow_html=True)
+            st.markdown('<p class="info-title">🎯 Skills & Score</p>', unsafe_allow_html=True)
+            st.write("**Skills:**", ", ".join(skills) if skills else "No skills listed")
+            st.write(f"**Resume Score:** {row['Resume Score']}%")
+            st.write(f"**Current Status:** {row['Status'].title()}")
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Download Resume Button
+            st.markdown('<div class="info-box">', unsafe_allow_html=True)
+            st.markdown('<p class="info-title">📄 Resume</p>', unsafe_allow_html=True)
+            try:
+                render_resume_download(application_id, resume_data)
+            except Exception as e:
+                st.error(f"Error preparing resume download: {str(e)}")
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            if row['Status'] == 'pending':
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button('Accept', key=f'accept_{application_id}'):
+                        if login_ui.update_application_status(row['Applicant'], company, 'accepted'):
+                            st.success('Application accepted!')
+                            st.rerun()
+                with col2:
+                    if st.button('Reject', key=f'reject_{application_id}'):
+                        if login_ui.update_application_status(row['Applicant'], company, 'rejected'):
+                            st.success('Application rejected!')
+                            st.rerun()
 
 def display_visual_analytics():
     """Display the visual analytics view for admin."""
-    # Get applications for analytics
-    applications = login_ui.get_user_applications(st.session_state.username, 'admin')
+    # Aggregates are computed in SQLite and cached until an application changes
+    analytics = login_ui.get_application_analytics(st.session_state.username)
     
-    if applications:
-        # Convert to DataFrame for analytics
-        applications_df = pd.DataFrame(
-            applications,
-            columns=['Applicant', 'Resume Data', 'Resume Score', 'Application Date', 'Status']
-        )
-        
+    if analytics['total']:
         st.markdown("### 📊 Application Analytics")
         
         # Create two columns for charts
@@ -474,12 +421,12 @@ def display_visual_analytics():
         
         with col1:
             # Application Status Distribution
-            status_counts = applications_df['Status'].value_counts()
+            statuses, counts = zip(*analytics['status_counts'])
             
             # Create donut chart for application statuses
             fig = go.Figure(data=[go.Pie(
-                labels=status_counts.index,
-                values=status_counts.values,
+                labels=statuses,
+                values=counts,
                 hole=0.5,
                 marker=dict(colors=['#ff9999', '#66b3ff', '#99ff99'])
             )])
@@ -495,11 +442,15 @@ def display_visual_analytics():
             st.plotly_chart(fig)
         
         with col2:
-            # Resume Score Distribution
-            fig = px.histogram(
-                applications_df,
+            # Resume Score Distribution, already bucketed by the query
+            histogram_df = pd.DataFrame(
+                [(f"{low}-{high}", count) for low, high, count in analytics['score_histogram']],
+                columns=['Resume Score', 'count']
+            )
+            fig = px.bar(
+                histogram_df,
                 x='Resume Score',
-                nbins=10,
+                y='count',
                 title='Distribution of Resume Scores',
                 color_discrete_sequence=['#2b5876']
             )
@@ -518,21 +469,22 @@ def display_visual_analytics():
         st.markdown("### 📈 Detailed Analytics")
         
         # Score statistics
-        score_stats = applications_df['Resume Score'].astype(float).describe()
+        score_stats = analytics['score_stats']
+        median = score_stats['percentiles'].get(0.5, 0.0)
         
         stats_cols = st.columns(4)
         with stats_cols[0]:
             st.metric("Average Score", f"{score_stats['mean']:.1f}%")
         with stats_cols[1]:
-            st.metric("Median Score", f"{score_stats['50%']:.1f}%")
+            st.metric("Median Score", f"{median:.1f}%")
         with stats_cols[2]:
             st.metric("Highest Score", f"{score_stats['max']:.1f}%")
         with stats_cols[3]:
             st.metric("Lowest Score", f"{score_stats['min']:.1f}%")
         
-        # Time series of applications
-        applications_df['Application Date'] = pd.to_datetime(applications_df['Application Date'])
-        daily_apps = applications_df.groupby('Application Date').size().reset_index(name='count')
+        # Time series of applications, one row per day
+        daily_apps = pd.DataFrame(analytics['daily_counts'], columns=['Application Date', 'count'])
+        daily_apps['Application Date'] = pd.to_datetime(daily_apps['Application Date'])
         
         fig = px.line(
             daily_apps,
@@ -553,16 +505,75 @@ def display_visual_analytics():
     else:
         st.info("No applications data available for analysis")
 
+def display_results_export():
+    """Let an admin export filtered analysis results as CSV or Parquet."""
+    col1, col2 = st.columns(2)
+    with col1:
+        fields = st.multiselect("Predicted Field", get_user_data_values('Predicted_Field'),
+                                key='export_field_filter')
+        min_score, max_score = st.slider("Resume Score (%)", 0, 100, (0, 100),
+                                         key='export_score_filter')
+    with col2:
+        levels = st.multiselect("Candidate Level", get_user_data_values('User_Level'),
+                                key='export_level_filter')
+        fmt = st.radio("Format", ['csv', 'parquet'], horizontal=True, key='export_format')
+    date_from = date_to = None
+    if st.checkbox("Filter by analysis date", key='export_use_dates'):
+        today = datetime.date.today()
+        dates = st.date_input("Analysis Date", (today - datetime.timedelta(days=30), today),
+                              key='export_date_filter')
+        if len(dates) == 2:
+            date_from, date_to = dates
+    filters = {'fields': fields, 'levels': levels, 'date_from': date_from, 'date_to': date_to}
+    if (min_score, max_score) != (0, 100):
+        filters.update(min_score=min_score, max_score=max_score)
+
+    # The export is streamed to a file in EXPORT_DIR. Streamlit keeps a
+    # download's bytes in server memory on every rerun, so only files up to
+    # EXPORT_MAX_DOWNLOAD_BYTES are offered; larger ones are left to the CLI
+    export = st.session_state.get('results_export')
+    if st.button("📦 Prepare Export", key='prepare_results_export'):
+        if export:
+            try:
+                os.remove(export['path'])
+            except OSError:
+                pass
+        export = st.session_state.results_export = None
+        prune_exports()
+        handle, path = tempfile.mkstemp(suffix=f'.{fmt}', prefix='resume_results_', dir=EXPORT_DIR)
+        os.close(handle)
+        try:
+            rows = export_user_data(path, fmt, **filters)
+        except Exception as e:
+            os.remove(path)
+            st.error(f"Export failed: {str(e)}")
+            return
+        size = os.path.getsize(path)
+        if size > EXPORT_MAX_DOWNLOAD_BYTES:
+            os.remove(path)
+            st.warning(
+                f"The export is {size / 1024 / 1024:.1f} MB, over the "
+                f"{EXPORT_MAX_DOWNLOAD_BYTES / 1024 / 1024:g} MB download limit. Narrow the "
+                f"filters or run `python user_data_io.py export results.{fmt}` on the server."
+            )
+            return
+        export = st.session_state.results_export = {'path': path, 'format': fmt, 'rows': rows}
+
+    if export and os.path.exists(export['path']):
+        st.caption(f"{export['rows']} rows ready")
+        with open(export['path'], 'rb') as file:
+            st.download_button(
+                label="📥 Download Results",
+                data=file,
+                file_name=f"resume_results.{export['format']}",
+                mime='text/csv' if export['format'] == 'csv' else 'application/octet-stream',
+                key='download_results_export'
+            )
+
 def main():
     """Main function for the Smart Resume Analyzer App"""
     st.markdown(get_custom_css(), unsafe_allow_html=True)
     
-    # Initialize database
-    init_db()
-    
-    # Initialize login UI
-    login_ui = LoginUI()
-    
     # Show header
     show_header()
     
@@ -599,6 +610,8 @@ def main():
     if st.sidebar.button("Logout"):
         for key in st.session_state.keys():
             del st.session_state[key]
+        # The next user of this tab must not pick up the last analysis
+        clear_job_param()
         st.rerun()
 
     # Add delete account section in sidebar
@@ -678,6 +691,9 @@ def main():
             
         if st.sidebar.button("📑 Applications", key="nav_applications"):
             st.session_state.admin_view = 'applications'
+
+        if st.sidebar.button("📤 Export Results", key="nav_export"):
+            st.session_state.admin_view = 'export'
         
         # Display the appropriate view based on session state
         if st.session_state.admin_view == 'dashboard':
@@ -689,6 +705,9 @@ def main():
         elif st.session_state.admin_view == 'applications':
             st.markdown("## 📑 Applications Management")
             display_applications()
+        elif st.session_state.admin_view == 'export':
+            st.markdown("## 📤 Export Results")
+            display_results_export()
     
     # Normal user interface
     else:
@@ -750,7 +769,20 @@ def main():
             help="Please upload a PDF file"
         )
         
-        if pdf_file is None:
+        # Queue each new upload; the analysis runs on a background worker
+        if pdf_file is not None and pdf_file.name not in st.session_state.processed_files:
+            st.session_state.processed_files.add(pdf_file.name)
+            st.session_state.analysis_job = submit_job(pdf_file.name, pdf_file.getvalue(),
+                                                       st.session_state.username)
+            set_job_param(st.session_state.analysis_job)
+
+        # Follow this session's job, or the one in the URL after a reload
+        job_id = st.session_state.get('analysis_job') or get_job_param()
+        if job_id and job_id != st.session_state.get('loaded_job'):
+            if poll_analysis_job(job_id):
+                return
+
+        if pdf_file is None and not st.session_state.resume_data:
             st.markdown("""
                 <div style="
                     background: #f8f9fa;
@@ -770,118 +802,21 @@ def main():
             """, unsafe_allow_html=True)
             return
 
-        # Process new file
-        if pdf_file is not None and pdf_file.name not in st.session_state.processed_files:
-            try:
-                # Process the resume
-                resume_data = process_resume(pdf_file)
-                
-                if resume_data:
-                    st.session_state.resume_text = extract_text_from_pdf(os.path.join("Uploaded_Resumes", pdf_file.name))
-                    st.session_state.current_file = pdf_file.name
-                    st.session_state.processed_files.add(pdf_file.name)
-                    
-                    # Calculate predicted field based on skills
-                    skills = resume_data.get('skills', [])
-                    predicted_field = 'Unknown'
-                    if skills:
-                        tech_skills = ['python', 'java', 'javascript', 'react', 'sql', 'machine learning', 'aws', 'docker']
-                        data_skills = ['python', 'r', 'sql', 'machine learning', 'deep learning']
-                        if any(skill in tech_skills for skill in skills):
-                            predicted_field = 'Software Development'
-                        elif any(skill in data_skills for skill in skills):
-                            predicted_field = 'Data Science'
-
-                    # Determine experience level
-                    experience = resume_data.get('experience', [])
-                    exp_level = 'Entry Level'
-                    if experience and len(experience) > 2:
-                        exp_level = 'Senior Level'
-                    elif experience and len(experience) > 0:
-                        exp_level = 'Mid Level'
-
-                    # Calculate score
-                    scorer = ResumeScorer()
-                    score_details = scorer.score_resume(resume_data)
-                    total_score = round(
-                        score_details['experience_score'] * 0.35 +
-                        score_details['skills_score'] * 0.30 +
-                        score_details['education_score'] * 0.20 +
-                        score_details['completeness_score'] * 0.15
-                    )
-                    
-                    # Generate recommended skills based on actual skills
-                    skills = resume_data.get('skills', [])
-                    skill_recommendations = {
-                        'python': ['django', 'flask', 'pandas', 'numpy', 'scikit-learn'],
-                        'java': ['spring', 'hibernate', 'maven', 'junit'],
-                        'javascript': ['react', 'angular', 'node.js', 'express'],
-                        'web': ['html5', 'css3', 'javascript', 'react', 'node.js'],
-                        'data': ['python', 'r', 'sql', 'tableau', 'power bi'],
-                        'machine learning': ['tensorflow', 'pytorch', 'scikit-learn', 'keras'],
-                        'cloud': ['aws', 'azure', 'docker', 'kubernetes'],
-                        'database': ['sql', 'mongodb', 'postgresql', 'mysql'],
-                        'mobile': ['react native', 'flutter', 'android', 'ios']
-                    }
-                    
-                    recommended_skills = set()
-                    for skill in skills:
-                        skill_lower = skill.lower()
-                        for category, related_skills in skill_recommendations.items():
-                            if category in skill_lower or skill_lower in category:
-                                recommended_skills.update(related_skills)
-                    
-                    # Remove skills that the candidate already has
-                    recommended_skills = list(recommended_skills - set(skill.lower() for skill in skills))
-                    
-                    # Prepare data for database
-                    user_data = {
-                        'Name': resume_data.get('name', 'Unknown'),
-                        'Email': resume_data.get('email', 'unknown@email.com'),
-                        'Resume_Score': total_score,
-                        'Total_Page': resume_data.get('no_of_pages', 0),
-                        'Predicted_Field': predicted_field,
-                        'User_Level': exp_level,
-                        'Actual_Skills': ', '.join(skills),
-                        'Recommended_Skills': ', '.join(recommended_skills[:5]),  # Top 5 recommendations
-                        'Recommended_Courses': ', '.join(score_details.get('recommended_courses', [])),
-                        'PDF_Name': pdf_file.name,
-                        'Original_Resume_Path': resume_data.get('original_resume_path')
-                    }
-                    
-                    # Save to database
-                    insert_user_data(user_data)
-                    
-                    # Store in session state for display
-                    st.session_state.resume_data = resume_data
-                    st.session_state.score_details = score_details
-                    
-                    st.success("Resume processed and saved successfully!")
-                    st.rerun()
-                else:
-                    st.error("Failed to extract data from resume")
-            except Exception as e:
-                st.error(f"Error processing resume: {str(e)}")
-                return
-
         # Display resume analysis
         if st.session_state.resume_data:
             resume_data = st.session_state.resume_data
             
-            # Initialize resume scorer
-            scorer = ResumeScorer()
-            score_details = scorer.score_resume(resume_data)
+            # Scores, recommendations and insights are computed once per
+            # resume and analysis version; reruns only render them
+            analysis = st.session_state.get('analysis')
+            if analysis is None or analysis.version != ANALYSIS_VERSION:
+                analysis = get_or_build_analysis(resume_data, get_resume_scorer())
+                st.session_state.analysis = analysis
+            score_details = analysis.score_details
+            total_score = analysis.total_score
             
             st.markdown("### 📊 Resume Analysis Results")
             
-            # Calculate weighted total score
-            total_score = round(
-                score_details['experience_score'] * 0.35 +
-                score_details['skills_score'] * 0.30 +
-                score_details['education_score'] * 0.20 +
-                score_details['completeness_score'] * 0.15
-            )
-            
             # Score breakdown in a modern card with gradient
             st.markdown(f"""
                 <div style="
@@ -954,121 +889,21 @@ def main():
                                value=resume_data['skills'], key='1')
 
             ##  recommendation
-            recommended_skills = []
-            reco_field = ''
-            rec_course = ''
-
-            # Define skill keywords
-            ds_keyword = ['tensorflow','keras','pytorch','machine learning','deep Learning','flask',
-                           'streamlit','python','pandas','data analysis','scipy','numpy','data science',
-                           'matplotlib','statistics','analytics','visualization','sql','database']
-            
-            web_keyword = ['react', 'django', 'node js', 'react js', 'php', 'laravel', 'magento', 'wordpress',
-                            'javascript', 'angular js', 'c#', 'flask', 'html', 'css', 'bootstrap', 'jquery']
-            
-            android_keyword = ['android','android development','flutter','kotlin','xml','kivy',
-                                'java','mobile development','firebase','sdk','android studio']
-            
-            ios_keyword = ['ios','ios development','swift','cocoa','cocoa touch','xcode',
-                            'objective c','mobile development','apple','swift ui']
-            
-            uiux_keyword = ['ux','adobe xd','figma','zeplin','balsamiq','ui','prototyping',
-                            'wireframes','storyframes','adobe photoshop','photoshop','editing',
-                            'adobe illustrator','illustrator','adobe after effects','after effects',
-                            'adobe premier pro','premier pro','adobe indesign','indesign','wireframe',
-                            'solid','grasp','user research','user experience','sketch','principle','invision']
+            reco_field = analysis.reco_field
+            recommended_skills = list(analysis.recommended_skills)
+            rec_course = analysis.rec_course
 
             ## Courses recommendation based on skills
-            for skill in resume_data['skills']:
-                check_skill = skill.lower()
-                ## Data science recommendation
-                if check_skill in ds_keyword:
-                    reco_field = 'Data Science'
-                    st.success("** Our analysis says you are looking for Data Science Jobs **")
-                    recommended_skills = ['Data Visualization','Predictive Analysis','Statistical Modeling',
-                                          'Data Mining','Clustering & Classification','Data Analytics',
-                                          'Quantitative Analysis','Web Scraping','ML Algorithms','Keras',
-                                          'Pytorch','Probability','Scikit-learn','Tensorflow',"Flask",
-                                          'Streamlit']
-                    recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                   text='Recommended skills generated from your profile',
-                                                   value=recommended_skills, key='2')
-                    st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to your resume will boost🚀 the chances of getting a Job💼</h4>''',
-                              unsafe_allow_html=True)
-                    rec_course = ds_course
-                    break
-
-                ## Web development recommendation
-                elif check_skill in web_keyword:
-                    reco_field = 'Web Development'
-                    st.success("** Our analysis says you are looking for Web Development Jobs **")
-                    recommended_skills = ['React','Django','Node JS','React JS','php','laravel',
-                                           'Magento','wordpress','Javascript','Angular JS','c#','Flask',
-                                           'SDK']
-                    recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                   text='Recommended skills generated from your profile',
-                                                   value=recommended_skills, key='3')
-                    st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to your resume will boost🚀 the chances of getting a Job💼</h4>''',
-                              unsafe_allow_html=True)
-                    rec_course = web_course
-                    break
-
-                ## Android App Development
-                elif check_skill in android_keyword:
-                    reco_field = 'Android Development'
-                    st.success("** Our analysis says you are looking for Android App Development Jobs **")
-                    recommended_skills = ['Android','Android development','Flutter','Kotlin','XML','Java',
-                                          'Kivy','GIT','SDK','SQLite']
-                    recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                   text='Recommended skills generated from your profile',
-                                                   value=recommended_skills, key='4')
-                    st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to your resume will boost🚀 the chances of getting a Job💼</h4>''',
-                              unsafe_allow_html=True)
-                    rec_course = android_course
-                    break
-
-                ## IOS App Development
-                elif check_skill in ios_keyword:
-                    reco_field = 'IOS Development'
-                    st.success("** Our analysis says you are looking for IOS App Development Jobs **")
-                    recommended_skills = ['IOS','IOS Development','Swift','Cocoa','Cocoa Touch','Xcode',
-                                          'Objective-C','SQLite','Plist','StoreKit','UI-Kit','AV Foundation',
-                                          'Auto-Layout']
-                    recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                   text='Recommended skills generated from your profile',
-                                                   value=recommended_skills, key='5')
-                    st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to your resume will boost🚀 the chances of getting a Job💼</h4>''',
-                              unsafe_allow_html=True)
-                    rec_course = ios_course
-                    break
-
-                ## Ui-UX Recommendation
-                elif check_skill in uiux_keyword:
-                    reco_field = 'UI-UX Development'
-                    st.success("** Our analysis says you are looking for UI-UX Development Jobs **")
-                    recommended_skills = ['UI','User Experience','Adobe XD','Figma','Zeplin','Balsamiq',
-                                          'Prototyping','Wireframes','Storyframes','Adobe Photoshop','Editing',
-                                          'Illustrator','After Effects','Premier Pro','Indesign','Wireframe',
-                                          'Solid','Grasp','User Research']
-                    recommended_keywords = st_tags(label='### Recommended skills for you.',
-                                                   text='Recommended skills generated from your profile',
-                                                   value=recommended_skills, key='6')
-                    st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to your resume will boost🚀 the chances of getting a Job💼</h4>''',
-                              unsafe_allow_html=True)
-                    rec_course = uiux_course
-                    break
+            if reco_field:
+                st.success(f"** Our analysis says you are looking for {analysis.job_label} Jobs **")
+                recommended_keywords = st_tags(label='### Recommended skills for you.',
+                                               text='Recommended skills generated from your profile',
+                                               value=recommended_skills, key='2')
+                st.markdown('''<h4 style='text-align: left; color: #1ed760;'>Adding this skills to your resume will boost🚀 the chances of getting a Job💼</h4>''',
+                          unsafe_allow_html=True)
 
-            ## Insert into table
-            ts = time.time()
-            cur_date = datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
             if reco_field:
-                # Define candidate level based on pages
-                if resume_data['no_of_pages'] == 1:
-                    cand_level = "Beginner"
-                elif resume_data['no_of_pages'] == 2:
-                    cand_level = "Intermediate"
-                else:
-                    cand_level = "Expert"
+                cand_level = analysis.cand_level
                     
                 ## Resume writing recommendation
                 st.markdown("### Resume Tips & Ideas💡")
@@ -1107,62 +942,6 @@ def main():
                         </div>
                     """, unsafe_allow_html=True)
                 
-                # Calculate resume score
-                resume_score = score_details['total_score']
-                
-                # Initialize database connection with timeout
-                conn = sqlite3.connect('resume_data.db', timeout=20)
-                cursor = conn.cursor()
-                
-                # Create table with all necessary columns
-                cursor.execute('''CREATE TABLE IF NOT EXISTS user_data
-                                (ID TEXT PRIMARY KEY,
-                                Name TEXT,
-                                Email TEXT,
-                                Resume_Score TEXT,
-                                Timestamp TEXT,
-                                Total_Page TEXT,
-                                Predicted_Field TEXT,
-                                User_Level TEXT,
-                                Actual_Skills TEXT,
-                                Recommended_Skills TEXT,
-                                Recommended_Courses TEXT,
-                                PDF_Name TEXT,
-                                Original_Resume_Path TEXT)''')
-                conn.commit()
-                
-                ## Insert into table
-                insert_data = (
-                    None,  # ID will be auto-generated
-                    resume_data['name'],
-                    resume_data['email'],
-                    resume_score,
-                    cur_date,
-                    resume_data['no_of_pages'],
-                    reco_field,
-                    cand_level,
-                    str(resume_data['skills']),
-                    str(recommended_skills),
-                    str(rec_course),
-                    pdf_file.name,
-                    resume_data.get('original_resume_path')
-                )
-                
-                try:
-                    cursor.execute('''INSERT INTO user_data 
-                                    (ID, Name, Email, Resume_Score, Timestamp, Total_Page,
-                                    Predicted_Field, User_Level, Actual_Skills,
-                                    Recommended_Skills, Recommended_Courses, PDF_Name,
-                                    Original_Resume_Path)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', insert_data)
-                    conn.commit()
-                except sqlite3.Error as e:
-                    st.error(f"Database error: {str(e)}")
-                
-                finally:
-                    cursor.close()
-                    conn.close()
-
                 ## Recommending courses
                 st.markdown("""
                     <div style="background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-bottom: 10px;">
@@ -1256,52 +1035,7 @@ def main():
                     </div>
                 """, unsafe_allow_html=True)
                 
-                strengths = []
-                
-                # Technical Skills Analysis
-                skills = resume_data['skills']
-                if len(skills) >= 5:
-                    skill_strength = "🛠️ Strong technical skill set with {} different skills".format(len(skills))
-                    if len(skills) >= 8:
-                        skill_strength += " - Impressive variety! 🌟"
-                    strengths.append(skill_strength)
-                    
-                    # Check for in-demand skills
-                    in_demand_skills = ['python', 'java', 'javascript', 'react', 'sql', 'machine learning', 'aws', 'docker']
-                    matched_demands = [skill for skill in skills if any(demand in skill.lower() for demand in in_demand_skills)]
-                    if matched_demands:
-                        strengths.append("🚀 Possesses in-demand skills: " + ", ".join(matched_demands[:3]))
-
-                # Experience Analysis
-                experience = resume_data['experience']
-                if experience:
-                    exp_years = len(experience)
-                    if exp_years >= 2:
-                        strengths.append(f"💼 Strong work history with {exp_years} different roles")
-                    
-                    detailed_exp = [exp for exp in experience if len(exp.split()) > 10]
-                    if detailed_exp:
-                        strengths.append("📝 Detailed work experience descriptions")
-                    
-                    achievement_keywords = ['achieved', 'improved', 'increased', 'reduced', 'led', 'managed', 'developed']
-                    achievements = [exp for exp in experience if any(keyword in exp.lower() for keyword in achievement_keywords)]
-                    if achievements:
-                        strengths.append("🏆 Contains quantifiable achievements and leadership examples")
-
-                # Education Analysis
-                education = resume_data['education']
-                if education:
-                    edu_str = "🎓 Strong educational background with {} qualification(s)".format(len(education))
-                    higher_edu_keywords = ['master', 'phd', 'bachelor', 'degree']
-                    if any(keyword in str(education).lower() for keyword in higher_edu_keywords):
-                        edu_str += " including higher education ✨"
-                    strengths.append(edu_str)
-
-                # Overall Score Analysis
-                if total_score >= 80:
-                    strengths.append(f"⭐ Exceptional overall resume score: {total_score}%")
-                elif total_score >= 60:
-                    strengths.append(f"📈 Above average resume score: {total_score}%")
+                strengths = analysis.strengths
 
                 # Display strengths in modern cards
                 for strength in strengths:
@@ -1335,66 +1069,7 @@ def main():
                     </div>
                 """, unsafe_allow_html=True)
                 
-                improvements = []
-                
-                # Skills Improvements
-                if len(skills) < 5:
-                    improvements.append({
-                        'icon': '⚡',
-                        'area': 'Technical Skills',
-                        'issue': f"Currently only {len(skills)} skills listed",
-                        'suggestion': "Add more relevant technical skills, especially those mentioned in job descriptions in your field"
-                    })
-                else:
-                    improvements.append({
-                        'icon': '🔍',
-                        'area': 'Skills Organization',
-                        'issue': 'Skills could be better organized',
-                        'suggestion': "Consider grouping your skills into categories (e.g., Programming Languages, Tools, Soft Skills)"
-                    })
-
-                # Experience Improvements
-                if not experience:
-                    improvements.append({
-                        'icon': '💼',
-                        'area': 'Work Experience',
-                        'issue': 'Limited work experience section',
-                        'suggestion': "Add internships, projects, or volunteer work if you're new to the field"
-                    })
-                else:
-                    if not any(len(exp.split()) > 15 for exp in experience):
-                        improvements.append({
-                            'icon': '📝',
-                            'area': 'Experience Descriptions',
-                            'issue': 'Brief experience descriptions',
-                            'suggestion': "Expand your role descriptions with specific responsibilities and achievements"
-                        })
-                    
-                    if not any(keyword in str(experience).lower() for keyword in ['achieved', 'improved', 'increased', 'reduced']):
-                        improvements.append({
-                            'icon': '📊',
-                            'area': 'Achievements',
-                            'issue': 'Limited quantifiable achievements',
-                            'suggestion': "Add specific metrics and numbers to showcase your impact (e.g., 'Improved efficiency by 25%')"
-                        })
-
-                # Education Improvements
-                if not education:
-                    improvements.append({
-                        'icon': '🎓',
-                        'area': 'Education',
-                        'issue': 'Education section needs enhancement',
-                        'suggestion': "Add your educational background, including relevant coursework and certifications"
-                    })
-
-                # Score-based Improvements
-                if total_score < 60:
-                    improvements.append({
-                        'icon': '📈',
-                        'area': 'Overall Resume',
-                        'issue': f"Current resume score: {total_score}%",
-                        'suggestion': "Focus on adding more detailed experience descriptions and relevant skills to improve your score"
-                    })
+                improvements = analysis.improvements
 
                 # Display improvements in modern cards
                 for imp in improvements:
@@ -1506,12 +1181,11 @@ def main():
                         if st.button("Submit Applications"):
                             success_count = 0
                             for company in selected_companies:
-                                # Convert resume data to string for storage
-                                resume_data_str = str(resume_data)
+                                # Resume data is stored as JSON by submit_application
                                 if login_ui.submit_application(
                                     st.session_state.username,
                                     company,
-                                    resume_data_str,
+                                    resume_data,
                                     str(total_score)
                                 ):
                                     success_count += 1
@@ -0,0 +1,400 @@
+"""SQLite-backed queue of resume analysis jobs.
+
+The upload page submits a job and polls its row; workers claim queued
+jobs, run the analysis pipeline (preflight, parsing, scoring and saving)
+and store the result on the same row. Workers are threads started inside
+the web app (ANALYSIS_WORKERS) and/or separate processes started with:
+
+    python analysis_jobs.py --workers 4
+
+Because jobs live in SQLite, a reloaded tab can pick its result up by
+the job id, and every worker process shares the same queue.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from custom_parser import CustomResumeParser
+from data_access import get_connection, migrate, transaction
+from database_utils import save_user_data
+from db_migrations import run_migrations
+from nlp_models import preload_models
+from parse_cache import ParseCache, hash_pdf_bytes
+from pdf_preflight import preflight_pdf
+from resume_analysis import get_or_build_analysis, user_data_row
+from resume_document import ResumeDocument
+from resume_scorer import ResumeScorer
+from constants import (
+    JOBS_DB, USERS_DB, UPLOAD_DIR, ANALYSIS_WORKERS, JOB_POLL_SECONDS, JOB_STALE_SECONDS,
+    JOB_MAX_ATTEMPTS, JOB_RETENTION_SECONDS, JOB_PRUNE_INTERVAL_SECONDS, EXTRACTION_PROFILE
+)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Versioned schema for the job queue, applied by data_access.migrate
+JOBS_MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS analysis_jobs
+           (id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            stage TEXT NOT NULL DEFAULT '',
+            progress REAL NOT NULL DEFAULT 0,
+            file_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            finished_at REAL)''',
+        'CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs(status, created_at)'
+    ]),
+    # The user who submitted the job; only they can read its result
+    (2, ['ALTER TABLE analysis_jobs ADD COLUMN owner TEXT']),
+    # Token of the current claim; a worker may only update the job it still holds
+    (3, ['ALTER TABLE analysis_jobs ADD COLUMN worker TEXT'])
+]
+
+# Woken on submit so in-process workers do not wait for the next poll
+_wakeup = threading.Event()
+_workers = []
+_workers_lock = threading.Lock()
+
+
+class JobError(Exception):
+    """A job failed for a reason the user should see as is."""
+
+
+def init_jobs_db(db_path=JOBS_DB):
+    migrate(db_path, JOBS_MIGRATIONS)
+
+
+def submit_job(file_name, pdf_bytes, owner, db_path=JOBS_DB):
+    """Save an uploaded PDF, queue its analysis for owner and return the job id.
+
+    Each upload is kept in its own UPLOAD_DIR/<job id>/ directory, so two
+    uploads with the same file name never overwrite each other.
+    """
+    init_jobs_db(db_path)
+    job_id = uuid.uuid4().hex
+    job_dir = os.path.join(UPLOAD_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    file_path = os.path.join(job_dir, os.path.basename(file_name))
+    # Written under a temporary name and renamed, so a worker never reads a partial file
+    handle, temp_path = tempfile.mkstemp(dir=job_dir, suffix='.part')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(temp_path, file_path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+    now = time.time()
+    with transaction(db_path) as conn:
+        conn.execute('''INSERT INTO analysis_jobs
+                        (id, status, stage, file_name, file_path, owner, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (job_id, JOB_QUEUED, 'Waiting for a worker', file_name, file_path, owner,
+                      now, now))
+    _wakeup.set()
+    return job_id
+
+
+def get_job(job_id, owner, db_path=JOBS_DB):
+    """Return a job as a dict with its result decoded.
+
+    Returns None if the job is unknown or was submitted by someone other
+    than owner, so a job id alone never exposes another user's resume.
+    """
+    init_jobs_db(db_path)
+    conn = get_connection(db_path)
+    row = conn.execute('''SELECT id, status, stage, progress, file_name, result, error,
+                                 created_at, finished_at
+                          FROM analysis_jobs WHERE id = ? AND owner = ?''',
+                       (job_id, owner)).fetchone()
+    if row is None:
+        return None
+    job = dict(zip(('id', 'status', 'stage', 'progress', 'file_name', 'result', 'error',
+                    'created_at', 'finished_at'), row))
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+
+def claim_job(db_path=JOBS_DB):
+    """Atomically take the oldest queued job.
+
+    Returns (id, file_name, file_path, worker) or None, where worker is
+    the token the claimant passes to update_progress, finish_job and fail_job.
+    """
+    with transaction(db_path, immediate=True) as conn:
+        row = conn.execute('''SELECT id, file_name, file_path FROM analysis_jobs
+                                  WHERE status = ? ORDER BY created_at LIMIT 1''',
+                               (JOB_QUEUED,)).fetchone()
+        if row is not None:
+            worker = uuid.uuid4().hex
+            conn.execute('''UPDATE analysis_jobs
+                            SET status = ?, stage = ?, progress = 0, attempts = attempts + 1,
+                                worker = ?, updated_at = ?
+                            WHERE id = ?''', (JOB_RUNNING, 'Starting', worker, time.time(), row[0]))
+            row = (*row, worker)
+    return row
+
+
+# Updates from a worker only apply while it still holds the claim; once a
+# stale job is requeued and claimed again, the first worker's writes are dropped
+_CLAIMED = 'id = ? AND status = ? AND worker = ?'
+
+
+def update_progress(job_id, worker, stage, progress, db_path=JOBS_DB):
+    with transaction(db_path) as conn:
+        conn.execute(f'''UPDATE analysis_jobs SET stage = ?, progress = ?, updated_at = ?
+                         WHERE {_CLAIMED}''',
+                     (stage, progress, time.time(), job_id, JOB_RUNNING, worker))
+
+
+def finish_job(job_id, worker, result, db_path=JOBS_DB):
+    """Record a job's result; return False if the worker no longer held the job."""
+    now = time.time()
+    with transaction(db_path) as conn:
+        return conn.execute(f'''UPDATE analysis_jobs
+                                SET status = ?, stage = 'Done', progress = 1, result = ?,
+                                    updated_at = ?, finished_at = ?
+                                WHERE {_CLAIMED}''',
+                            (JOB_DONE, json.dumps(result), now, now,
+                             job_id, JOB_RUNNING, worker)).rowcount > 0
+
+
+def fail_job(job_id, worker, error, db_path=JOBS_DB):
+    """Record a job's error; return False if the worker no longer held the job."""
+    now = time.time()
+    with transaction(db_path) as conn:
+        return conn.execute(f'''UPDATE analysis_jobs
+                                SET status = ?, stage = 'Failed', error = ?,
+                                    updated_at = ?, finished_at = ?
+                                WHERE {_CLAIMED}''',
+                            (JOB_FAILED, error, now, now, job_id, JOB_RUNNING, worker)).rowcount > 0
+
+
+def requeue_stale_jobs(stale_seconds=JOB_STALE_SECONDS, db_path=JOBS_DB):
+    """Requeue running jobs whose worker stopped updating them, or fail them
+    once they have used up JOB_MAX_ATTEMPTS. Returns the number of jobs touched."""
+    cutoff = time.time() - stale_seconds
+    with transaction(db_path) as conn:
+        failed = conn.execute('''UPDATE analysis_jobs
+                                 SET status = ?, stage = 'Failed', finished_at = ?,
+                                     error = 'The analysis did not finish; please upload again'
+                                 WHERE status = ? AND updated_at < ? AND attempts >= ?''',
+                              (JOB_FAILED, time.time(), JOB_RUNNING, cutoff,
+                               JOB_MAX_ATTEMPTS)).rowcount
+        requeued = conn.execute('''UPDATE analysis_jobs
+                                   SET status = ?, stage = 'Waiting for a worker', progress = 0
+                                   WHERE status = ? AND updated_at < ?''',
+                                (JOB_QUEUED, JOB_RUNNING, cutoff)).rowcount
+    return failed + requeued
+
+
+def _application_resume_paths():
+    """Return the uploaded files that submitted applications still point at."""
+    try:
+        return {path for (path,) in get_connection(USERS_DB).execute(
+            """SELECT json_extract(resume_data, '$.original_resume_path')
+               FROM application_resumes WHERE json_valid(resume_data)""")}
+    except sqlite3.Error as e:
+        print(f"Could not read application resumes: {str(e)}")
+        return None
+
+
+def prune_finished_jobs(max_age=JOB_RETENTION_SECONDS, db_path=JOBS_DB):
+    """Delete done and failed jobs finished more than max_age seconds ago.
+
+    Their UPLOAD_DIR/<job id>/ directories go too, unless an application
+    still offers the uploaded PDF for download. Returns the number of jobs
+    deleted.
+    """
+    cutoff = time.time() - max_age
+    with transaction(db_path) as conn:
+        jobs = conn.execute('''SELECT id, file_path FROM analysis_jobs
+                               WHERE status IN (?, ?) AND finished_at < ?''',
+                            (JOB_DONE, JOB_FAILED, cutoff)).fetchall()
+        conn.executemany('DELETE FROM analysis_jobs WHERE id = ?',
+                         [(job_id,) for job_id, _ in jobs])
+    if not jobs:
+        return 0
+
+    kept = _application_resume_paths()
+    for job_id, file_path in jobs:
+        job_dir = os.path.join(UPLOAD_DIR, job_id)
+        # Uploads saved before per-job directories are left alone
+        if kept is None or file_path in kept or os.path.dirname(file_path) != job_dir:
+            continue
+        shutil.rmtree(job_dir, ignore_errors=True)
+    return len(jobs)
+
+
+# Per-worker singletons, created on first use in each thread or process
+_local = threading.local()
+
+
+def _pipeline():
+    if not hasattr(_local, 'scorer'):
+        _local.scorer = ResumeScorer()
+        _local.parse_cache = ParseCache()
+    return _local.scorer, _local.parse_cache
+
+
+def analyze_resume(file_name, file_path, progress):
+    """Run the upload pipeline on a saved PDF and return the job result.
+
+    ``progress(stage, fraction)`` is called as the pipeline advances.
+    Raises JobError with a user-facing message when the resume is rejected.
+    """
+    scorer, parse_cache = _pipeline()
+
+    progress('Checking PDF', 0.05)
+    with open(file_path, 'rb') as f:
+        pdf_bytes = f.read()
+    report = preflight_pdf(pdf_bytes)
+    if not report.ok:
+        raise JobError(f"Cannot analyse this resume: {report.reason}")
+
+    # Identical uploads skip pdfminer entirely
+    pdf_hash = hash_pdf_bytes(pdf_bytes, EXTRACTION_PROFILE)
+    cached = parse_cache.get(pdf_hash)
+    if cached:
+        resume_data, resume_text = cached
+    else:
+        pages = report.parse_pages or report.page_count
+
+        def on_page(done):
+            progress(f'Reading page {done} of {pages}', 0.1 + 0.6 * done / pages)
+
+        document = ResumeDocument(file_path, max_pages=report.parse_pages, on_page=on_page)
+        if not document.text:
+            raise JobError("Failed to extract data from resume")
+        progress('Extracting details', 0.75)
+        resume_data = CustomResumeParser(file_path, document=document).get_extracted_data()
+        resume_text = document.text
+        parse_cache.put(pdf_hash, resume_data, resume_text)
+    resume_data['original_resume_path'] = file_path
+
+    progress('Scoring', 0.85)
+    analysis = get_or_build_analysis(resume_data, scorer)
+
+    progress('Saving', 0.95)
+    try:
+        save_user_data(user_data_row(resume_data, analysis, file_name))
+    except Exception as e:
+        # The analysis is still shown to the user; only the admin table misses it
+        print(f"Could not save the analysis of {file_name} to the resume database: {str(e)}")
+
+    return {
+        'resume_data': resume_data,
+        'resume_text': resume_text,
+        'analysis': analysis.to_dict(),
+        'notes': report.notes,
+    }
+
+
+def run_job(job_id, file_name, file_path, worker, db_path=JOBS_DB):
+    """Run one claimed job and record its result or error."""
+    def progress(stage, fraction):
+        update_progress(job_id, worker, stage, round(fraction, 3), db_path)
+
+    try:
+        result = analyze_resume(file_name, file_path, progress)
+    except JobError as e:
+        recorded = fail_job(job_id, worker, str(e), db_path)
+    except Exception as e:
+        print(f"Analysis job {job_id} failed: {str(e)}")
+        recorded = fail_job(job_id, worker, f"Error processing resume: {str(e)}", db_path)
+    else:
+        recorded = finish_job(job_id, worker, result, db_path)
+    if not recorded:
+        print(f"Analysis job {job_id} was claimed by another worker; result dropped")
+
+
+def work(db_path=JOBS_DB, stop=None, poll_seconds=JOB_POLL_SECONDS, drain=False):
+    """Claim and run jobs until ``stop`` is set (or the queue is empty with ``drain``)."""
+    init_jobs_db(db_path)
+    requeue_stale_jobs(db_path=db_path)
+    next_prune = 0
+    while stop is None or not stop.is_set():
+        job = claim_job(db_path)
+        if job is not None:
+            run_job(*job, db_path=db_path)
+            continue
+        if time.time() >= next_prune:
+            prune_finished_jobs(db_path=db_path)
+            next_prune = time.time() + JOB_PRUNE_INTERVAL_SECONDS
+        if drain:
+            return
+        _wakeup.wait(poll_seconds)
+        _wakeup.clear()
+        requeue_stale_jobs(db_path=db_path)
+
+
+def start_workers(count=ANALYSIS_WORKERS, db_path=JOBS_DB):
+    """Start ``count`` daemon worker threads in this process, once."""
+    with _workers_lock:
+        if _workers:
+            return len(_workers)
+        init_jobs_db(db_path)
+        for number in range(count):
+            thread = threading.Thread(target=work, args=(db_path,),
+                                      name=f'analysis-worker-{number + 1}', daemon=True)
+            thread.start()
+            _workers.append(thread)
+    return len(_workers)
+
+
+def _process_worker(db_path, drain):
+    # Load the NLTK models before the first job arrives
+    preload_models()
+    try:
+        work(db_path, drain=drain)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run resume analysis workers.')
+    parser.add_argument('--db', default=JOBS_DB, help=f'Job queue database (default: {JOBS_DB})')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: number of CPU cores)')
+    parser.add_argument('--drain', action='store_true',
+                        help='Exit once the queue is empty instead of waiting for jobs')
+    args = parser.parse_args(argv)
+
+    run_migrations()
+    init_jobs_db(args.db)
+    processes = [multiprocessing.Process(target=_process_worker, args=(args.db, args.drain),
+                                         name=f'analysis-worker-{number + 1}')
+                 for number in range(max(1, args.workers))]
+    for process in processes:
+        process.start()
+    print(f"Started {len(processes)} analysis workers on {args.db}")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Aggregate queries behind the admin Visual Analytics view.
+
+Counts and means are read from the materialised company statistics;
+the score histogram, range and percentiles are computed by SQLite over
+idx_applications_company_date. Only grouped rows come back, so memory
+and latency depend on the number of distinct statuses, score buckets
+and days rather than on the number of applications. Results are cached
+per company until an application for that company is submitted or
+changes status.
+"""
+
+import os
+import threading
+from data_access import get_connection
+from company_stats import get_company_stats, get_daily_counts
+
+SCORE_BUCKET_WIDTH = 10
+PERCENTILES = (0.25, 0.5, 0.75)
+
+_cache = {}
+# Bumped on every invalidation so a computation that raced a write is not cached
+_generation = 0
+_cache_lock = threading.Lock()
+
+
+def _score_distribution(conn, company_username):
+    """Return [(score, count), ...] ordered by score, one row per whole point."""
+    return conn.execute("""
+        SELECT CAST(ROUND(CAST(resume_score AS REAL)) AS INTEGER) AS score, COUNT(*)
+        FROM applications
+        WHERE company_username = ? AND resume_score IS NOT NULL AND resume_score != ''
+        GROUP BY score
+        ORDER BY score
+    """, (company_username,)).fetchall()
+
+
+def _percentiles(distribution, total):
+    """Approximate percentiles from a bucketed distribution's cumulative counts."""
+    result = {}
+    cumulative = 0
+    targets = list(PERCENTILES)
+    for score, count in distribution:
+        cumulative += count
+        while targets and cumulative >= targets[0] * total:
+            result[targets.pop(0)] = float(score)
+    return result
+
+
+def compute_analytics(db_path, company_username):
+    """Run the aggregate queries for one company and return a small dict."""
+    conn = get_connection(db_path)
+
+    # Status counts, mean and daily counts come from the materialised statistics
+    stats = get_company_stats(db_path, company_username)
+    status_counts = sorted(stats['by_status'].items(), key=lambda item: item[1], reverse=True)
+
+    histogram = conn.execute(f"""
+        SELECT MIN(CAST(CAST(resume_score AS REAL) / {SCORE_BUCKET_WIDTH} AS INTEGER),
+                   {100 // SCORE_BUCKET_WIDTH - 1}) * {SCORE_BUCKET_WIDTH} AS bucket,
+               COUNT(*)
+        FROM applications
+        WHERE company_username = ? AND resume_score IS NOT NULL AND resume_score != ''
+        GROUP BY bucket
+        ORDER BY bucket
+    """, (company_username,)).fetchall()
+
+    lowest, highest = conn.execute("""
+        SELECT MIN(CAST(resume_score AS REAL)), MAX(CAST(resume_score AS REAL))
+        FROM applications
+        WHERE company_username = ? AND resume_score IS NOT NULL AND resume_score != ''
+    """, (company_username,)).fetchone()
+
+    distribution = _score_distribution(conn, company_username)
+    return {
+        'total': stats['total'],
+        'status_counts': status_counts,
+        'score_histogram': [(bucket, bucket + SCORE_BUCKET_WIDTH, count)
+                            for bucket, count in histogram],
+        'score_stats': {
+            'count': stats['scored'],
+            'mean': stats['mean'],
+            'std': stats['std'],
+            'min': lowest or 0.0,
+            'max': highest or 0.0,
+            'percentiles': _percentiles(distribution, stats['scored']),
+        },
+        'daily_counts': get_daily_counts(db_path, company_username),
+    }
+
+
+def get_analytics(db_path, company_username):
+    """Return cached analytics for a company, computing them on a miss."""
+    key = (os.path.abspath(db_path), company_username)
+    with _cache_lock:
+        cached = _cache.get(key)
+        generation = _generation
+    if cached is not None:
+        return cached
+
+    analytics = compute_analytics(db_path, company_username)
+    with _cache_lock:
+        if generation == _generation:
+            _cache[key] = analytics
+    return analytics
+
+
+def invalidate_analytics(db_path, company_username=None):
+    """Drop cached analytics for one company, or for every company in db_path."""
+    global _generation
+    db_key = os.path.abspath(db_path)
+    with _cache_lock:
+        _generation += 1
+        for key in list(_cache):
+            if key[0] == db_key and company_username in (None, key[1]):
+                del _cache[key]
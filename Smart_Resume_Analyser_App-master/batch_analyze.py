@@ -0,0 +1,219 @@
+"""Headless batch analysis of a folder of resumes.
+
+Usage:
+    python batch_analyze.py Uploaded_Resumes/ -o results.jsonl
+    python batch_analyze.py "career_fair/**/*.pdf" -o results.csv --no-db
+    python batch_analyze.py portfolios/ -o contacts.csv --contact-only
+
+Each PDF is parsed and scored in a separate worker process (pdfminer is
+pure Python and CPU-bound), and results are streamed to the output file
+and the resume database as soon as each one finishes.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from custom_parser import CustomResumeParser, stream_contact_details
+from resume_scorer import ResumeScorer
+from parse_cache import ParseCache, hash_pdf_bytes
+from resume_document import ResumeDocument, EXTRACTION_PROFILES
+from pdf_preflight import preflight_pdf
+from resume_analysis import get_or_build_analysis, user_data_row
+from database_utils import save_user_data
+from db_migrations import run_migrations
+from nlp_models import preload_models
+from constants import CONTACT_STREAM_MAX_PAGES, BULK_EXTRACTION_PROFILE
+
+RESULT_FIELDS = [
+    'file', 'name', 'email', 'mobile_number', 'no_of_pages', 'skills',
+    'experience_score', 'skills_score', 'education_score', 'completeness_score',
+    'total_score', 'experience_level', 'error'
+]
+
+# Per-worker singletons, created once by _init_worker
+_scorer = None
+_parse_cache = None
+
+
+def _init_worker():
+    global _scorer, _parse_cache
+    _scorer = ResumeScorer()
+    _parse_cache = ParseCache()
+    # Load the NLTK models before the first resume arrives
+    preload_models()
+
+
+def collect_pdfs(inputs):
+    """Expand directories and glob patterns into a sorted list of PDF paths."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, '**', '*.pdf')
+        else:
+            pattern = item
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith('.pdf'):
+                paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def analyze_file(path, profile=BULK_EXTRACTION_PROFILE):
+    """Parse and score a single resume. Runs inside a worker process."""
+    result = {'file': path, 'error': ''}
+    try:
+        with open(path, 'rb') as f:
+            pdf_bytes = f.read()
+        report = preflight_pdf(pdf_bytes)
+        if not report.ok:
+            result['error'] = report.reason
+            return result
+        pdf_hash = hash_pdf_bytes(pdf_bytes, profile)
+
+        cached = _parse_cache.get(pdf_hash)
+        if cached:
+            resume_data = cached[0]
+        else:
+            document = ResumeDocument(path, max_pages=report.parse_pages, profile=profile)
+            resume_data = CustomResumeParser(path, document=document).get_extracted_data()
+            _parse_cache.put(pdf_hash, resume_data, document.text)
+
+        analysis = get_or_build_analysis(resume_data, _scorer)
+        score_details = analysis.score_details
+        result.update({
+            'analysis_id': analysis.resume_hash,
+            'name': resume_data.get('name', 'Unknown'),
+            'email': resume_data.get('email', ''),
+            'mobile_number': resume_data.get('mobile_number', ''),
+            'no_of_pages': resume_data.get('no_of_pages', 0),
+            'skills': resume_data.get('skills', []),
+            'experience_score': score_details['experience_score'],
+            'skills_score': score_details['skills_score'],
+            'education_score': score_details['education_score'],
+            'completeness_score': score_details['completeness_score'],
+            'total_score': score_details['total_score'],
+            'experience_level': score_details['experience_level'],
+            # The user_data row, saved by the parent; not written to the output
+            'user_data': user_data_row(resume_data, analysis, os.path.basename(path)),
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def analyze_contacts(path, max_pages=None, profile=BULK_EXTRACTION_PROFILE):
+    """Extract only name, email and phone, stopping layout once they are found."""
+    result = {'file': path, 'error': ''}
+    try:
+        details, _ = stream_contact_details(path, max_pages=max_pages, profile=profile)
+        result.update(details)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+class ResultWriter:
+    """Stream results to a JSONL or CSV file as they arrive."""
+
+    def __init__(self, path, fmt=None):
+        self.format = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.csv_writer = None
+        if self.format == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, result):
+        if self.csv_writer:
+            row = dict(result)
+            row['skills'] = ', '.join(row.get('skills', []))
+            self.csv_writer.writerow(row)
+        else:
+            self.file.write(json.dumps(result) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def save_to_database(result):
+    """Store a successful result in the user_data table; errors are printed."""
+    try:
+        save_user_data(result['user_data'])
+        return True
+    except Exception as e:
+        print(f"Could not save {result['file']} to the database: {e}")
+        return False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Analyse a batch of PDF resumes.')
+    parser.add_argument('inputs', nargs='+', help='Directories or glob patterns of PDF files')
+    parser.add_argument('-o', '--output', default='batch_results.jsonl',
+                        help='Output file (.jsonl or .csv, default: batch_results.jsonl)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help='Output format (default: inferred from the output extension)')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: number of CPU cores)')
+    parser.add_argument('--no-db', action='store_true',
+                        help='Do not write results to the resume database')
+    parser.add_argument('--contact-only', action='store_true',
+                        help='Only extract name, email and phone (implies --no-db)')
+    parser.add_argument('--max-pages', type=int, default=CONTACT_STREAM_MAX_PAGES,
+                        help='Pages read at most with --contact-only '
+                             f'(default: {CONTACT_STREAM_MAX_PAGES})')
+    parser.add_argument('--profile', choices=list(EXTRACTION_PROFILES), default=BULK_EXTRACTION_PROFILE,
+                        help='Text extraction profile; "fast" skips layout analysis '
+                             f'(default: {BULK_EXTRACTION_PROFILE})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = collect_pdfs(args.inputs)
+    if not paths:
+        print("No PDF files found.")
+        return 1
+    run_migrations()
+
+    workers = max(1, min(args.workers, len(paths)))
+    print(f"Analysing {len(paths)} resumes with {workers} workers...")
+
+    if args.contact_only:
+        task = partial(analyze_contacts, max_pages=args.max_pages, profile=args.profile)
+    else:
+        task = partial(analyze_file, profile=args.profile)
+
+    writer = ResultWriter(args.output, args.format)
+    start = time.time()
+    failed = 0
+    try:
+        with Pool(processes=workers, initializer=_init_worker) as pool:
+            for done, result in enumerate(pool.imap_unordered(task, paths), 1):
+                writer.write({key: value for key, value in result.items() if key != 'user_data'})
+                if result['error']:
+                    failed += 1
+                    print(f"[{done}/{len(paths)}] FAILED {result['file']}: {result['error']}")
+                    continue
+                if args.contact_only:
+                    print(f"[{done}/{len(paths)}] {result['file']}: {result['email'] or 'no email'}")
+                    continue
+                if not args.no_db:
+                    save_to_database(result)
+                print(f"[{done}/{len(paths)}] {result['file']}: {result['total_score']}%")
+    finally:
+        writer.close()
+
+    elapsed = time.time() - start
+    print(f"Done: {len(paths) - failed} analysed, {failed} failed in {elapsed:.1f}s -> {args.output}")
+    return 0 if failed == 0 else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
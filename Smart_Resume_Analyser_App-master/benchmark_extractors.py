@@ -0,0 +1,169 @@
+"""Micro-benchmark of CustomResumeParser's per-resume extraction time.
+
+Usage:
+    python benchmark_extractors.py -n 200
+    python benchmark_extractors.py Uploaded_Resumes/*.pdf -n 200
+    python benchmark_extractors.py --baseline -n 200
+
+Without PDF arguments the committed fixtures in fixtures/resumes are
+used (see fixtures/make_resumes.py). Each PDF is read once; the
+benchmark then times only the text extractors (no pdfminer work) over
+repeated parser instances and prints the mean time per resume for each
+one. ``--baseline`` times BaselineParser instead, which runs the email,
+phone, education and experience extractors with the uncompiled pattern
+lists the parser used before its compiled pattern bank.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from custom_parser import CustomResumeParser
+from resume_document import ResumeDocument
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'resumes')
+
+EXTRACTORS = ['extract_name', 'extract_email', 'extract_mobile_number',
+              'extract_skills', 'extract_education', 'extract_experience']
+
+# The parser's patterns before they were compiled into one bank
+BASELINE_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+BASELINE_PHONE_PATTERN = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
+BASELINE_EDUCATION_KEYWORDS = [
+    'education', 'qualification', 'academic', 'degree',
+    'bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'b.e', 'm.e',
+    'b.sc', 'm.sc', 'b.a', 'm.a', 'diploma', 'university', 'college',
+    'institute', 'school'
+]
+BASELINE_DEGREE_PATTERNS = [
+    r'(?i)b\.?tech|bachelor of technology',
+    r'(?i)m\.?tech|master of technology',
+    r'(?i)b\.?e|bachelor of engineering',
+    r'(?i)m\.?e|master of engineering',
+    r'(?i)b\.?sc|bachelor of science',
+    r'(?i)m\.?sc|master of science',
+    r'(?i)b\.?a|bachelor of arts',
+    r'(?i)m\.?a|master of arts',
+    r'(?i)phd|ph\.?d|doctor of philosophy',
+    r'(?i)diploma in \w+'
+]
+BASELINE_EXPERIENCE_KEYWORDS = [
+    'experience', 'employment', 'work history', 'professional background',
+    'career history', 'work experience', 'professional experience'
+]
+BASELINE_DATE_PATTERN = r'(?i)(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|may|june|july|august|september|october|november|december)\s*\d{4}\s*-\s*(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|may|june|july|august|september|october|november|december|present)\s*\d{0,4}'
+
+
+class BaselineParser(CustomResumeParser):
+    """CustomResumeParser with the old pattern set, for before/after timings."""
+
+    def extract_email(self):
+        matches = re.findall(BASELINE_EMAIL_PATTERN, self.text)
+        return matches[0] if matches else ''
+
+    def extract_mobile_number(self):
+        matches = re.findall(BASELINE_PHONE_PATTERN, self.text)
+        return matches[0] if matches else ''
+
+    def extract_education(self):
+        education = []
+        education_section = []
+        in_education_section = False
+        for line in self.text_lines:
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in BASELINE_EDUCATION_KEYWORDS):
+                in_education_section = True
+                continue
+            if in_education_section and line.strip() and \
+                    not any(keyword in line_lower for keyword in BASELINE_EDUCATION_KEYWORDS):
+                if any(re.search(pattern, line) for pattern in BASELINE_DEGREE_PATTERNS):
+                    education_section.append(line.strip())
+                elif any(word.isupper() for word in line.split()):
+                    education_section.append(line.strip())
+            if in_education_section and \
+                    any(keyword in line_lower for keyword in ['experience', 'skills', 'projects']):
+                in_education_section = False
+
+        for line in self.text_lines:
+            for pattern in BASELINE_DEGREE_PATTERNS:
+                match = re.search(pattern, line, re.IGNORECASE)
+                if match and line.strip() not in education:
+                    education.append(line.strip())
+        education.extend([item for item in education_section if item not in education])
+        return list(set(education))
+
+    def extract_experience(self):
+        experience = []
+        in_experience_section = False
+        current_experience = []
+        for line in self.text_lines:
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in BASELINE_EXPERIENCE_KEYWORDS):
+                in_experience_section = True
+                if line.strip() and not any(keyword == line_lower
+                                            for keyword in BASELINE_EXPERIENCE_KEYWORDS):
+                    current_experience.append(line.strip())
+                continue
+            if in_experience_section and line.strip():
+                if re.search(BASELINE_DATE_PATTERN, line):
+                    if current_experience:
+                        experience.append(' | '.join(current_experience))
+                        current_experience = []
+                    current_experience.append(line.strip())
+                elif any(word.isupper() for word in line.split()) or line[0].isupper() or \
+                        line.strip().startswith(('•', '-', '*')):
+                    current_experience.append(line.strip())
+            if in_experience_section and any(keyword in line_lower for keyword in
+                                             ['education', 'skills', 'projects', 'achievements']):
+                in_experience_section = False
+                if current_experience:
+                    experience.append(' | '.join(current_experience))
+        if current_experience:
+            experience.append(' | '.join(current_experience))
+        return experience
+
+
+def benchmark(documents, iterations, parser_class=CustomResumeParser):
+    """Return {extractor: mean seconds per resume} over every document."""
+    totals = dict.fromkeys(EXTRACTORS, 0.0)
+    for _ in range(iterations):
+        for path, document in documents:
+            parser = parser_class(path, document=document)
+            for name in EXTRACTORS:
+                method = getattr(parser, name)
+                start = time.perf_counter()
+                method()
+                totals[name] += time.perf_counter() - start
+    runs = iterations * len(documents)
+    return {name: total / runs for name, total in totals.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the resume text extractors.')
+    parser.add_argument('pdfs', nargs='*',
+                        help='PDF resumes to benchmark on (default: the fixtures in fixtures/resumes)')
+    parser.add_argument('-n', '--iterations', type=int, default=100,
+                        help='Times each resume is extracted (default: 100)')
+    parser.add_argument('--baseline', action='store_true',
+                        help='Time the parser\'s patterns from before they were precompiled')
+    args = parser.parse_args(argv)
+
+    paths = args.pdfs or sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.pdf')))
+    documents = [(path, ResumeDocument(path)) for path in paths]
+    # Warm-up pass so one-off loading is not counted
+    parser_class = BaselineParser if args.baseline else CustomResumeParser
+    benchmark(documents, 1, parser_class)
+    results = benchmark(documents, args.iterations, parser_class)
+
+    print(f"{'extractor':<24}{'us/resume':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<24}{seconds * 1e6:>12.1f}")
+    print(f"{'total':<24}{sum(results.values()) * 1e6:>12.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
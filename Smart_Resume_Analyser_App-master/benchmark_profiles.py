@@ -0,0 +1,120 @@
+"""Compare the text extraction profiles on a corpus of PDF resumes.
+
+Usage:
+    python benchmark_profiles.py -n 3
+    python benchmark_profiles.py Uploaded_Resumes/*.pdf -n 3
+
+Every profile in EXTRACTION_PROFILES extracts and parses each PDF ``-n``
+times. The benchmark prints throughput per profile and, for each field,
+the share of resumes on which the profile agrees with the reference: the
+"accurate" profile by default, or the expected values in ``--truth``
+(JSON lines with a "file" key plus any of the fields to check). Against
+expected values, skills agree when every expected skill is found.
+Without PDF arguments the committed fixtures in fixtures/resumes are
+used and checked against their expected.jsonl (see
+fixtures/make_resumes.py).
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from custom_parser import CustomResumeParser
+from nlp_models import preload_models
+from resume_document import ResumeDocument, EXTRACTION_PROFILES
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'resumes')
+
+FIELDS = ['name', 'email', 'mobile_number', 'skills', 'education', 'experience', 'no_of_pages']
+# Fields compared without regard to order
+UNORDERED_FIELDS = {'skills'}
+# Against expected values these only need every expected item, since the
+# skill scan also finds skills named in other sections (such as a degree)
+CONTAINED_FIELDS = {'skills'}
+
+
+def extract(paths, profile, iterations):
+    """Return ({path: resume_data}, seconds, pages laid out) for one profile."""
+    results = {}
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for path in paths:
+            document = ResumeDocument(path, profile=profile)
+            results[path] = CustomResumeParser(path, document=document).get_extracted_data()
+            pages += len(document.page_texts)
+    return results, time.perf_counter() - start, pages
+
+
+def _same(field, value, expected, truth):
+    if truth and field in CONTAINED_FIELDS:
+        return set(expected) <= set(value)
+    if field in UNORDERED_FIELDS:
+        return sorted(value) == sorted(expected)
+    return value == expected
+
+
+def agreement(results, reference, truth=False):
+    """Return {field: share of resumes whose value matches the reference}.
+
+    With truth, reference holds expected values rather than another
+    profile's output.
+    """
+    shares = {}
+    for field in FIELDS:
+        matches = [_same(field, results[path][field], expected[field], truth)
+                   for path, expected in reference.items()
+                   if path in results and field in expected]
+        if matches:
+            shares[field] = sum(matches) / len(matches)
+    return shares
+
+
+def load_truth(path):
+    """Read expected field values keyed by absolute PDF path."""
+    truth = {}
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                truth[os.path.abspath(os.path.join(base, row.pop('file')))] = row
+    return truth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare the PDF text extraction profiles.')
+    parser.add_argument('pdfs', nargs='*',
+                        help='PDF resumes to benchmark on (default: the fixtures in fixtures/resumes)')
+    parser.add_argument('-n', '--iterations', type=int, default=3,
+                        help='Times each resume is extracted per profile (default: 3)')
+    parser.add_argument('--truth', help='JSONL file of expected field values (default: the '
+                                        'fixtures\' expected.jsonl without PDF arguments, '
+                                        'else compare against the accurate profile)')
+    args = parser.parse_args(argv)
+
+    if not args.pdfs:
+        args.pdfs = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.pdf')))
+        args.truth = args.truth or os.path.join(FIXTURE_DIR, 'expected.jsonl')
+    paths = [os.path.abspath(path) for path in args.pdfs]
+    preload_models()
+    # Warm-up pass so one-off loading is not counted
+    extract(paths[:1], 'accurate', 1)
+
+    runs = {profile: extract(paths, profile, args.iterations) for profile in EXTRACTION_PROFILES}
+    reference = load_truth(args.truth) if args.truth else runs['accurate'][0]
+
+    print(f"{'profile':<12}{'ms/resume':>12}{'pages/s':>10}  agreement")
+    for profile, (results, seconds, pages) in runs.items():
+        shares = agreement(results, reference, truth=bool(args.truth))
+        fields = ' '.join(f"{field}={share:.0%}" for field, share in shares.items())
+        print(f"{profile:<12}{seconds * 1e3 / (len(paths) * args.iterations):>12.1f}"
+              f"{pages / seconds:>10.1f}  {fields}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
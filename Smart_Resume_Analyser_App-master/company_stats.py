@@ -0,0 +1,208 @@
+"""Materialised per-company application statistics.
+
+company_status_stats keeps, for every company and status, the number of
+applications and the count, sum and sum of squares of their scores;
+company_daily_stats keeps the number of applications per company per
+day. Triggers on applications update both tables inside the same
+transaction as the insert, status change or delete that caused them,
+so dashboards read a handful of rows instead of scanning applications.
+
+Usage:
+    python company_stats.py --check      # compare against the raw tables
+    python company_stats.py --rebuild    # recompute from the raw tables
+"""
+
+import argparse
+import math
+import sys
+from data_access import get_connection, transaction, migrate
+from constants import USERS_DB
+
+# A score counts towards the score aggregates only if one was recorded
+_SCORED = "({row}.resume_score IS NOT NULL AND {row}.resume_score != '')"
+_SCORE = "(CASE WHEN {scored} THEN CAST({row}.resume_score AS REAL) ELSE 0 END)"
+
+
+def _add_status_row(row, sign):
+    scored = _SCORED.format(row=row)
+    score = _SCORE.format(scored=scored, row=row)
+    if sign > 0:
+        return f'''INSERT INTO company_status_stats
+                   (company_username, status, applications, scored, score_sum, score_sum_sq)
+                   VALUES ({row}.company_username, {row}.status, 1, {scored}, {score}, {score} * {score})
+                   ON CONFLICT (company_username, status) DO UPDATE SET
+                       applications = applications + 1,
+                       scored = scored + excluded.scored,
+                       score_sum = score_sum + excluded.score_sum,
+                       score_sum_sq = score_sum_sq + excluded.score_sum_sq;'''
+    return f'''UPDATE company_status_stats SET
+                   applications = applications - 1,
+                   scored = scored - {scored},
+                   score_sum = score_sum - {score},
+                   score_sum_sq = score_sum_sq - {score} * {score}
+               WHERE company_username = {row}.company_username AND status = {row}.status;'''
+
+
+def _add_daily_row(row, sign):
+    if sign > 0:
+        return f'''INSERT INTO company_daily_stats (company_username, day, applications)
+                   VALUES ({row}.company_username, date({row}.application_date), 1)
+                   ON CONFLICT (company_username, day) DO UPDATE SET
+                       applications = applications + 1;'''
+    return f'''UPDATE company_daily_stats SET applications = applications - 1
+               WHERE company_username = {row}.company_username
+                 AND day = date({row}.application_date);'''
+
+
+STATS_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS company_status_stats
+       (company_username TEXT NOT NULL,
+        status TEXT NOT NULL,
+        applications INTEGER NOT NULL DEFAULT 0,
+        scored INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        score_sum_sq REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (company_username, status))''',
+    '''CREATE TABLE IF NOT EXISTS company_daily_stats
+       (company_username TEXT NOT NULL,
+        day TEXT NOT NULL,
+        applications INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (company_username, day))''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_company_stats_insert
+        AFTER INSERT ON applications
+        BEGIN
+            {_add_status_row('NEW', 1)}
+            {_add_daily_row('NEW', 1)}
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_company_stats_update
+        AFTER UPDATE OF company_username, status, resume_score ON applications
+        BEGIN
+            {_add_status_row('OLD', -1)}
+            {_add_status_row('NEW', 1)}
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_company_stats_daily_update
+        AFTER UPDATE OF company_username, application_date ON applications
+        BEGIN
+            {_add_daily_row('OLD', -1)}
+            {_add_daily_row('NEW', 1)}
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_company_stats_delete
+        AFTER DELETE ON applications
+        BEGIN
+            {_add_status_row('OLD', -1)}
+            {_add_daily_row('OLD', -1)}
+        END'''
+]
+
+_RAW_SCORED = _SCORED.format(row='applications')
+_RAW_SCORE = _SCORE.format(scored=_RAW_SCORED, row='applications')
+_RAW_STATUS_STATS = f'''
+    SELECT company_username, status, COUNT(*), SUM({_RAW_SCORED}),
+           SUM({_RAW_SCORE}), SUM({_RAW_SCORE} * {_RAW_SCORE})
+    FROM applications
+    GROUP BY company_username, status'''
+
+_RAW_DAILY_STATS = '''
+    SELECT company_username, date(application_date), COUNT(*)
+    FROM applications
+    GROUP BY company_username, date(application_date)'''
+
+
+def rebuild_company_stats(conn):
+    """Recompute both statistics tables from applications on an open connection."""
+    conn.execute('DELETE FROM company_status_stats')
+    conn.execute('DELETE FROM company_daily_stats')
+    conn.execute(f'''INSERT INTO company_status_stats
+                     (company_username, status, applications, scored, score_sum, score_sum_sq)
+                     {_RAW_STATUS_STATS}''')
+    conn.execute(f'''INSERT INTO company_daily_stats (company_username, day, applications)
+                     {_RAW_DAILY_STATS}''')
+
+
+def check_company_stats(conn):
+    """Return a list of (table, key, stored, expected) rows that disagree."""
+    mismatches = []
+    stored = {row[:2]: row[2:] for row in conn.execute(
+        '''SELECT company_username, status, applications, scored, score_sum, score_sum_sq
+           FROM company_status_stats WHERE applications != 0''')}
+    expected = {row[:2]: row[2:] for row in conn.execute(_RAW_STATUS_STATS)}
+    for key in stored.keys() | expected.keys():
+        have, want = stored.get(key), expected.get(key)
+        if have is None or want is None or have[:2] != want[:2] or \
+                not all(math.isclose(a, b, abs_tol=1e-6) for a, b in zip(have[2:], want[2:])):
+            mismatches.append(('company_status_stats', key, have, want))
+
+    stored = {row[:2]: row[2] for row in conn.execute(
+        '''SELECT company_username, day, applications
+           FROM company_daily_stats WHERE applications != 0''')}
+    expected = {row[:2]: row[2] for row in conn.execute(_RAW_DAILY_STATS)}
+    for key in stored.keys() | expected.keys():
+        if stored.get(key) != expected.get(key):
+            mismatches.append(('company_daily_stats', key, stored.get(key), expected.get(key)))
+    return mismatches
+
+
+def get_company_stats(db_path, company_username):
+    """Return the dashboard summary for a company from its status rows."""
+    rows = get_connection(db_path).execute('''
+        SELECT status, applications, scored, score_sum, score_sum_sq
+        FROM company_status_stats
+        WHERE company_username = ? AND applications > 0
+    ''', (company_username,)).fetchall()
+
+    by_status = {status: applications for status, applications, _, _, _ in rows}
+    scored = sum(row[2] for row in rows)
+    score_sum = sum(row[3] for row in rows)
+    score_sum_sq = sum(row[4] for row in rows)
+    mean = score_sum / scored if scored else 0.0
+    variance = max(score_sum_sq / scored - mean * mean, 0.0) if scored else 0.0
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'scored': scored,
+        'mean': mean,
+        'std': math.sqrt(variance),
+    }
+
+
+def get_daily_counts(db_path, company_username):
+    """Return [(day, applications), ...] for a company in date order."""
+    return get_connection(db_path).execute('''
+        SELECT day, applications FROM company_daily_stats
+        WHERE company_username = ? AND applications > 0
+        ORDER BY day
+    ''', (company_username,)).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check or rebuild the company statistics tables.')
+    parser.add_argument('--db', default=USERS_DB, help=f'Path to users.db (default: {USERS_DB})')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Recompute the statistics from the applications table')
+    parser.add_argument('--check', action='store_true',
+                        help='Report rows that disagree with the applications table')
+    args = parser.parse_args(argv)
+    if not (args.rebuild or args.check):
+        parser.error('nothing to do; pass --check and/or --rebuild')
+
+    # The statistics tables are created by the users.db migrations
+    from login import USERS_MIGRATIONS
+    migrate(args.db, USERS_MIGRATIONS)
+
+    if args.check:
+        mismatches = check_company_stats(get_connection(args.db))
+        for table, key, stored, expected in mismatches:
+            print(f"{table} {key}: stored {stored}, expected {expected}")
+        print(f"{len(mismatches)} mismatched rows")
+        if mismatches and not args.rebuild:
+            return 1
+
+    if args.rebuild:
+        with transaction(args.db) as conn:
+            rebuild_company_stats(conn)
+        print("Company statistics rebuilt")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
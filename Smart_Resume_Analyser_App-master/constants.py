@@ -5,16 +5,86 @@ import os
 # Directory paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_DIR = os.path.join(BASE_DIR, 'Uploaded_Resumes')
-DATABASE_DIR = os.path.join(BASE_DIR, 'database')
+# Result exports prepared for download on the admin Export Results page
+EXPORT_DIR = os.path.join(BASE_DIR, 'Exports')
+# Every SQLite database lives here; override with RESUME_DATA_DIR
+DATABASE_DIR = os.path.abspath(os.getenv('RESUME_DATA_DIR', os.path.join(BASE_DIR, 'database')))
 
 # Ensure directories exist
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(EXPORT_DIR, exist_ok=True)
 os.makedirs(DATABASE_DIR, exist_ok=True)
 
 # Database paths
 DB_PATH = DATABASE_DIR
 DB_FILE = os.path.join(DATABASE_DIR, 'resume_data.db')
 USERS_DB = os.path.join(DATABASE_DIR, 'users.db')
+# Email accounts of modules.auth
+AUTH_DB = os.path.join(DATABASE_DIR, 'auth_users.db')
+
+# Skill taxonomy shared by the parser, scorer and recommenders
+TAXONOMY_FILE = os.path.join(BASE_DIR, 'skill_taxonomy.json')
+
+# Parse cache (keyed by SHA-256 of the uploaded PDF bytes)
+PARSE_CACHE_DB = os.path.join(DATABASE_DIR, 'parse_cache.db')
+PARSE_CACHE_MAX_ENTRIES = 500
+# Bump whenever CustomResumeParser output changes so stale entries are ignored
+PARSER_VERSION = 5
+
+# Stored resume analyses (see resume_analysis), keyed by resume hash and
+# ANALYSIS_VERSION; bump it whenever ResumeScorer or the analysis rules
+# change so stored results are rebuilt
+ANALYSIS_DB = os.path.join(DATABASE_DIR, 'resume_analyses.db')
+ANALYSIS_VERSION = 1
+
+# Upload limits checked by pdf_preflight before any layout analysis.
+# Override with RESUME_MAX_UPLOAD_MB, RESUME_MAX_PAGES and RESUME_MAX_PARSE_PAGES
+MAX_UPLOAD_BYTES = int(float(os.getenv('RESUME_MAX_UPLOAD_MB', '10')) * 1024 * 1024)
+# Documents with more pages are rejected
+MAX_PDF_PAGES = int(os.getenv('RESUME_MAX_PAGES', '50'))
+# Only this many leading pages of longer documents are parsed
+MAX_PARSE_PAGES = int(os.getenv('RESUME_MAX_PARSE_PAGES', '10'))
+
+# Pages laid out at most when only contact details are streamed
+CONTACT_STREAM_MAX_PAGES = 3
+
+# PDF text extraction profile (see resume_document.EXTRACTION_PROFILES):
+# "accurate" runs pdfminer's full layout analysis, "fast" skips it.
+# Override with RESUME_EXTRACTION_PROFILE and RESUME_BULK_EXTRACTION_PROFILE
+EXTRACTION_PROFILE = os.getenv('RESUME_EXTRACTION_PROFILE', 'accurate')
+# Profile used by bulk imports (batch_analyze)
+BULK_EXTRACTION_PROFILE = os.getenv('RESUME_BULK_EXTRACTION_PROFILE', 'fast')
+
+# Background resume analysis (see analysis_jobs)
+JOBS_DB = os.path.join(DATABASE_DIR, 'analysis_jobs.db')
+# Worker threads started inside the web app; set RESUME_ANALYSIS_WORKERS=0
+# when separate `python analysis_jobs.py` worker processes drain the queue
+ANALYSIS_WORKERS = int(os.getenv('RESUME_ANALYSIS_WORKERS', '2'))
+# Seconds between status polls, in the upload page and in idle workers
+JOB_POLL_SECONDS = 1.0
+# A running job not updated for this long is assumed lost and requeued
+JOB_STALE_SECONDS = 300
+JOB_MAX_ATTEMPTS = 3
+# Finished jobs, with their results and uploaded PDFs, are deleted after
+# this long; idle workers check for them every JOB_PRUNE_INTERVAL_SECONDS
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+JOB_PRUNE_INTERVAL_SECONDS = 3600
+
+# Rows read from SQLite at a time when exporting or importing results
+EXPORT_CHUNK_ROWS = 5000
+# Streamlit holds a download in server memory, so the Export Results page
+# only offers files up to this size; larger exports use user_data_io.py.
+# Override with RESUME_MAX_DOWNLOAD_MB
+EXPORT_MAX_DOWNLOAD_BYTES = int(float(os.getenv('RESUME_MAX_DOWNLOAD_MB', '50')) * 1024 * 1024)
+# Prepared exports older than this are deleted from EXPORT_DIR
+EXPORT_MAX_AGE_SECONDS = 3600
+
+# Seconds the company and application lists are cached between reruns
+LOOKUP_CACHE_TTL_SECONDS = 300
+
+# Admin applications view
+APPLICATION_STATUSES = ['pending', 'accepted', 'rejected']
+APPLICATION_PAGE_SIZES = [10, 25, 50]
 
 # Create .gitkeep file to preserve the database directory
 gitkeep_file = os.path.join(DATABASE_DIR, '.gitkeep')
@@ -1,40 +1,11 @@
 """Course recommendation module for the resume analyzer."""
 
+from skill_taxonomy import get_taxonomy
+
 class CourseRecommender:
     def __init__(self):
-        # Define course categories and their corresponding courses
-        self.courses = {
-            'programming': [
-                ('Python for Everybody - Coursera', 'https://www.coursera.org/specializations/python'),
-                ('Java Programming Masterclass - Udemy', 'https://www.udemy.com/course/java-the-complete-java-developer-course/'),
-                ('The Web Developer Bootcamp - Udemy', 'https://www.udemy.com/course/the-web-developer-bootcamp/'),
-                ('Complete C++ Developer Course - Udemy', 'https://www.udemy.com/course/complete-cpp-developer-course/')
-            ],
-            'web_development': [
-                ('The Complete 2024 Web Development Bootcamp', 'https://www.udemy.com/course/the-complete-web-development-bootcamp/'),
-                ('React - The Complete Guide', 'https://www.udemy.com/course/react-the-complete-guide-incl-redux/'),
-                ('Angular - The Complete Guide', 'https://www.udemy.com/course/the-complete-guide-to-angular-2/'),
-                ('Node.js Developer Course', 'https://www.udemy.com/course/the-complete-nodejs-developer-course-2/')
-            ],
-            'data_science': [
-                ('Data Science Specialization - Coursera', 'https://www.coursera.org/specializations/jhu-data-science'),
-                ('Machine Learning - Stanford Online', 'https://www.coursera.org/learn/machine-learning'),
-                ('Deep Learning Specialization', 'https://www.coursera.org/specializations/deep-learning'),
-                ('TensorFlow Developer Certificate', 'https://www.coursera.org/professional-certificates/tensorflow-in-practice')
-            ],
-            'cloud': [
-                ('AWS Certified Solutions Architect', 'https://www.udemy.com/course/aws-certified-solutions-architect-associate-saa-c03/'),
-                ('Microsoft Azure Fundamentals', 'https://www.udemy.com/course/microsoft-azure-fundamentals-az-900/'),
-                ('Google Cloud Platform Fundamentals', 'https://www.coursera.org/learn/gcp-fundamentals'),
-                ('Docker & Kubernetes: The Complete Guide', 'https://www.udemy.com/course/docker-and-kubernetes-the-complete-guide/')
-            ],
-            'business': [
-                ('Business Foundations Specialization', 'https://www.coursera.org/specializations/wharton-business-foundations'),
-                ('Digital Marketing Specialization', 'https://www.coursera.org/specializations/digital-marketing'),
-                ('Project Management Professional (PMP)', 'https://www.udemy.com/course/pmp-certification-exam-prep-course-pmbok-6th-edition/'),
-                ('Financial Markets - Yale', 'https://www.coursera.org/learn/financial-markets-global')
-            ]
-        }
+        # Course categories and their courses come from the shared taxonomy
+        self.courses = get_taxonomy().category_courses
 
     def get_recommended_courses(self, skills, predicted_field, max_courses=5):
         """Get course recommendations based on skills and predicted field."""
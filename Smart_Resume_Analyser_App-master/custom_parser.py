@@ -1,301 +1,226 @@
 import re
-import nltk
+import nlp_models
 from nltk.corpus import stopwords
-from pdfminer3.layout import LAParams, LTTextBox
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager
-from pdfminer3.pdfinterp import PDFPageInterpreter
-from pdfminer3.converter import TextConverter
-import io
+from constants import CONTACT_STREAM_MAX_PAGES
+from resume_document import ResumeDocument, PageStream
+from resume_sections import ResumeSections
+from skill_taxonomy import get_taxonomy
+
+# Compiled once per process from the shared taxonomy and reused by every
+# parser instance
+SKILL_MATCHER = get_taxonomy().matcher('stack', 'education')
+
+# Compiled pattern bank shared by every parser instance
+
+# Email and phone number are located in one scan; an email address is
+# tried first at each position, so digits inside an address are never
+# taken for a phone number
+CONTACT_PATTERN = re.compile(
+    r'(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|(?P<phone>[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9])'
+)
+
+# One alternation with a named group per degree; match.lastgroup names it
+DEGREE_PATTERN = re.compile(r"""
+    (?P<btech>b\.?tech|bachelor\ of\ technology)
+  | (?P<mtech>m\.?tech|master\ of\ technology)
+  | (?P<be>b\.?e|bachelor\ of\ engineering)
+  | (?P<me>m\.?e|master\ of\ engineering)
+  | (?P<bsc>b\.?sc|bachelor\ of\ science)
+  | (?P<msc>m\.?sc|master\ of\ science)
+  | (?P<ba>b\.?a|bachelor\ of\ arts)
+  | (?P<ma>m\.?a|master\ of\ arts)
+  | (?P<phd>phd|ph\.?d|doctor\ of\ philosophy)
+  | (?P<diploma>diploma\ in\ \w+)
+""", re.IGNORECASE | re.VERBOSE)
+
+_MONTHS = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?'
+           r'|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?:{_MONTHS})\s*\d{{4}}\s*-\s*(?:{_MONTHS}|present)\s*\d{{0,4}}', re.IGNORECASE)
+
+# Name extraction
+NAME_JOB_TITLES = ['data scientist', 'software engineer', 'developer', 'engineer', 'analyst',
+                   'manager', 'consultant', 'programmer', 'architect', 'designer',
+                   'lead', 'senior', 'junior', 'full stack', 'backend', 'frontend']
+NAME_HEADERS = ['name:', 'full name:', 'candidate name:', 'applicant:']
+# Title-case lines at the top of a resume that are never a name
+NAME_HEADINGS = {'curriculum vitae', 'resume', 'personal details', 'personal information',
+                 'contact information', 'professional summary', 'career objective'}
+NAME_PATTERN = re.compile(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2}$')
+NAME_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'\-]+")
+
+
+def _is_job_title(text):
+    text = text.lower()
+    return text in NAME_HEADINGS or any(title in text for title in NAME_JOB_TITLES)
+
+
+def _matches_email(words, email_local, require_all=False):
+    """Whether name words appear in an email local part like "john.smith"."""
+    hits = [len(word) > 1 and word.lower() in email_local for word in words]
+    return all(hits) if require_all else any(hits)
+
 
 class CustomResumeParser:
-    def __init__(self, resume_path):
+    def __init__(self, resume_path, document=None, profile=None):
         self.resume_path = resume_path
-        self.text = ''
-        
-        # Get number of pages
-        self.no_of_pages = 0
-        with open(resume_path, 'rb') as file:
-            for page in PDFPage.get_pages(file):
-                self.no_of_pages += 1
         
-        # Extract text from PDF
-        self.text = self.extract_text_from_pdf()
+        # Parse the PDF once; callers that already hold a ResumeDocument
+        # for this file can pass it in to skip the pdfminer work entirely
+        if document is None:
+            document = ResumeDocument(resume_path, profile=profile)
+        self.document = document
+        self.no_of_pages = document.no_of_pages
+        self.text = document.text
         
         # Basic text processing
         self.text_lines = [line.strip() for line in self.text.split('\n') if line.strip()]
         self.tokens = [word.strip() for word in self.text.split() if word.strip()]
+        self.name_source = None
+        self._contacts = None
+        
+        # Classify every line into its section once; extractors read their own span
+        self.sections = ResumeSections(self.text_lines)
         
     def extract_text_from_pdf(self):
-        with open(self.resume_path, 'rb') as fh:
-            rsrcmgr = PDFResourceManager()
-            sio = io.StringIO()
-            device = TextConverter(rsrcmgr, sio, codec='utf-8', laparams=LAParams())
-            interpreter = PDFPageInterpreter(rsrcmgr, device)
-
-            for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
-                interpreter.process_page(page)
-
-            text = sio.getvalue()
-            device.close()
-            sio.close()
-            return text
+        return self.document.text
             
     def extract_name(self):
-        """Extract name from resume text"""
+        """Extract name from resume text, trying cheap heuristics before NER.
+
+        The tier that produced the answer is kept in ``self.name_source``.
+        """
         try:
-            # First few lines are most likely to contain the name
-            first_lines = '\n'.join(self.text_lines[:10])
-            
-            # List of job titles to exclude
-            job_titles = ['data scientist', 'software engineer', 'developer', 'engineer', 'analyst',
-                         'manager', 'consultant', 'programmer', 'architect', 'designer',
-                         'lead', 'senior', 'junior', 'full stack', 'backend', 'frontend']
-            
-            # Method 1: NLTK's Named Entity Recognition (most reliable)
-            try:
-                tokens = nltk.word_tokenize(first_lines)
-                pos_tags = nltk.pos_tag(tokens)
-                chunks = nltk.ne_chunk(pos_tags)
-                
-                # Extract person names from chunks
-                names = []
-                for chunk in chunks:
-                    if hasattr(chunk, 'label') and chunk.label() == 'PERSON':
-                        name = ' '.join(c[0] for c in chunk.leaves())
-                        # Verify it's not a job title
-                        if len(name.split()) >= 2 and not any(title in name.lower() for title in job_titles):
-                            names.append(name)
-                
-                if names:
-                    # Return the first valid name found
-                    return names[0]
-            except Exception:
-                pass
-            
-            # Method 2: Look for name after common resume headers
-            name_headers = ['name:', 'full name:', 'candidate name:', 'applicant:']
-            for line in self.text_lines[:10]:
-                line_lower = line.lower()
-                for header in name_headers:
-                    if line_lower.startswith(header):
-                        name = line[len(header):].strip()
-                        # Verify it's not a job title
-                        if len(name.split()) >= 2 and not any(title in name.lower() for title in job_titles):
-                            return name
-            
-            # Method 3: Look for properly capitalized name pattern at the start
-            name_pattern = r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2}$'
-            for line in self.text_lines[:5]:
-                line = line.strip()
-                if re.match(name_pattern, line):
-                    # Verify it's not a job title
-                    if not any(title in line.lower() for title in job_titles):
-                        return line
-            
-            # If no name found with above methods, return Unknown
-            return 'Unknown'
-            
+            name, self.name_source = self._extract_name_tiered()
         except Exception as e:
             print(f"Error in name extraction: {str(e)}")
-            return 'Unknown'
+            name, self.name_source = 'Unknown', 'none'
+        return name
+
+    def _extract_name_tiered(self):
+        head = self.text_lines[:10]
+
+        # Tier 1: an explicit "Name:" header
+        for line in head:
+            line_lower = line.lower()
+            for header in NAME_HEADERS:
+                if line_lower.startswith(header):
+                    name = line[len(header):].strip()
+                    if len(name.split()) >= 2 and not _is_job_title(name):
+                        return name, 'header'
+
+        # Tier 2: a properly capitalised line in the contact block. The first
+        # line, or one that matches the email address, is trusted outright
+        email_local = self.extract_email().split('@')[0].lower()
+        candidate = None
+        for position, line in enumerate(self.text_lines[:5]):
+            if NAME_PATTERN.match(line) and not _is_job_title(line):
+                if position == 0 or _matches_email(line.split(), email_local):
+                    return line, 'contact_block'
+                candidate = candidate or line
+
+        # Tier 3: words near the top that spell out the email's local part,
+        # e.g. "JOHN SMITH | Analyst" for john.smith@example.com
+        if email_local:
+            for line in head:
+                words = NAME_WORD_PATTERN.findall(line)
+                for i in range(len(words) - 1):
+                    for size in (3, 2):
+                        run = words[i:i + size]
+                        if len(run) == size and _matches_email(run, email_local, require_all=True):
+                            name = ' '.join(w.title() if w.isupper() else w for w in run)
+                            if not _is_job_title(name):
+                                return name, 'email'
+
+        # Tier 4: NLTK named entity recognition, only when the cheap tiers
+        # found nothing or only a low-confidence candidate
+        try:
+            tokens = nlp_models.word_tokenize('\n'.join(head))
+            chunks = nlp_models.ne_chunk(nlp_models.pos_tag(tokens))
+            for chunk in chunks:
+                if hasattr(chunk, 'label') and chunk.label() == 'PERSON':
+                    name = ' '.join(c[0] for c in chunk.leaves())
+                    if len(name.split()) >= 2 and not _is_job_title(name):
+                        return name, 'ner'
+        except Exception:
+            pass
+
+        if candidate:
+            return candidate, 'contact_block'
+        return 'Unknown', 'none'
         
+    def _scan_contacts(self):
+        """Find the first email address and phone number in one pass."""
+        if self._contacts is None:
+            email = phone = ''
+            for match in CONTACT_PATTERN.finditer(self.text):
+                if match.lastgroup == 'email':
+                    email = email or match.group()
+                else:
+                    phone = phone or match.group()
+                if email and phone:
+                    break
+            self._contacts = (email, phone)
+        return self._contacts
+
     def extract_email(self):
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        matches = re.findall(email_pattern, self.text)
-        return matches[0] if matches else ''
+        return self._scan_contacts()[0]
         
     def extract_mobile_number(self):
-        phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-        matches = re.findall(phone_pattern, self.text)
-        return matches[0] if matches else ''
+        return self._scan_contacts()[1]
     
     def extract_skills(self):
-        skills_pattern = [
-            # Programming Languages
-            'python', 'java', 'c++', 'ruby', 'matlab', 'javascript', 'php', 'typescript',
-            'scala', 'kotlin', 'swift', 'r', 'golang', 'rust', 'perl',
-            
-            # Web Technologies
-            'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django',
-            'flask', 'spring', 'asp.net', 'jquery', 'bootstrap', 'sass', 'less',
-            
-            # Databases
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'cassandra',
-            'elasticsearch', 'dynamodb', 'firebase',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'terraform',
-            'ansible', 'circleci', 'travis', 'nginx', 'apache',
-            
-            # Big Data & ML
-            'hadoop', 'spark', 'kafka', 'airflow', 'machine learning', 'deep learning',
-            'nlp', 'computer vision', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas',
-            'numpy', 'scipy', 'matplotlib', 'seaborn',
-            
-            # Mobile Development
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'ionic',
-            
-            # Other Tools & Technologies
-            'jira', 'confluence', 'slack', 'trello', 'postman', 'swagger',
-            'selenium', 'junit', 'jest', 'mocha', 'cypress'
-        ]
-        
-        found_skills = []
-        text_lower = self.text.lower()
-        
-        # Look for exact matches
-        for skill in skills_pattern:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        # Look for variations with dots (e.g., asp.net)
-        text_no_dots = text_lower.replace('.', '')
-        for skill in skills_pattern:
-            skill_no_dots = skill.replace('.', '')
-            if skill_no_dots in text_no_dots and skill not in found_skills:
-                found_skills.append(skill)
-        
-        # Look for skills in education section (degrees, certifications)
-        education_skills = [
-            'computer science', 'software engineering', 'information technology',
-            'data science', 'artificial intelligence', 'web development',
-            'cloud computing', 'cybersecurity', 'network engineering'
-        ]
-        
-        for skill in education_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-                
-        return list(set(found_skills))
-        
+        """Extract skills with a single word-boundary scan over the text"""
+        return SKILL_MATCHER.find(self.text)
+
     def extract_education(self):
         """
-        Extract education details using multiple approaches
+        Extract education details from the education section, or from
+        lines naming a degree anywhere when the resume has no such heading
         """
-        education = []
-        
-        # Common education keywords
-        education_keywords = [
-            'education', 'qualification', 'academic', 'degree',
-            'bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'b.e', 'm.e',
-            'b.sc', 'm.sc', 'b.a', 'm.a', 'diploma', 'university', 'college',
-            'institute', 'school'
-        ]
-        
-        # Common degree patterns
-        degree_patterns = [
-            r'(?i)b\.?tech|bachelor of technology',
-            r'(?i)m\.?tech|master of technology',
-            r'(?i)b\.?e|bachelor of engineering',
-            r'(?i)m\.?e|master of engineering',
-            r'(?i)b\.?sc|bachelor of science',
-            r'(?i)m\.?sc|master of science',
-            r'(?i)b\.?a|bachelor of arts',
-            r'(?i)m\.?a|master of arts',
-            r'(?i)phd|ph\.?d|doctor of philosophy',
-            r'(?i)diploma in \w+'
-        ]
-        
-        # Find education section
-        education_section = []
-        in_education_section = False
-        
-        for line in self.text_lines:
-            line_lower = line.lower()
-            
-            # Check if we're entering education section
-            if any(keyword in line_lower for keyword in education_keywords):
-                in_education_section = True
-                continue
-            
-            # Check if we're leaving education section
-            if in_education_section and line.strip() and not any(keyword in line_lower for keyword in education_keywords):
-                if any(re.search(pattern, line) for pattern in degree_patterns):
-                    education_section.append(line.strip())
-                elif any(word.isupper() for word in line.split()):  # Likely an institution name
-                    education_section.append(line.strip())
-            
-            # Exit education section if we hit another section
-            if in_education_section and any(keyword in line_lower for keyword in ['experience', 'skills', 'projects']):
-                in_education_section = False
-        
-        # Extract degrees and institutions using patterns
-        for line in self.text_lines:
-            # Look for degree patterns
-            for pattern in degree_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match and line.strip() not in education:
-                    education.append(line.strip())
-        
-        # Add education section contents
-        education.extend([item for item in education_section if item not in education])
-        
-        return list(set(education))
+        if self.sections.has('education'):
+            # Degree lines and institution names (usually in caps)
+            education = [line for line in self.sections.section_lines('education')
+                         if DEGREE_PATTERN.search(line) or any(word.isupper() for word in line.split())]
+        else:
+            education = [line for line in self.text_lines if DEGREE_PATTERN.search(line)]
+        return list(dict.fromkeys(education))
 
     def extract_experience(self):
         """
-        Extract work experience details
+        Extract work experience details from the experience section
         """
         experience = []
         
-        # Experience section keywords
-        exp_keywords = [
-            'experience', 'employment', 'work history', 'professional background',
-            'career history', 'work experience', 'professional experience'
-        ]
-        
-        # Date patterns
-        date_pattern = r'(?i)(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|may|june|july|august|september|october|november|december)\s*\d{4}\s*-\s*(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|may|june|july|august|september|october|november|december|present)\s*\d{0,4}'
-        
-        # Find experience section
-        in_experience_section = False
-        current_experience = []
-        
-        for line in self.text_lines:
-            line_lower = line.lower()
-            
-            # Check if we're entering experience section
-            if any(keyword in line_lower for keyword in exp_keywords):
-                in_experience_section = True
-                if line.strip() and not any(keyword == line_lower for keyword in exp_keywords):
-                    current_experience.append(line.strip())
-                continue
+        for start, end in self.sections.spans.get('experience', []):
+            current_experience = []
+            for line in self.sections.lines[start:end]:
+                # A date range starts a new entry
+                if DATE_RANGE_PATTERN.search(line):
+                    if current_experience:
+                        experience.append(' | '.join(current_experience))
+                        current_experience = []
+                    current_experience.append(line)
+                # Company names (usually in caps)
+                elif any(word.isupper() for word in line.split()):
+                    current_experience.append(line)
+                # Position titles (usually start with a capital)
+                elif line[0].isupper():
+                    current_experience.append(line)
+                # Bullet points
+                elif line.startswith(('•', '-', '*')):
+                    current_experience.append(line)
             
-            # Collect experience details
-            if in_experience_section:
-                if line.strip():
-                    # Check for date patterns
-                    if re.search(date_pattern, line):
-                        if current_experience:
-                            experience.append(' | '.join(current_experience))
-                            current_experience = []
-                        current_experience.append(line.strip())
-                    # Check for company names (usually in caps)
-                    elif any(word.isupper() for word in line.split()):
-                        current_experience.append(line.strip())
-                    # Check for position titles (usually starts with capital)
-                    elif line[0].isupper():
-                        current_experience.append(line.strip())
-                    # Add bullet points
-                    elif line.strip().startswith(('•', '-', '*')):
-                        current_experience.append(line.strip())
-            
-            # Exit experience section if we hit another section
-            if in_experience_section and any(keyword in line_lower for keyword in ['education', 'skills', 'projects', 'achievements']):
-                in_experience_section = False
-                if current_experience:
-                    experience.append(' | '.join(current_experience))
-        
-        # Add any remaining experience
-        if current_experience:
-            experience.append(' | '.join(current_experience))
+            if current_experience:
+                experience.append(' | '.join(current_experience))
         
         return experience
 
     def get_extracted_data(self):
         return {
             'name': self.extract_name(),
+            'name_source': self.name_source,
             'email': self.extract_email(),
             'mobile_number': self.extract_mobile_number(),
             'skills': self.extract_skills(),
@@ -303,3 +228,47 @@ class CustomResumeParser:
             'experience': self.extract_experience(),
             'no_of_pages': self.no_of_pages
         }
+
+
+# Fields stream_contact_details can extract, with their value when not found
+CONTACT_FIELDS = {'name': 'Unknown', 'email': '', 'mobile_number': ''}
+
+
+def _first_contact(group):
+    """Subscriber returning the first email or phone match on any page."""
+    def handler(page_number, page_text):
+        for match in CONTACT_PATTERN.finditer(page_text):
+            if match.lastgroup == group:
+                return match.group()
+        return None
+    return handler
+
+
+def _name_from_first_page(resume_path):
+    """Subscriber that settles the name from page one alone."""
+    def handler(page_number, page_text):
+        parser = CustomResumeParser(resume_path, document=ResumeDocument.from_pages([page_text]))
+        return parser.extract_name()
+    return handler
+
+
+def stream_contact_details(resume_path, fields=tuple(CONTACT_FIELDS),
+                           max_pages=CONTACT_STREAM_MAX_PAGES, profile=None):
+    """Extract contact fields, laying out only as many pages as they need.
+
+    Pages are streamed from pdfminer one at a time and layout stops once
+    every requested field has been found or max_pages pages have been
+    read. Returns (details, pages_read).
+    """
+    stream = PageStream(resume_path, max_pages=max_pages, profile=profile)
+    subscribers = {
+        'name': lambda: _name_from_first_page(resume_path),
+        'email': lambda: _first_contact('email'),
+        'mobile_number': lambda: _first_contact('phone'),
+    }
+    for field in fields:
+        stream.subscribe(field, subscribers[field]())
+
+    found = stream.run()
+    details = {field: found.get(field, CONTACT_FIELDS[field]) for field in fields}
+    return details, stream.pages_read
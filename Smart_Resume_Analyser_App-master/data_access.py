@@ -0,0 +1,138 @@
+"""Shared SQLite access layer.
+
+Every thread borrows one open connection per database file from a
+process-wide pool instead of connecting on each call. Streamlit runs each
+rerun in a new thread, so a thread's connections go back to the pool when
+it exits, prepared statement cache included, instead of being closed.
+Connections run in WAL mode with ``synchronous=NORMAL`` and a busy
+timeout, so concurrent Streamlit sessions can read while another writes
+instead of failing with ``database is locked``. Schema migrations run
+once per database per process.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+BUSY_TIMEOUT_SECONDS = 30
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+# Idle connections by database path, left behind by threads that exited
+_idle = {}
+_pool_lock = threading.Lock()
+_schema_lock = threading.Lock()
+_initialized_schemas = set()
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        # A pooled connection moves between threads, but only one uses it at a time
+        check_same_thread=False
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_SECONDS * 1000}')
+    return conn
+
+
+class _ThreadConnections:
+    """The connections borrowed by one thread, keyed by database path."""
+
+    def __init__(self):
+        self.by_path = {}
+        # Runs when the thread exits and its thread-local data is dropped
+        weakref.finalize(self, _release, self.by_path)
+
+
+def _release(connections):
+    with _pool_lock:
+        for key, conn in connections.items():
+            if conn.in_transaction:
+                conn.rollback()
+            _idle.setdefault(key, []).append(conn)
+
+
+def get_connection(db_path):
+    """Return this thread's pooled connection to db_path, opening it if needed."""
+    key = os.path.abspath(db_path)
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = _ThreadConnections()
+
+    conn = connections.by_path.get(key)
+    if conn is None:
+        with _pool_lock:
+            idle = _idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            conn = _connect(db_path)
+        connections.by_path[key] = conn
+    return conn
+
+
+@contextmanager
+def transaction(db_path, immediate=False):
+    """Yield a pooled connection and commit on success, roll back on error.
+
+    With immediate=True the write lock is taken up front with
+    ``BEGIN IMMEDIATE``, on a dedicated connection that is closed
+    afterwards, so a transaction already open on this thread's pooled
+    connection cannot make the BEGIN fail.
+    """
+    conn = _connect(db_path) if immediate else get_connection(db_path)
+    try:
+        if immediate:
+            conn.execute('BEGIN IMMEDIATE')
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if immediate:
+            conn.close()
+
+
+def migrate(db_path, migrations):
+    """Apply pending versioned migrations to db_path, once per process.
+
+    ``migrations`` is an ordered list of ``(version, steps)`` where each
+    step is a SQL string or a callable taking the connection. The
+    database's ``PRAGMA user_version`` records the last version applied;
+    newer migrations run inside a single ``BEGIN IMMEDIATE`` transaction
+    so concurrent processes cannot apply the same step twice.
+    """
+    key = (os.path.abspath(db_path), 'migrations')
+    if key in _initialized_schemas:
+        return
+    with _schema_lock:
+        if key in _initialized_schemas:
+            return
+        with transaction(db_path, immediate=True) as conn:
+            current = conn.execute('PRAGMA user_version').fetchone()[0]
+            for version, steps in migrations:
+                if version <= current:
+                    continue
+                for step in steps:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+        _initialized_schemas.add(key)
+
+
+def close_connections():
+    """Close every connection held by the current thread."""
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        return
+    for conn in connections.by_path.values():
+        conn.close()
+    connections.by_path.clear()
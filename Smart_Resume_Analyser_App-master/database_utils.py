@@ -1,162 +1,147 @@
 """Database utility functions for the resume analyzer."""
 
-import os
-import sqlite3
 import streamlit as st
-from constants import DB_PATH, DB_FILE
+from constants import DB_FILE, USERS_DB, EXPORT_CHUNK_ROWS
 from hashlib import sha256
+from data_access import get_connection, transaction, migrate
+from application_analytics import invalidate_analytics
+from login import USERS_MIGRATIONS, invalidate_user_lookups
+
+# Versioned schema for the resume database, applied by data_access.migrate
+USER_DATA_MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS user_data (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            Name TEXT,
+            Email TEXT,
+            Resume_Score REAL,
+            Timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            Total_Page INTEGER,
+            Predicted_Field TEXT,
+            User_Level TEXT,
+            Actual_Skills TEXT,
+            Recommended_Skills TEXT,
+            Recommended_Courses TEXT,
+            PDF_Name TEXT
+        )'''
+    ]),
+    # One row per analysed resume: rows carrying the analysis id (the
+    # resume's content hash) are upserted instead of appended
+    (2, [
+        'ALTER TABLE user_data ADD COLUMN Analysis_ID TEXT',
+        'CREATE UNIQUE INDEX idx_user_data_analysis ON user_data (Analysis_ID)'
+    ]),
+    (3, [
+        '''CREATE TABLE IF NOT EXISTS login_data (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            password TEXT,
+            user_type TEXT,
+            Timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )'''
+    ]),
+    # Newest-first listings and date-filtered exports
+    (4, ['CREATE INDEX idx_user_data_timestamp ON user_data (Timestamp)'])
+]
 
 def get_db_path():
-    """Get the database path and ensure the directory exists"""
-    # Get the directory where the script is located
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    db_dir = os.path.join(base_dir, 'database')
-    
-    # Create the database directory if it doesn't exist
-    os.makedirs(db_dir, exist_ok=True)
-    
-    return os.path.join(db_dir, 'users.db')
+    """Get the path of the users database"""
+    return USERS_DB
 
 def init_db():
     """Initialize the database with tables and default admin user"""
     db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-
-    # Create users table if it doesn't exist
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                (username TEXT PRIMARY KEY, 
-                 password TEXT NOT NULL,
-                 user_type TEXT NOT NULL)''')
-
-    # Create applications table if it doesn't exist
-    c.execute('''CREATE TABLE IF NOT EXISTS applications
-                (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                 applicant_username TEXT NOT NULL,
-                 company_username TEXT NOT NULL,
-                 resume_data TEXT NOT NULL,
-                 resume_score TEXT,
-                 application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                 status TEXT DEFAULT 'pending',
-                 FOREIGN KEY (applicant_username) REFERENCES users(username),
-                 FOREIGN KEY (company_username) REFERENCES users(username))''')
-
-    # Check if default admin exists
-    c.execute("SELECT username FROM users WHERE username=? AND user_type=?", ('admin', 'admin'))
-    if not c.fetchone():
-        # Create default admin user if it doesn't exist
-        default_password = 'admin123'  # You can change this default password
-        hashed_password = sha256(default_password.encode()).hexdigest()
-        c.execute("INSERT INTO users (username, password, user_type) VALUES (?, ?, ?)",
-                 ('admin', hashed_password, 'admin'))
-        st.info("Default admin account created. Username: admin, Password: admin123")
+    migrate(db_path, USERS_MIGRATIONS)
 
-    conn.commit()
-    conn.close()
+    with transaction(db_path) as conn:
+        # Check if default admin exists
+        c = conn.execute("SELECT username FROM users WHERE username=? AND user_type=?", ('admin', 'admin'))
+        if not c.fetchone():
+            # Create default admin user if it doesn't exist
+            default_password = 'admin123'  # You can change this default password
+            hashed_password = sha256(default_password.encode()).hexdigest()
+            conn.execute("INSERT INTO users (username, password, user_type) VALUES (?, ?, ?)",
+                         ('admin', hashed_password, 'admin'))
+            st.info("Default admin account created. Username: admin, Password: admin123")
 
 def get_resume_db_path():
-    """Get the appropriate database path based on environment"""
-    try:
-        # For Streamlit Cloud, use the current directory
-        if os.getenv('STREAMLIT_SHARING') or os.getenv('STREAMLIT_CLOUD'):
-            return os.path.join(os.path.dirname(os.path.abspath(__file__)), DB_FILE)
-        # For local development, use the configured path
-        return os.path.join(DB_PATH, DB_FILE)
-    except Exception as e:
-        st.error(f"Error determining database path: {e}")
-        return DB_FILE  # Fallback to just the filename
+    """Get the path of the resume database"""
+    return DB_FILE
 
 def init_resume_db():
     """Initialize the resume database with required tables."""
     try:
         db_path = get_resume_db_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Create user_data table with all necessary columns
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_data (
-                ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                Name TEXT,
-                Email TEXT,
-                Resume_Score REAL,
-                Timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                Total_Page INTEGER,
-                Predicted_Field TEXT,
-                User_Level TEXT,
-                Actual_Skills TEXT,
-                Recommended_Skills TEXT,
-                Recommended_Courses TEXT,
-                PDF_Name TEXT
-            )
-        ''')
-        
-        # Create login_data table for user authentication
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS login_data (
-                ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE,
-                password TEXT,
-                user_type TEXT,
-                Timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
+        migrate(db_path, USER_DATA_MIGRATIONS)
     except Exception as e:
         st.error(f"Error initializing database: {e}")
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
-def insert_user_data(data):
-    """Insert or update user data in the database."""
-    try:
-        db_path = get_resume_db_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # First check if user_data table exists, if not create it
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='user_data'
-        """)
-        if not cursor.fetchone():
-            # Create user_data table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_data (
-                    ID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    Name TEXT,
-                    Email TEXT,
-                    Resume_Score REAL,
-                    Timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    Total_Page INTEGER,
-                    Predicted_Field TEXT,
-                    User_Level TEXT,
-                    Actual_Skills TEXT,
-                    Recommended_Skills TEXT,
-                    Recommended_Courses TEXT,
-                    PDF_Name TEXT
-                )
-            ''')
-            conn.commit()
-        
-        # Ensure recommended skills is a string
-        if 'Recommended_Skills' in data and isinstance(data['Recommended_Skills'], (list, set)):
-            data['Recommended_Skills'] = ', '.join(data['Recommended_Skills'])
-            
-        # Ensure actual skills is a string
-        if 'Actual_Skills' in data and isinstance(data['Actual_Skills'], (list, set)):
-            data['Actual_Skills'] = ', '.join(data['Actual_Skills'])
+def _upsert_analysed_user_data(db_path, data):
+    """Write the single row of an analysed resume, keyed by its analysis id."""
+    with transaction(db_path) as conn:
+        conn.execute('''
+            INSERT INTO user_data (
+                Analysis_ID, Name, Email, Resume_Score, Total_Page,
+                Predicted_Field, User_Level, Actual_Skills,
+                Recommended_Skills, Recommended_Courses, PDF_Name
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (Analysis_ID) DO UPDATE SET
+                Name = excluded.Name,
+                Email = excluded.Email,
+                Resume_Score = excluded.Resume_Score,
+                Total_Page = excluded.Total_Page,
+                Predicted_Field = excluded.Predicted_Field,
+                User_Level = excluded.User_Level,
+                Actual_Skills = excluded.Actual_Skills,
+                Recommended_Skills = excluded.Recommended_Skills,
+                Recommended_Courses = excluded.Recommended_Courses,
+                PDF_Name = excluded.PDF_Name,
+                Timestamp = CURRENT_TIMESTAMP
+        ''', (
+            data['Analysis_ID'],
+            data.get('Name', ''),
+            data.get('Email', ''),
+            data.get('Resume_Score', 0),
+            data.get('Total_Page', 0),
+            data.get('Predicted_Field', ''),
+            data.get('User_Level', ''),
+            data.get('Actual_Skills', ''),
+            data.get('Recommended_Skills', ''),
+            data.get('Recommended_Courses', ''),
+            data.get('PDF_Name', '')
+        ))
+
+def save_user_data(data):
+    """Insert or update user data in the database; errors are raised.
+
+    Rows with an ``Analysis_ID`` are upserted on it, so saving the same
+    analysis again never adds a row; other rows are matched on name and email.
+    Used directly by code that runs outside a Streamlit page.
+    """
+    db_path = get_resume_db_path()
+    migrate(db_path, USER_DATA_MIGRATIONS)
+    
+    # Ensure recommended skills is a string
+    if 'Recommended_Skills' in data and isinstance(data['Recommended_Skills'], (list, set)):
+        data['Recommended_Skills'] = ', '.join(data['Recommended_Skills'])
         
+    # Ensure actual skills is a string
+    if 'Actual_Skills' in data and isinstance(data['Actual_Skills'], (list, set)):
+        data['Actual_Skills'] = ', '.join(data['Actual_Skills'])
+    
+    if data.get('Analysis_ID'):
+        _upsert_analysed_user_data(db_path, data)
+        return
+
+    with transaction(db_path) as conn:
         # Check if user already has a submission
-        cursor.execute('SELECT ID FROM user_data WHERE Email = ? AND Name = ?', 
-                      (data.get('Email', ''), data.get('Name', '')))
+        cursor = conn.execute('SELECT ID FROM user_data WHERE Email = ? AND Name = ?', 
+                              (data.get('Email', ''), data.get('Name', '')))
         existing_entry = cursor.fetchone()
         
         if existing_entry:
             # Update existing entry
-            cursor.execute('''
+            conn.execute('''
                 UPDATE user_data SET 
                     Resume_Score = ?,
                     Total_Page = ?,
@@ -182,7 +167,7 @@ def insert_user_data(data):
             ))
         else:
             # Insert new entry
-            cursor.execute('''
+            conn.execute('''
                 INSERT INTO user_data (
                     Name, Email, Resume_Score, Total_Page,
                     Predicted_Field, User_Level, Actual_Skills,
@@ -200,34 +185,79 @@ def insert_user_data(data):
                 data.get('Recommended_Courses', ''),
                 data.get('PDF_Name', '')
             ))
-        
-        conn.commit()
+
+def insert_user_data(data):
+    """Insert or update user data in the database, reporting errors on the page."""
+    try:
+        save_user_data(data)
         return True
     except Exception as e:
         st.error(f"Error inserting/updating data: {e}")
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
-def get_user_data():
-    """Retrieve all user data from the database."""
+def user_data_filters(min_score=None, max_score=None, date_from=None, date_to=None,
+                      fields=None, levels=None):
+    """Build the WHERE clause and parameters for a filtered user_data query."""
+    clauses, params = [], []
+    if min_score is not None:
+        clauses.append('CAST(Resume_Score AS REAL) >= ?')
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append('CAST(Resume_Score AS REAL) <= ?')
+        params.append(max_score)
+    if date_from is not None:
+        clauses.append('Timestamp >= ?')
+        params.append(str(date_from))
+    if date_to is not None:
+        clauses.append("Timestamp < date(?, '+1 day')")
+        params.append(str(date_to))
+    if fields:
+        clauses.append(f"Predicted_Field IN ({', '.join('?' for _ in fields)})")
+        params.extend(fields)
+    if levels:
+        clauses.append(f"User_Level IN ({', '.join('?' for _ in levels)})")
+        params.extend(levels)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+def _fetch_chunks(cursor, chunk_size):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+def query_user_data(chunk_size=EXPORT_CHUNK_ROWS, **filters):
+    """Return the user_data columns and a generator of row chunks, newest first.
+
+    Rows are fetched chunk_size at a time, so the table is never held in
+    memory whole; filters are the arguments of user_data_filters.
+    """
+    db_path = get_resume_db_path()
+    migrate(db_path, USER_DATA_MIGRATIONS)
+    where, params = user_data_filters(**filters)
+    cursor = get_connection(db_path).execute(
+        f'SELECT * FROM user_data{where} ORDER BY Timestamp DESC', params)
+    columns = [description[0] for description in cursor.description]
+    return columns, _fetch_chunks(cursor, chunk_size)
+
+def get_user_data(**filters):
+    """Retrieve user data from the database as columns and row chunks."""
     try:
-        db_path = get_resume_db_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM user_data ORDER BY Timestamp DESC')
-        columns = [description[0] for description in cursor.description]
-        data = cursor.fetchall()
-        
-        return columns, data
+        return query_user_data(**filters)
     except Exception as e:
         st.error(f"Error retrieving data: {e}")
-        return [], []
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return [], iter(())
+
+def get_user_data_values(column):
+    """Return the distinct non-empty values of a user_data filter column."""
+    if column not in ('Predicted_Field', 'User_Level'):
+        raise ValueError(f"Not a filter column: {column}")
+    db_path = get_resume_db_path()
+    migrate(db_path, USER_DATA_MIGRATIONS)
+    rows = get_connection(db_path).execute(
+        f"SELECT DISTINCT {column} FROM user_data WHERE {column} IS NOT NULL AND {column} != '' "
+        f"ORDER BY {column}")
+    return [value for (value,) in rows]
 
 def delete_user(email):
     """Delete a user from both resume_data.db and users.db databases."""
@@ -236,68 +266,47 @@ def delete_user(email):
     # Delete from resume_data.db
     try:
         db_path = get_resume_db_path()
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # First check if the table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='user_data'
-        """)
-        if cursor.fetchone():
-            cursor.execute('DELETE FROM user_data WHERE Email = ?', (email,))
-            conn.commit()
+        migrate(db_path, USER_DATA_MIGRATIONS)
+        with transaction(db_path) as conn:
+            conn.execute('DELETE FROM user_data WHERE Email = ?', (email,))
     except Exception as e:
         st.error(f"Error deleting from resume database: {e}")
         success = False
-    finally:
-        if 'conn' in locals():
-            conn.close()
     
     # Delete from users.db
     try:
-        # Use direct path for users.db since it's in the root directory
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-
-        # Delete from applications table first (due to foreign key constraint)
-        cursor.execute('DELETE FROM applications WHERE applicant_username = ?', (email,))
-        
-        # Then delete from users table
-        cursor.execute('DELETE FROM users WHERE username = ?', (email,))
-        
-        conn.commit()
+        with transaction(USERS_DB) as conn:
+            # Delete resumes and applications first (due to foreign key constraints)
+            conn.execute('''DELETE FROM application_resumes WHERE application_id IN
+                            (SELECT id FROM applications WHERE applicant_username = ?)''', (email,))
+            conn.execute('DELETE FROM applications WHERE applicant_username = ?', (email,))
+            
+            # Then delete from users table
+            conn.execute('DELETE FROM users WHERE username = ?', (email,))
+        invalidate_analytics(USERS_DB)
+        invalidate_user_lookups()
     except Exception as e:
         st.error(f"Error deleting from users database: {e}")
         success = False
-    finally:
-        if 'conn' in locals():
-            conn.close()
             
     return success
 
 def delete_admin(username):
     """Delete an admin from users.db database."""
     try:
-        # Delete from users.db
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        
-        # Verify it's an admin before deleting
-        cursor.execute('SELECT user_type FROM users WHERE username = ?', (username,))
-        user = cursor.fetchone()
-        
-        if user and user[0] == 'admin':
-            cursor.execute('DELETE FROM users WHERE username = ?', (username,))
-            conn.commit()
-            return True
-        else:
-            st.error("User not found or not an admin.")
-            return False
+        with transaction(USERS_DB) as conn:
+            # Verify it's an admin before deleting
+            cursor = conn.execute('SELECT user_type FROM users WHERE username = ?', (username,))
+            user = cursor.fetchone()
+            
+            if user and user[0] == 'admin':
+                conn.execute('DELETE FROM users WHERE username = ?', (username,))
+            else:
+                st.error("User not found or not an admin.")
+                return False
+        invalidate_user_lookups(applications=False)
+        return True
             
     except Exception as e:
         st.error(f"Error deleting admin: {e}")
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
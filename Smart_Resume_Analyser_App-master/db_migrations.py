@@ -0,0 +1,130 @@
+"""Schema migrations for every database in the data directory.
+
+All databases live in DATABASE_DIR (override with RESUME_DATA_DIR). Each
+has one ordered list of versioned migrations, applied by
+data_access.migrate and recorded in the file's ``PRAGMA user_version``.
+The app and the command line tools call run_migrations once at process
+start; the modules owning a database still call migrate before first
+use, which returns immediately once the runner has been through.
+
+Usage:
+    python db_migrations.py            # apply pending migrations
+    python db_migrations.py --status   # print each database's schema version
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from data_access import get_connection, migrate
+from constants import (
+    BASE_DIR, DATABASE_DIR, USERS_DB, DB_FILE, AUTH_DB, ANALYSIS_DB, JOBS_DB, PARSE_CACHE_DB
+)
+
+# Where older versions kept each database, relative to the working
+# directory or the app, and the table and columns that identify it
+LEGACY_DATABASES = [
+    (USERS_DB, 'users.db', 'users', ('username', 'password', 'user_type')),
+    (DB_FILE, 'resume_data.db', 'user_data', ('Name', 'Email', 'Resume_Score')),
+    (AUTH_DB, os.path.join('db', 'users.db'), 'users', ('email', 'password', 'user_type')),
+]
+
+
+def database_migrations():
+    """Return [(db_path, migrations)] for every database the app uses."""
+    # Imported here: these modules call back into the runner from their CLIs
+    from analysis_jobs import JOBS_MIGRATIONS
+    from database_utils import USER_DATA_MIGRATIONS
+    from login import USERS_MIGRATIONS
+    from modules.auth.auth_manager import AUTH_MIGRATIONS
+    from parse_cache import PARSE_CACHE_MIGRATIONS
+    from resume_analysis import ANALYSIS_MIGRATIONS
+    return [
+        (USERS_DB, USERS_MIGRATIONS),
+        (DB_FILE, USER_DATA_MIGRATIONS),
+        (AUTH_DB, AUTH_MIGRATIONS),
+        (ANALYSIS_DB, ANALYSIS_MIGRATIONS),
+        (JOBS_DB, JOBS_MIGRATIONS),
+        (PARSE_CACHE_DB, PARSE_CACHE_MIGRATIONS),
+    ]
+
+
+def _legacy_paths(name):
+    paths = [os.path.abspath(os.path.join(base, name)) for base in (os.getcwd(), BASE_DIR)]
+    return list(dict.fromkeys(paths))
+
+
+def _inspect(db_path, table, columns):
+    """Return (has rows, has the identifying table and columns) for a database file."""
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = [name for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        has_rows = any(conn.execute(f'SELECT 1 FROM "{name}" LIMIT 1').fetchone() for name in tables)
+        found = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        return has_rows, set(columns) <= found
+    finally:
+        conn.close()
+
+
+def adopt_legacy_databases():
+    """Copy databases found at legacy paths into the data directory.
+
+    A legacy file is copied only if it holds rows of the expected table
+    and its database in the data directory is missing or has no rows; an
+    empty database of another shape is renamed to ``*.unused`` first.
+    Nothing is merged, and legacy files are left in place.
+    """
+    os.makedirs(DATABASE_DIR, exist_ok=True)
+    for db_path, name, table, columns in LEGACY_DATABASES:
+        for legacy_path in _legacy_paths(name):
+            if legacy_path == os.path.abspath(db_path) or not os.path.isfile(legacy_path):
+                continue
+            try:
+                has_rows, matches = _inspect(legacy_path, table, columns)
+                if not (has_rows and matches):
+                    continue
+                if os.path.exists(db_path):
+                    target_has_rows, target_matches = _inspect(db_path, table, columns)
+                    if target_has_rows:
+                        print(f"Ignoring legacy database {legacy_path}: {db_path} already has data")
+                        continue
+                    if not target_matches:
+                        os.replace(db_path, db_path + '.unused')
+                source = sqlite3.connect(legacy_path)
+                target = sqlite3.connect(db_path)
+                try:
+                    source.backup(target)
+                finally:
+                    source.close()
+                    target.close()
+                print(f"Copied legacy database {legacy_path} to {db_path}")
+            except (sqlite3.Error, OSError) as e:
+                print(f"Could not copy legacy database {legacy_path}: {str(e)}")
+
+
+def run_migrations():
+    """Bring every database in the data directory to its latest schema."""
+    adopt_legacy_databases()
+    for db_path, migrations in database_migrations():
+        migrate(db_path, migrations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply the database migrations.')
+    parser.add_argument('--status', action='store_true',
+                        help='Print the schema version of each database instead')
+    args = parser.parse_args(argv)
+
+    if not args.status:
+        run_migrations()
+    for db_path, migrations in database_migrations():
+        version = None
+        if os.path.exists(db_path):
+            version = get_connection(db_path).execute('PRAGMA user_version').fetchone()[0]
+        print(f"{db_path}: version {version if version is not None else '-'} of {migrations[-1][0]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
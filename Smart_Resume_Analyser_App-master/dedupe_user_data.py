@@ -0,0 +1,96 @@
+"""Remove duplicate rows from the user_data table.
+
+Until rows were keyed by analysis id, the results page appended a copy of
+the same analysis on every rerun. Rows are duplicates when they share an
+Analysis_ID or, for rows without one, every column except ID and
+Timestamp; the most recently inserted row of each group is kept.
+
+Usage:
+    python dedupe_user_data.py --dry-run
+    python dedupe_user_data.py --db resume_data.db
+"""
+
+import argparse
+import json
+import sys
+from hashlib import sha256
+from data_access import get_connection, transaction
+
+# Columns that differ between copies of the same row
+_ROW_ID_COLUMNS = {'ID', 'Timestamp', 'Analysis_ID'}
+
+
+def content_columns(columns):
+    """Return the columns that make up a row's content."""
+    return [column for column in columns if column not in _ROW_ID_COLUMNS]
+
+
+def _normalize(value):
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def content_key(values):
+    """Return the key under which rows with these content values are duplicates.
+
+    Empty strings equal NULL and numbers equal their text form, so a row
+    read back from a CSV export matches the row it was exported from.
+    """
+    return sha256(json.dumps([_normalize(value) for value in values]).encode()).digest()
+
+
+def find_duplicates(conn):
+    """Return (rows, rowids to delete) for the user_data table in conn."""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(user_data)')]
+    if not columns:
+        return 0, []
+    content = content_columns(columns)
+    analysis_id = 'Analysis_ID' if 'Analysis_ID' in columns else 'NULL'
+    query = 'SELECT rowid, {}, {} FROM user_data ORDER BY rowid'.format(
+        analysis_id, ', '.join(f'"{column}"' for column in content))
+
+    latest = {}
+    rows = 0
+    for rowid, key, *values in conn.execute(query):
+        rows += 1
+        group = ('analysis', key) if key else ('content', content_key(values))
+        latest[group] = rowid
+    kept = set(latest.values())
+    return rows, [rowid for (rowid,) in conn.execute('SELECT rowid FROM user_data')
+                  if rowid not in kept]
+
+
+def dedupe_user_data(db_path, dry_run=False):
+    """Delete duplicate user_data rows; return (rows before, rows deleted)."""
+    rows, duplicates = find_duplicates(get_connection(db_path))
+    if duplicates and not dry_run:
+        with transaction(db_path) as conn:
+            conn.executemany('DELETE FROM user_data WHERE rowid = ?',
+                             [(rowid,) for rowid in duplicates])
+    return rows, len(duplicates)
+
+
+def main(argv=None):
+    from database_utils import get_resume_db_path
+
+    parser = argparse.ArgumentParser(description='Remove duplicate rows from the user_data table.')
+    parser.add_argument('--db', action='append',
+                        help='Resume database to clean; repeat for several '
+                             '(default: the configured resume database)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only report how many rows would be deleted')
+    args = parser.parse_args(argv)
+
+    for db_path in args.db or [get_resume_db_path()]:
+        rows, deleted = dedupe_user_data(db_path, args.dry_run)
+        action = 'would delete' if args.dry_run else 'deleted'
+        print(f"{db_path}: {rows} rows, {action} {deleted} duplicates")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
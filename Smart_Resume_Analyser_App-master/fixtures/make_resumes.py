@@ -0,0 +1,128 @@
+"""Generate the synthetic resume fixtures used by the benchmarks.
+
+Usage:
+    python fixtures/make_resumes.py
+
+Writes fixtures/resumes/*.pdf and fixtures/resumes/expected.jsonl: six
+single-column one-page resumes, four two-column ones (an education and
+skills sidebar next to the main text) and one four-page resume. Every
+name, company and address is made up, so the files can be shared freely.
+The output is deterministic and committed; reportlab is only needed to
+regenerate it.
+
+expected.jsonl holds what each resume says, written the way
+CustomResumeParser reports it: skills by their taxonomy name, education
+entries as whole lines, and experience entries as the date line and its
+bullets joined by " | ", once per page they appear on.
+"""
+
+import json
+import os
+import random
+import sys
+import textwrap
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resumes')
+
+FIRST_NAMES = ['John', 'Priya', 'Wei', 'Maria', 'Ahmed', 'Laura', 'Kenji', 'Sara', 'Diego', 'Anna']
+LAST_NAMES = ['Smith', 'Sharma', 'Chen', 'Garcia', 'Khan', 'Miller', 'Tanaka', 'Jones', 'Lopez', 'Novak']
+SKILLS = ['Python', 'Java', 'React', 'SQL', 'Docker', 'AWS', 'Django', 'Machine Learning',
+          'Kubernetes', 'Flask', 'TensorFlow', 'Figma', 'Node.js', 'Pandas']
+# Taxonomy names of the skills above where they differ; None if the
+# taxonomy does not know the skill
+SKILL_NAMES = {'Node.js': 'node', 'Figma': None}
+EDUCATION = 'B.Tech in Computer Science, STATE UNIVERSITY'
+HEADING_SIZE = 13
+
+
+def resume_lines(index, rng, pages=1):
+    """Return (expected fields, [(text, font size)]) of one made-up resume."""
+    first, last = FIRST_NAMES[index % 10], LAST_NAMES[index * 3 % 10]
+    email = f"{first.lower()}.{last.lower()}@example.com"
+    phone = f"+1 555-{100 + index:03d}-{1000 + index * 7}"
+    lines = [(f"{first} {last}", 18), (f"{email} | {phone}", 10), ('', 10),
+             ('Summary', HEADING_SIZE),
+             ('Engineer with experience building data and web platforms.', 10), ('', 10),
+             ('Experience', HEADING_SIZE)]
+    experience = []
+    for job in range(rng.randint(2, 4)):
+        entry = [f"Jan {2010 + job * 3} - Dec {2012 + job * 3} Engineer at COMPANY{job}",
+                 f"- Built services handling {rng.randint(1, 9)}M requests per day.",
+                 '- Improved latency and reliability across the platform.']
+        lines += [(text, 10) for text in entry]
+        experience.append(' | '.join(entry))
+    skills = rng.sample(SKILLS, 6)
+    lines += [('', 10), ('Education', HEADING_SIZE), (EDUCATION, 10), ('', 10),
+              ('Skills', HEADING_SIZE), (', '.join(skills), 10)]
+    names = [SKILL_NAMES.get(skill, skill.lower()) for skill in skills]
+    return {
+        'name': f"{first} {last}",
+        'email': email,
+        'mobile_number': phone,
+        'skills': [name for name in names if name],
+        'education': [EDUCATION],
+        'experience': experience * pages,
+    }, lines
+
+
+def _draw(pdf, x, y, text, size, width=None):
+    pdf.setFont('Helvetica-Bold' if size > 10 else 'Helvetica', size)
+    pdf.drawString(x, y, text if width is None else text[:width])
+
+
+def write_single_column(path, lines, pages=1):
+    pdf = canvas.Canvas(path, pagesize=letter, invariant=1)
+    for _ in range(pages):
+        y = 750
+        for text, size in lines:
+            _draw(pdf, 72, y, text, size)
+            y -= size + 6
+        pdf.showPage()
+    pdf.save()
+
+
+def write_two_column(path, lines):
+    pdf = canvas.Canvas(path, pagesize=letter, invariant=1)
+    _draw(pdf, 72, 750, lines[0][0], lines[0][1])
+    _draw(pdf, 72, 728, lines[1][0], lines[1][1])
+    # Education and skills go in a narrow left sidebar, the rest on the right
+    top = y = 698
+    for text, size in lines[-4:]:
+        for part in textwrap.wrap(text, 28) or ['']:
+            _draw(pdf, 40, y, part, size)
+            y -= size + 6
+    y = top
+    for text, size in lines[2:-4]:
+        _draw(pdf, 230, y, text, size, width=60)
+        y -= size + 6
+    pdf.showPage()
+    pdf.save()
+
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    rng = random.Random(3)
+    layouts = [('single', 1)] * 6 + [('twocol', 1)] * 4 + [('multi', 4)]
+    expected = []
+    for index, (layout, pages) in enumerate(layouts):
+        fields, lines = resume_lines(index, rng, pages)
+        name = f"{layout}{index}.pdf"
+        path = os.path.join(OUTPUT_DIR, name)
+        if layout == 'twocol':
+            write_two_column(path, lines)
+        else:
+            write_single_column(path, lines, pages)
+        expected.append({'file': name, **fields, 'no_of_pages': pages})
+
+    with open(os.path.join(OUTPUT_DIR, 'expected.jsonl'), 'w', encoding='utf-8') as f:
+        for row in expected:
+            f.write(json.dumps(row) + '\n')
+    print(f"Wrote {len(expected)} resumes to {OUTPUT_DIR}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
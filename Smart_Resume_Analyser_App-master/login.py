@@ -1,11 +1,186 @@
 import streamlit as st
 import sqlite3
+import ast
+import json
+from functools import lru_cache
 from hashlib import sha256
 import streamlit.components.v1 as components
+from data_access import get_connection, transaction, migrate
+from application_analytics import get_analytics, invalidate_analytics
+from company_stats import STATS_SCHEMA, rebuild_company_stats, get_company_stats
+from constants import LOOKUP_CACHE_TTL_SECONDS, USERS_DB
+
+def encode_resume_data(resume_data):
+    """Serialise a resume dict for storage in application_resumes."""
+    return json.dumps(resume_data, default=str)
+
+
+def decode_resume_data(raw):
+    """Decode a stored resume payload; never executes the stored text."""
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return {}
+
+
+def _convert_legacy_resume_payloads(conn):
+    """Rewrite resume payloads stored with str(dict) as JSON."""
+    rows = conn.execute('SELECT application_id, resume_data FROM application_resumes').fetchall()
+    for application_id, raw in rows:
+        try:
+            json.loads(raw)
+            continue
+        except ValueError:
+            pass
+        try:
+            payload = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            print(f"Could not convert resume data for application {application_id}")
+            continue
+        conn.execute('UPDATE application_resumes SET resume_data = ? WHERE application_id = ?',
+                     (encode_resume_data(payload), application_id))
+
+
+# Versioned schema for users.db, applied by data_access.migrate
+USERS_MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS users
+           (username TEXT PRIMARY KEY, 
+            password TEXT NOT NULL,
+            user_type TEXT NOT NULL)''',
+        '''CREATE TABLE IF NOT EXISTS applications
+           (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            applicant_username TEXT NOT NULL,
+            company_username TEXT NOT NULL,
+            resume_data TEXT NOT NULL,
+            resume_score TEXT,
+            application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (applicant_username) REFERENCES users(username),
+            FOREIGN KEY (company_username) REFERENCES users(username))'''
+    ]),
+    # Move the bulky resume payload out of applications so list views never
+    # read it, and add covering indexes for the dashboard queries
+    (2, [
+        '''CREATE TABLE application_resumes
+           (application_id INTEGER PRIMARY KEY,
+            resume_data TEXT NOT NULL,
+            FOREIGN KEY (application_id) REFERENCES applications(id))''',
+        '''INSERT INTO application_resumes (application_id, resume_data)
+           SELECT id, resume_data FROM applications''',
+        '''CREATE TABLE applications_v2
+           (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            applicant_username TEXT NOT NULL,
+            company_username TEXT NOT NULL,
+            resume_score TEXT,
+            application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (applicant_username) REFERENCES users(username),
+            FOREIGN KEY (company_username) REFERENCES users(username))''',
+        '''INSERT INTO applications_v2
+           (id, applicant_username, company_username, resume_score, application_date, status)
+           SELECT id, applicant_username, company_username, resume_score, application_date, status
+           FROM applications''',
+        'DROP TABLE applications',
+        'ALTER TABLE applications_v2 RENAME TO applications',
+        '''CREATE INDEX idx_applications_company_date
+           ON applications (company_username, application_date DESC,
+                            applicant_username, resume_score, status)''',
+        '''CREATE INDEX idx_applications_applicant_date
+           ON applications (applicant_username, application_date DESC,
+                            company_username, status)''',
+        "CREATE INDEX idx_users_type ON users (user_type, username)"
+    ]),
+    # Resume payloads are JSON from here on
+    (3, [_convert_legacy_resume_payloads]),
+    # Per-company statistics maintained by triggers, seeded from existing rows
+    (4, STATS_SCHEMA + [rebuild_company_stats])
+]
+
+def _application_filters(company_username, status=None, min_score=None, max_score=None,
+                         date_from=None, date_to=None):
+    """Build the WHERE clause and parameters for a company's application list."""
+    clauses = ['company_username = ?']
+    params = [company_username]
+    if status:
+        clauses.append(f"status IN ({', '.join('?' for _ in status)})")
+        params.extend(status)
+    if min_score is not None:
+        clauses.append('CAST(resume_score AS REAL) >= ?')
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append('CAST(resume_score AS REAL) <= ?')
+        params.append(max_score)
+    # Dates compare as text against the stored 'YYYY-MM-DD HH:MM:SS' timestamps,
+    # which keeps the range on idx_applications_company_date
+    if date_from is not None:
+        clauses.append('application_date >= ?')
+        params.append(str(date_from))
+    if date_to is not None:
+        clauses.append("application_date < date(?, '+1 day')")
+        params.append(str(date_to))
+    return ' AND '.join(clauses), params
+
+
+@lru_cache(maxsize=2048)
+def _load_application_resume(application_id):
+    # Payloads never change after submission, so each one is read and
+    # decoded once per process rather than on every rerun
+    row = get_connection(USERS_DB).execute("""
+        SELECT resume_data FROM application_resumes WHERE application_id = ?
+    """, (application_id,)).fetchone()
+    return decode_resume_data(row[0]) if row else None
+
+
+# Company and application lists are read on every rerun; they are cached
+# for LOOKUP_CACHE_TTL_SECONDS and dropped by invalidate_user_lookups as
+# soon as this process changes them
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
+def _admin_users():
+    c = get_connection(USERS_DB).execute("SELECT username FROM users WHERE user_type='admin'")
+    return [row[0] for row in c.fetchall()]
+
+
+@st.cache_data(ttl=LOOKUP_CACHE_TTL_SECONDS, show_spinner=False)
+def _user_applications(username, user_type):
+    conn = get_connection(USERS_DB)
+    if user_type == 'normal':
+        # Get applications submitted by the user
+        c = conn.execute("""
+            SELECT company_username, application_date, status
+            FROM applications
+            WHERE applicant_username = ?
+            ORDER BY application_date DESC
+        """, (username,))
+    else:
+        # Get applications received by the company; resume payloads are
+        # fetched separately with get_application_resume
+        c = conn.execute("""
+            SELECT id, applicant_username, resume_score, application_date, status
+            FROM applications
+            WHERE company_username = ?
+            ORDER BY application_date DESC
+        """, (username,))
+    return c.fetchall()
+
+
+def invalidate_user_lookups(admins=True, applications=True):
+    """Drop the cached company list and/or application lists after a change."""
+    if admins:
+        _admin_users.clear()
+    if applications:
+        _user_applications.clear()
+
 
 class LoginUI:
     def __init__(self):
         self.init_db()
+        self.init_session_state()
+
+    def init_session_state(self):
+        """Set the login keys of the current session to their defaults if missing."""
         if 'authenticated' not in st.session_state:
             st.session_state.authenticated = False
         if 'user_type' not in st.session_state:
@@ -14,57 +189,34 @@ class LoginUI:
             st.session_state.username = None
 
     def init_db(self):
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS users
-                    (username TEXT PRIMARY KEY, 
-                     password TEXT NOT NULL,
-                     user_type TEXT NOT NULL)''')
-                     
-        # Create applications table
-        c.execute('''CREATE TABLE IF NOT EXISTS applications
-                    (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                     applicant_username TEXT NOT NULL,
-                     company_username TEXT NOT NULL,
-                     resume_data TEXT NOT NULL,
-                     resume_score TEXT,
-                     application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                     status TEXT DEFAULT 'pending',
-                     FOREIGN KEY (applicant_username) REFERENCES users(username),
-                     FOREIGN KEY (company_username) REFERENCES users(username))''')
-        conn.commit()
-        conn.close()
+        # Runs pending migrations once per process; later reruns return immediately
+        migrate(USERS_DB, USERS_MIGRATIONS)
 
     def add_user(self, username, password, user_type):
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
         try:
-            # Check if user exists
-            c.execute("SELECT username FROM users WHERE username=?", (username,))
-            if c.fetchone():
-                return False
-                
-            # Add new user
-            hashed_pw = sha256(password.encode()).hexdigest()
-            c.execute("INSERT INTO users VALUES (?, ?, ?)", 
-                     (username, hashed_pw, user_type))
-            conn.commit()
+            with transaction(USERS_DB) as conn:
+                # Check if user exists
+                c = conn.execute("SELECT username FROM users WHERE username=?", (username,))
+                if c.fetchone():
+                    return False
+                    
+                # Add new user
+                hashed_pw = sha256(password.encode()).hexdigest()
+                conn.execute("INSERT INTO users VALUES (?, ?, ?)", 
+                             (username, hashed_pw, user_type))
+            invalidate_user_lookups(admins=user_type == 'admin', applications=False)
             return True
         except sqlite3.IntegrityError:
             return False
         except Exception as e:
             st.error(f"Database error: {str(e)}")
             return False
-        finally:
-            conn.close()
 
     def verify_user(self, username, password, user_type):
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
         try:
             # Get user data
-            c.execute("SELECT password, user_type FROM users WHERE username=?", 
-                     (username,))
+            c = get_connection(USERS_DB).execute(
+                "SELECT password, user_type FROM users WHERE username=?", (username,))
             result = c.fetchone()
             
             if not result:
@@ -84,8 +236,6 @@ class LoginUI:
         except Exception as e:
             st.error(f"Database error: {str(e)}")
             return False
-        finally:
-            conn.close()
 
     def render_login_ui(self):
         st.markdown("""
@@ -277,70 +427,81 @@ class LoginUI:
 
     def get_admin_users(self):
         """Get list of all admin users (companies)"""
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute("SELECT username FROM users WHERE user_type='admin'")
-        admins = [row[0] for row in c.fetchall()]
-        conn.close()
-        return admins
+        return _admin_users()
 
     def submit_application(self, applicant_username, company_username, resume_data, resume_score):
         """Submit a job application to a company"""
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
         try:
-            c.execute("""
-                INSERT INTO applications 
-                (applicant_username, company_username, resume_data, resume_score)
-                VALUES (?, ?, ?, ?)
-            """, (applicant_username, company_username, resume_data, resume_score))
-            conn.commit()
+            with transaction(USERS_DB) as conn:
+                c = conn.execute("""
+                    INSERT INTO applications 
+                    (applicant_username, company_username, resume_score)
+                    VALUES (?, ?, ?)
+                """, (applicant_username, company_username, resume_score))
+                conn.execute("""
+                    INSERT INTO application_resumes (application_id, resume_data)
+                    VALUES (?, ?)
+                """, (c.lastrowid, encode_resume_data(resume_data)))
+            invalidate_analytics(USERS_DB, company_username)
+            invalidate_user_lookups(admins=False)
             return True
         except Exception as e:
             st.error(f"Error submitting application: {str(e)}")
             return False
-        finally:
-            conn.close()
 
     def get_user_applications(self, username, user_type):
         """Get applications based on user type"""
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        try:
-            if user_type == 'normal':
-                # Get applications submitted by the user
-                c.execute("""
-                    SELECT company_username, application_date, status
-                    FROM applications
-                    WHERE applicant_username = ?
-                    ORDER BY application_date DESC
-                """, (username,))
-            else:
-                # Get applications received by the company
-                c.execute("""
-                    SELECT applicant_username, resume_data, resume_score, application_date, status
-                    FROM applications
-                    WHERE company_username = ?
-                    ORDER BY application_date DESC
-                """, (username,))
-            return c.fetchall()
-        finally:
-            conn.close()
+        return _user_applications(username, user_type)
+
+    def count_company_applications(self, company_username, **filters):
+        """Count the applications received by a company that match the filters"""
+        where, params = _application_filters(company_username, **filters)
+        c = get_connection(USERS_DB).execute(
+            f"SELECT COUNT(*) FROM applications WHERE {where}", params)
+        return c.fetchone()[0]
+
+    def get_company_applications(self, company_username, limit=10,
+                                 offset=0, **filters):
+        """Get one page of the applications received by a company.
+
+        Filters (status, min_score, max_score, date_from, date_to) are applied
+        in SQL, so only the rows on the requested page are read.
+        """
+        where, params = _application_filters(company_username, **filters)
+        c = get_connection(USERS_DB).execute(f"""
+            SELECT id, applicant_username, resume_score, application_date, status
+            FROM applications
+            WHERE {where}
+            ORDER BY application_date DESC, id DESC
+            LIMIT ? OFFSET ?
+        """, params + [limit, offset])
+        return c.fetchall()
+
+    def get_application_summary(self, company_username):
+        """Get (total, average score, pending count) for a company's applications"""
+        stats = get_company_stats(USERS_DB, company_username)
+        return stats['total'], stats['mean'], stats['by_status'].get('pending', 0)
+
+    def get_application_analytics(self, company_username):
+        """Get aggregated analytics for a company's applications, cached until they change"""
+        return get_analytics(USERS_DB, company_username)
+
+    def get_application_resume(self, application_id):
+        """Get the decoded resume data for one application"""
+        return _load_application_resume(application_id)
 
     def update_application_status(self, applicant_username, company_username, new_status):
         """Update the status of a job application"""
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
         try:
-            c.execute("""
-                UPDATE applications 
-                SET status = ?
-                WHERE applicant_username = ? AND company_username = ?
-            """, (new_status, applicant_username, company_username))
-            conn.commit()
+            with transaction(USERS_DB) as conn:
+                conn.execute("""
+                    UPDATE applications 
+                    SET status = ?
+                    WHERE applicant_username = ? AND company_username = ?
+                """, (new_status, applicant_username, company_username))
+            invalidate_analytics(USERS_DB, company_username)
+            invalidate_user_lookups(admins=False)
             return True
         except Exception as e:
             st.error(f"Error updating application status: {str(e)}")
             return False
-        finally:
-            conn.close()
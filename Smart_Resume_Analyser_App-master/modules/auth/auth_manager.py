@@ -1,30 +1,28 @@
 import sqlite3
 import hashlib
-import os
+from data_access import get_connection, transaction, migrate
+from constants import AUTH_DB
+
+# Versioned schema for the accounts database, applied by data_access.migrate
+AUTH_MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS users
+           (id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            user_type TEXT NOT NULL)'''
+    ])
+]
 
 class AuthManager:
     def __init__(self):
-        self.db_path = 'db/users.db'
+        self.db_path = AUTH_DB
         self._ensure_db()
 
     def _ensure_db(self):
         """Ensure database and tables exist"""
-        if not os.path.exists('db'):
-            os.makedirs('db')
-            
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Create users table
-        c.execute('''CREATE TABLE IF NOT EXISTS users
-                    (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                     username TEXT NOT NULL,
-                     email TEXT UNIQUE NOT NULL,
-                     password TEXT NOT NULL,
-                     user_type TEXT NOT NULL)''')
-        
-        conn.commit()
-        conn.close()
+        migrate(self.db_path, AUTH_MIGRATIONS)
 
     def _hash_password(self, password):
         """Hash password using SHA-256"""
@@ -33,38 +31,30 @@ class AuthManager:
     def register_user(self, username, email, password, user_type):
         """Register a new user"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
-            # Check if email exists
-            c.execute("SELECT id FROM users WHERE email = ?", (email,))
-            if c.fetchone():
-                return False, "Email already registered"
+            with transaction(self.db_path) as conn:
+                # Check if email exists
+                c = conn.execute("SELECT id FROM users WHERE email = ?", (email,))
+                if c.fetchone():
+                    return False, "Email already registered"
+                
+                # Hash password and store user
+                hashed_password = self._hash_password(password)
+                conn.execute("""INSERT INTO users 
+                            (username, email, password, user_type)
+                            VALUES (?, ?, ?, ?)""",
+                             (username, email, hashed_password, user_type))
             
-            # Hash password and store user
-            hashed_password = self._hash_password(password)
-            c.execute("""INSERT INTO users 
-                        (username, email, password, user_type)
-                        VALUES (?, ?, ?, ?)""",
-                     (username, email, hashed_password, user_type))
-            
-            conn.commit()
             return True, "Registration successful"
             
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False, f"Registration failed: {str(e)}"
-        finally:
-            conn.close()
 
     def login_user(self, email, password):
         """Login a user"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
             # Get user by email
-            c.execute("""SELECT id, username, password, user_type 
+            c = get_connection(self.db_path).execute("""SELECT id, username, password, user_type 
                         FROM users WHERE email = ?""", (email,))
             user = c.fetchone()
             
@@ -87,5 +77,3 @@ class AuthManager:
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False, f"Login failed: {str(e)}"
-        finally:
-            conn.close()
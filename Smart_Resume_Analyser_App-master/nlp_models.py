@@ -0,0 +1,135 @@
+"""Process-wide registry of the NLTK models used for name extraction.
+
+``nltk.pos_tag`` and ``nltk.ne_chunk`` unpickle their models lazily, and
+on some NLTK versions the tagger is rebuilt on every call. The registry
+loads each model once per process, shares it between every parser
+instance and records how long it took, so the first upload after a
+deploy does not pay for the loading and failures are visible instead of
+silently swallowed.
+"""
+
+import threading
+import time
+import nltk
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.tokenize.destructive import NLTKWordTokenizer
+
+
+def _load_sentence_tokenizer():
+    try:
+        from nltk.tokenize import PunktTokenizer  # NLTK >= 3.9
+    except ImportError:
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+    return PunktTokenizer('english')
+
+
+def _load_ne_chunker():
+    try:
+        from nltk.chunk import ne_chunker  # NLTK >= 3.9
+    except ImportError:
+        chunker = nltk.data.load('chunkers/maxent_ne_chunker/english_ace_multiclass.pickle')
+    else:
+        chunker = ne_chunker()
+    # The chunker's feature extractor loads the words corpus on first use
+    chunker.parse([('Ada', 'NNP'), ('Lovelace', 'NNP')])
+    return chunker
+
+
+class ModelRegistry:
+    """Load named models on first use, once per process, from any thread.
+
+    A model that fails to load is not retried on every call; its error is
+    kept in ``status()`` until ``reset`` is called.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._errors = {}
+        self._load_seconds = {}
+        self._lock = threading.Lock()
+        self._preload_thread = None
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+
+    def get(self, name):
+        """Return the loaded model, or raise LookupError if it is unavailable."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            if name not in self._models and name not in self._errors:
+                start = time.perf_counter()
+                try:
+                    self._models[name] = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    print(f"Could not load NLTK model '{name}': {str(e)}")
+                self._load_seconds[name] = time.perf_counter() - start
+        if name in self._errors:
+            raise LookupError(f"NLTK model '{name}' is unavailable: {self._errors[name]}")
+        return self._models[name]
+
+    def is_ready(self, name=None):
+        """Whether one model, or every registered model, is loaded."""
+        names = [name] if name else list(self._loaders)
+        return all(n in self._models for n in names)
+
+    def preload(self, background=False):
+        """Load every registered model now, optionally in a daemon thread."""
+        if background:
+            with self._lock:
+                if self._preload_thread is None:
+                    self._preload_thread = threading.Thread(
+                        target=self.preload, name='nltk-preload', daemon=True)
+                    self._preload_thread.start()
+            return
+        for name in self._loaders:
+            try:
+                self.get(name)
+            except LookupError:
+                pass
+
+    def status(self):
+        """Return {name: {'ready', 'load_seconds', 'error'}} for every model."""
+        return {name: {'ready': name in self._models,
+                       'load_seconds': self._load_seconds.get(name),
+                       'error': self._errors.get(name)}
+                for name in self._loaders}
+
+    def reset(self, name=None):
+        """Forget a loaded or failed model (or all of them) so it loads again."""
+        with self._lock:
+            for n in ([name] if name else list(self._loaders)):
+                self._models.pop(n, None)
+                self._errors.pop(n, None)
+                self._load_seconds.pop(n, None)
+
+
+MODELS = ModelRegistry()
+MODELS.register('sentence_tokenizer', _load_sentence_tokenizer)
+MODELS.register('word_tokenizer', NLTKWordTokenizer)
+MODELS.register('pos_tagger', PerceptronTagger)
+MODELS.register('ne_chunker', _load_ne_chunker)
+
+
+def word_tokenize(text):
+    """Same tokens as nltk.word_tokenize, using the shared models."""
+    word_tokenizer = MODELS.get('word_tokenizer')
+    return [token
+            for sentence in MODELS.get('sentence_tokenizer').tokenize(text)
+            for token in word_tokenizer.tokenize(sentence)]
+
+
+def pos_tag(tokens):
+    return MODELS.get('pos_tagger').tag(tokens)
+
+
+def ne_chunk(tagged_tokens):
+    return MODELS.get('ne_chunker').parse(tagged_tokens)
+
+
+def preload_models(background=False):
+    """Warm every model so the first resume does not pay for loading."""
+    MODELS.preload(background=background)
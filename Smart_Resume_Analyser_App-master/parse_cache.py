@@ -0,0 +1,81 @@
+"""Persistent, content-addressed cache of parsed resumes."""
+
+import json
+import sqlite3
+import time
+from hashlib import sha256
+from constants import PARSE_CACHE_DB, PARSE_CACHE_MAX_ENTRIES, PARSER_VERSION
+from data_access import transaction, migrate
+
+# Versioned schema for the cache database, applied by data_access.migrate
+PARSE_CACHE_MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS parse_cache
+           (pdf_hash TEXT PRIMARY KEY,
+            parser_version INTEGER NOT NULL,
+            resume_data TEXT NOT NULL,
+            resume_text TEXT NOT NULL,
+            last_used REAL NOT NULL)''',
+        'CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache(last_used)'
+    ])
+]
+
+
+def hash_pdf_bytes(data, profile=None):
+    """Return the cache key for a PDF: the SHA-256 hex digest of its bytes.
+
+    Text from a profile other than "accurate" is cached under its own key.
+    """
+    digest = sha256(data).hexdigest()
+    if profile and profile != 'accurate':
+        return f'{digest}:{profile}'
+    return digest
+
+
+class ParseCache:
+    """LRU cache of CustomResumeParser output keyed by the PDF's SHA-256.
+
+    Entries live in SQLite so they survive restarts and are shared by every
+    process. Failures are reported and treated as a miss; the cache must
+    never stop a resume from being analysed.
+    """
+
+    def __init__(self, db_path=PARSE_CACHE_DB, max_entries=PARSE_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.init_db()
+
+    def init_db(self):
+        migrate(self.db_path, PARSE_CACHE_MIGRATIONS)
+
+    def get(self, pdf_hash):
+        """Return (resume_data, resume_text) for a hash, or None on a miss."""
+        try:
+            with transaction(self.db_path) as conn:
+                row = conn.execute('''SELECT resume_data, resume_text FROM parse_cache
+                                      WHERE pdf_hash = ? AND parser_version = ?''',
+                                   (pdf_hash, PARSER_VERSION)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE parse_cache SET last_used = ? WHERE pdf_hash = ?',
+                             (time.time(), pdf_hash))
+            return json.loads(row[0]), row[1]
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Parse cache read failed: {str(e)}")
+            return None
+
+    def put(self, pdf_hash, resume_data, resume_text):
+        """Store parser output for a hash and evict least recently used entries."""
+        try:
+            with transaction(self.db_path) as conn:
+                conn.execute('''INSERT OR REPLACE INTO parse_cache
+                                (pdf_hash, parser_version, resume_data, resume_text, last_used)
+                                VALUES (?, ?, ?, ?, ?)''',
+                             (pdf_hash, PARSER_VERSION, json.dumps(resume_data),
+                              resume_text, time.time()))
+                conn.execute('''DELETE FROM parse_cache WHERE pdf_hash NOT IN
+                                (SELECT pdf_hash FROM parse_cache
+                                 ORDER BY last_used DESC LIMIT ?)''',
+                             (self.max_entries,))
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Parse cache write failed: {str(e)}")
@@ -0,0 +1,131 @@
+"""Cheap checks run on an uploaded PDF before any layout analysis.
+
+Only the cross-reference table, trailer and page tree are read: enough
+to learn the byte size, page count, encryption status and whether the
+first pages draw any text (a text layer). Oversized or unreadable
+documents are rejected with a reason the user can act on, and long ones
+are down-scoped to their first pages.
+"""
+
+import re
+from io import BytesIO
+from pdfminer3.pdfparser import PDFParser, PDFSyntaxError
+from pdfminer3.pdfdocument import PDFDocument, PDFPasswordIncorrect, PDFEncryptionError
+from pdfminer3.pdfpage import PDFPage
+from pdfminer3.pdftypes import resolve1
+from pdfminer3.psparser import PSException, LIT
+from constants import MAX_UPLOAD_BYTES, MAX_PDF_PAGES, MAX_PARSE_PAGES
+
+# Pages inspected when deciding whether there is a text layer
+TEXT_LAYER_SAMPLE_PAGES = 3
+
+LITERAL_FORM = LIT('Form')
+# A string operand followed by a text-showing operator (Tj, TJ, ' or ").
+# Fonts or empty BT/ET blocks alone are not enough: some generators add
+# them to image-only pages
+TEXT_OPERATOR = re.compile(rb"""[)\]>]\s*(?:Tj|TJ|'|")""")
+
+
+class PreflightResult:
+    """Outcome of preflight_pdf.
+
+    ``reason`` is None when the document may be parsed; ``parse_pages``
+    is the number of leading pages to lay out (None for all of them) and
+    ``notes`` lists anything worth telling the user even on success.
+    """
+
+    def __init__(self, size_bytes):
+        self.size_bytes = size_bytes
+        self.page_count = None
+        self.encrypted = False
+        self.has_text_layer = None
+        self.parse_pages = None
+        self.reason = None
+        self.notes = []
+
+    @property
+    def ok(self):
+        return self.reason is None
+
+    def reject(self, reason):
+        self.reason = reason
+        return self
+
+
+def _draws_text(streams):
+    for stream in streams:
+        stream = resolve1(stream)
+        if hasattr(stream, 'get_data') and TEXT_OPERATOR.search(stream.get_data()):
+            return True
+    return False
+
+
+def _has_text(resources, streams, depth=2):
+    """Whether content streams, or a form XObject they use, draw text with a font."""
+    resources = resolve1(resources) or {}
+    if resolve1(resources.get('Font')) and _draws_text(streams):
+        return True
+    if depth == 0:
+        return False
+    for xobject in (resolve1(resources.get('XObject')) or {}).values():
+        xobject = resolve1(xobject)
+        attrs = getattr(xobject, 'attrs', {})
+        if resolve1(attrs.get('Subtype')) is LITERAL_FORM and \
+                _has_text(attrs.get('Resources'), [xobject], depth - 1):
+            return True
+    return False
+
+
+def _open_document(data):
+    """Open the xref and trailer; fall back to a full scan only for broken files."""
+    try:
+        return PDFDocument(PDFParser(BytesIO(data)), fallback=False)
+    except PDFSyntaxError:
+        return PDFDocument(PDFParser(BytesIO(data)), fallback=True)
+
+
+def preflight_pdf(data, max_bytes=MAX_UPLOAD_BYTES, max_pages=MAX_PDF_PAGES,
+                  max_parse_pages=MAX_PARSE_PAGES):
+    """Inspect PDF bytes without laying out any page and return a PreflightResult."""
+    result = PreflightResult(len(data))
+    if max_bytes and result.size_bytes > max_bytes:
+        return result.reject(f"the file is {result.size_bytes / 1048576:.1f} MB; "
+                             f"the limit is {max_bytes / 1048576:.0f} MB")
+
+    try:
+        document = _open_document(data)
+    except PDFPasswordIncorrect:
+        return result.reject("the PDF is password protected")
+    except (PSException, PDFEncryptionError, ValueError, KeyError, TypeError) as e:
+        return result.reject(f"the file could not be read as a PDF ({str(e) or type(e).__name__})")
+
+    result.encrypted = document.encryption is not None
+    if not document.is_extractable:
+        return result.reject("the PDF's permissions do not allow text extraction")
+
+    pages = resolve1(document.catalog.get('Pages')) or {}
+    result.page_count = resolve1(pages.get('Count')) if isinstance(pages, dict) else None
+    if not isinstance(result.page_count, int):
+        result.page_count = sum(1 for _ in PDFPage.create_pages(document))
+    if result.page_count == 0:
+        return result.reject("the PDF has no pages")
+    if max_pages and result.page_count > max_pages:
+        return result.reject(f"the PDF has {result.page_count} pages; "
+                             f"at most {max_pages} are accepted")
+
+    result.has_text_layer = False
+    for number, page in enumerate(PDFPage.create_pages(document), 1):
+        if _has_text(page.resources, page.contents):
+            result.has_text_layer = True
+            break
+        if number >= TEXT_LAYER_SAMPLE_PAGES:
+            break
+    if not result.has_text_layer:
+        return result.reject("the PDF has no text layer (it looks like a scanned image); "
+                             "please upload a text-based PDF")
+
+    if max_parse_pages and result.page_count > max_parse_pages:
+        result.parse_pages = max_parse_pages
+        result.notes.append(f"Only the first {max_parse_pages} of {result.page_count} pages "
+                            f"were analysed.")
+    return result
@@ -0,0 +1,335 @@
+"""Immutable, versioned analysis of a parsed resume.
+
+Everything on the results page that depends only on the resume (scores,
+career field, recommended skills and courses, strengths and areas for
+improvement) is computed once by build_analysis. The result is stored on
+disk keyed by the resume's content hash and ANALYSIS_VERSION, and the
+page renders it on every rerun instead of scoring again.
+"""
+
+import json
+import sqlite3
+import time
+from hashlib import sha256
+from types import MappingProxyType
+from data_access import get_connection, migrate, transaction
+from skill_taxonomy import get_taxonomy
+from constants import ANALYSIS_DB, ANALYSIS_VERSION
+
+# Parser output that does not describe the resume itself
+_VOLATILE_FIELDS = {'original_resume_path'}
+
+IN_DEMAND_SKILLS = ['python', 'java', 'javascript', 'react', 'sql', 'machine learning', 'aws', 'docker']
+ACHIEVEMENT_KEYWORDS = ['achieved', 'improved', 'increased', 'reduced', 'led', 'managed', 'developed']
+HIGHER_EDUCATION_KEYWORDS = ['master', 'phd', 'bachelor', 'degree']
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def resume_hash(resume_data):
+    """Return the SHA-256 of a parsed resume's content."""
+    content = {key: value for key, value in resume_data.items() if key not in _VOLATILE_FIELDS}
+    return sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+class ResumeAnalysis:
+    """The analysis of one resume; attributes cannot be changed once built.
+
+    Fields are read as attributes (``analysis.total_score``); lists come
+    back as tuples and dicts as read-only mappings.
+    """
+
+    def __init__(self, resume_hash, fields, version=ANALYSIS_VERSION):
+        object.__setattr__(self, 'resume_hash', resume_hash)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_fields', _freeze(fields))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ResumeAnalysis is immutable')
+
+    def to_dict(self):
+        return {'resume_hash': self.resume_hash, 'version': self.version,
+                'fields': _thaw(self._fields)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['resume_hash'], data['fields'], data['version'])
+
+
+def _strengths(resume_data, total_score):
+    strengths = []
+
+    # Technical Skills Analysis
+    skills = resume_data['skills']
+    if len(skills) >= 5:
+        skill_strength = "🛠️ Strong technical skill set with {} different skills".format(len(skills))
+        if len(skills) >= 8:
+            skill_strength += " - Impressive variety! 🌟"
+        strengths.append(skill_strength)
+
+        # Check for in-demand skills
+        matched_demands = [skill for skill in skills if any(demand in skill.lower() for demand in IN_DEMAND_SKILLS)]
+        if matched_demands:
+            strengths.append("🚀 Possesses in-demand skills: " + ", ".join(matched_demands[:3]))
+
+    # Experience Analysis
+    experience = resume_data['experience']
+    if experience:
+        exp_years = len(experience)
+        if exp_years >= 2:
+            strengths.append(f"💼 Strong work history with {exp_years} different roles")
+
+        detailed_exp = [exp for exp in experience if len(exp.split()) > 10]
+        if detailed_exp:
+            strengths.append("📝 Detailed work experience descriptions")
+
+        achievements = [exp for exp in experience if any(keyword in exp.lower() for keyword in ACHIEVEMENT_KEYWORDS)]
+        if achievements:
+            strengths.append("🏆 Contains quantifiable achievements and leadership examples")
+
+    # Education Analysis
+    education = resume_data['education']
+    if education:
+        edu_str = "🎓 Strong educational background with {} qualification(s)".format(len(education))
+        if any(keyword in str(education).lower() for keyword in HIGHER_EDUCATION_KEYWORDS):
+            edu_str += " including higher education ✨"
+        strengths.append(edu_str)
+
+    # Overall Score Analysis
+    if total_score >= 80:
+        strengths.append(f"⭐ Exceptional overall resume score: {total_score}%")
+    elif total_score >= 60:
+        strengths.append(f"📈 Above average resume score: {total_score}%")
+    return strengths
+
+
+def _improvements(resume_data, total_score):
+    improvements = []
+    skills = resume_data['skills']
+    experience = resume_data['experience']
+    education = resume_data['education']
+
+    # Skills Improvements
+    if len(skills) < 5:
+        improvements.append({
+            'icon': '⚡',
+            'area': 'Technical Skills',
+            'issue': f"Currently only {len(skills)} skills listed",
+            'suggestion': "Add more relevant technical skills, especially those mentioned in job descriptions in your field"
+        })
+    else:
+        improvements.append({
+            'icon': '🔍',
+            'area': 'Skills Organization',
+            'issue': 'Skills could be better organized',
+            'suggestion': "Consider grouping your skills into categories (e.g., Programming Languages, Tools, Soft Skills)"
+        })
+
+    # Experience Improvements
+    if not experience:
+        improvements.append({
+            'icon': '💼',
+            'area': 'Work Experience',
+            'issue': 'Limited work experience section',
+            'suggestion': "Add internships, projects, or volunteer work if you're new to the field"
+        })
+    else:
+        if not any(len(exp.split()) > 15 for exp in experience):
+            improvements.append({
+                'icon': '📝',
+                'area': 'Experience Descriptions',
+                'issue': 'Brief experience descriptions',
+                'suggestion': "Expand your role descriptions with specific responsibilities and achievements"
+            })
+
+        if not any(keyword in str(experience).lower() for keyword in ['achieved', 'improved', 'increased', 'reduced']):
+            improvements.append({
+                'icon': '📊',
+                'area': 'Achievements',
+                'issue': 'Limited quantifiable achievements',
+                'suggestion': "Add specific metrics and numbers to showcase your impact (e.g., 'Improved efficiency by 25%')"
+            })
+
+    # Education Improvements
+    if not education:
+        improvements.append({
+            'icon': '🎓',
+            'area': 'Education',
+            'issue': 'Education section needs enhancement',
+            'suggestion': "Add your educational background, including relevant coursework and certifications"
+        })
+
+    # Score-based Improvements
+    if total_score < 60:
+        improvements.append({
+            'icon': '📈',
+            'area': 'Overall Resume',
+            'issue': f"Current resume score: {total_score}%",
+            'suggestion': "Focus on adding more detailed experience descriptions and relevant skills to improve your score"
+        })
+    return improvements
+
+
+def build_analysis(resume_data, scorer):
+    """Score a parsed resume and derive everything the results page shows."""
+    score_details = scorer.score_resume(resume_data)
+    total_score = round(
+        score_details['experience_score'] * 0.35 +
+        score_details['skills_score'] * 0.30 +
+        score_details['education_score'] * 0.20 +
+        score_details['completeness_score'] * 0.15
+    )
+
+    # The first skill that points to a career field decides it
+    taxonomy = get_taxonomy()
+    reco_field = ''
+    for skill in resume_data['skills']:
+        reco_field = taxonomy.field_for_skill(skill) or ''
+        if reco_field:
+            break
+
+    # Candidate level from the number of pages
+    if resume_data['no_of_pages'] == 1:
+        cand_level = "Beginner"
+    elif resume_data['no_of_pages'] == 2:
+        cand_level = "Intermediate"
+    else:
+        cand_level = "Expert"
+
+    return ResumeAnalysis(resume_hash(resume_data), {
+        'score_details': score_details,
+        'total_score': total_score,
+        'reco_field': reco_field,
+        'job_label': taxonomy.fields[reco_field]['job_label'] if reco_field else '',
+        'recommended_skills': taxonomy.field_recommended_skills(reco_field) if reco_field else [],
+        'rec_course': taxonomy.field_courses(reco_field) if reco_field else [],
+        'cand_level': cand_level,
+        'strengths': _strengths(resume_data, total_score),
+        'improvements': _improvements(resume_data, total_score),
+    })
+
+
+def _predicted_field(skills):
+    tech_skills = ['python', 'java', 'javascript', 'react', 'sql', 'machine learning', 'aws', 'docker']
+    data_skills = ['python', 'r', 'sql', 'machine learning', 'deep learning']
+    if any(skill in tech_skills for skill in skills):
+        return 'Software Development'
+    if any(skill in data_skills for skill in skills):
+        return 'Data Science'
+    return 'Unknown'
+
+
+def _experience_level(experience):
+    if len(experience) > 2:
+        return 'Senior Level'
+    if experience:
+        return 'Mid Level'
+    return 'Entry Level'
+
+
+def user_data_row(resume_data, analysis, pdf_name):
+    """Return the user_data row stored for an analysed resume.
+
+    The upload worker and the batch tool both save rows built here, so
+    re-analysing a resume from either one updates the same columns.
+    """
+    skills = resume_data.get('skills', [])
+
+    # Recommend related skills the candidate does not have yet
+    taxonomy = get_taxonomy()
+    recommended_skills = set()
+    for skill in skills:
+        recommended_skills.update(taxonomy.related_skills_for(skill))
+    # Sorted so that saving the same analysis again writes the same row
+    recommended_skills = sorted(recommended_skills - set(skill.lower() for skill in skills))
+
+    return {
+        'Analysis_ID': analysis.resume_hash,
+        'Name': resume_data.get('name', 'Unknown'),
+        'Email': resume_data.get('email', 'unknown@email.com'),
+        'Resume_Score': analysis.total_score,
+        'Total_Page': resume_data.get('no_of_pages', 0),
+        'Predicted_Field': _predicted_field(skills),
+        'User_Level': _experience_level(resume_data.get('experience', [])),
+        'Actual_Skills': ', '.join(skills),
+        'Recommended_Skills': ', '.join(recommended_skills[:5]),  # Top 5 recommendations
+        'Recommended_Courses': ', '.join(analysis.score_details.get('recommended_courses', [])),
+        'PDF_Name': pdf_name
+    }
+
+
+# Versioned schema for the analysis store, applied by data_access.migrate
+ANALYSIS_MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS resume_analyses
+           (resume_hash TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            analysis TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (resume_hash, version))'''
+    ])
+]
+
+
+def init_analysis_db(db_path=ANALYSIS_DB):
+    migrate(db_path, ANALYSIS_MIGRATIONS)
+
+
+def load_analysis(resume_hash, db_path=ANALYSIS_DB):
+    """Return the stored analysis for the current version, or None.
+
+    Read failures are reported and treated as a miss.
+    """
+    try:
+        init_analysis_db(db_path)
+        row = get_connection(db_path).execute(
+            'SELECT analysis FROM resume_analyses WHERE resume_hash = ? AND version = ?',
+            (resume_hash, ANALYSIS_VERSION)).fetchone()
+        return ResumeAnalysis.from_dict(json.loads(row[0])) if row else None
+    except (sqlite3.Error, ValueError, KeyError) as e:
+        print(f"Analysis store read failed: {str(e)}")
+        return None
+
+
+def save_analysis(analysis, db_path=ANALYSIS_DB):
+    """Store an analysis; an existing one for the same key is kept as is."""
+    try:
+        init_analysis_db(db_path)
+        with transaction(db_path) as conn:
+            conn.execute('''INSERT OR IGNORE INTO resume_analyses
+                            (resume_hash, version, analysis, created_at) VALUES (?, ?, ?, ?)''',
+                         (analysis.resume_hash, analysis.version,
+                          json.dumps(analysis.to_dict()), time.time()))
+    except (sqlite3.Error, TypeError) as e:
+        print(f"Analysis store write failed: {str(e)}")
+
+
+def get_or_build_analysis(resume_data, scorer, db_path=ANALYSIS_DB):
+    """Return the stored analysis of a resume, building and storing it on a miss."""
+    analysis = load_analysis(resume_hash(resume_data), db_path)
+    if analysis is None:
+        analysis = build_analysis(resume_data, scorer)
+        save_analysis(analysis, db_path)
+    return analysis
@@ -0,0 +1,206 @@
+"""Single-pass PDF ingestion shared by the app and the resume parser."""
+
+from pdfminer3.layout import LAParams, LTChar, LTContainer, LTText, LTTextBox
+from pdfminer3.pdfpage import PDFPage
+from pdfminer3.pdfinterp import PDFResourceManager
+from pdfminer3.pdfinterp import PDFPageInterpreter
+from pdfminer3.converter import PDFPageAggregator
+from constants import EXTRACTION_PROFILE
+
+# Named text extraction profiles, mapped to pdfminer layout parameters.
+# "accurate" runs the full layout analysis (grouping characters into
+# lines, lines into boxes and ordering the boxes). "fast" skips it and
+# rebuilds lines straight from the glyphs in content stream order, which
+# is what the line- and keyword-based extractors need and takes about a
+# quarter less time per page (`python benchmark_profiles.py` on the
+# fixtures in fixtures/resumes)
+EXTRACTION_PROFILES = {
+    'accurate': {},
+    'fast': None,
+}
+
+# Glyph-stream line rebuilding used by the fast profile: a new line starts
+# when the baseline moves by more than this fraction of the glyph height
+# or the text runs backwards; a gap wider than WORD_GAP of a glyph's size
+# is a space
+LINE_SHIFT = 0.5
+WORD_GAP = 0.1
+
+
+def get_laparams(profile=None):
+    """Return the LAParams for an extraction profile, or None for no layout analysis."""
+    profile = profile or EXTRACTION_PROFILE
+    if profile not in EXTRACTION_PROFILES:
+        raise ValueError(f"Unknown extraction profile {profile!r}; "
+                         f"expected one of {', '.join(EXTRACTION_PROFILES)}")
+    params = EXTRACTION_PROFILES[profile]
+    return None if params is None else LAParams(**params)
+
+
+def render_page_text(ltpage):
+    """Render a laid-out page to text exactly like pdfminer's TextConverter."""
+    parts = []
+
+    def render(item):
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            parts.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            parts.append('\n')
+
+    render(ltpage)
+    parts.append('\f')
+    return ''.join(parts)
+
+
+def _iter_chars(item):
+    for child in item:
+        if isinstance(child, LTChar):
+            yield child
+        elif isinstance(child, LTContainer):
+            yield from _iter_chars(child)
+
+
+def render_glyph_text(ltpage):
+    """Render a page that had no layout analysis, one line per baseline."""
+    parts = []
+    previous = None
+    for char in _iter_chars(ltpage):
+        text = char.get_text()
+        if previous is not None:
+            size = max(char.height, previous.height)
+            if abs(char.y0 - previous.y0) > LINE_SHIFT * size or char.x1 < previous.x0:
+                parts.append('\n')
+            elif (char.x0 - previous.x1 > WORD_GAP * max(char.width, char.height)
+                    and text != ' ' and previous.get_text() != ' '):
+                parts.append(' ')
+        parts.append(text)
+        previous = char
+    parts.append('\n\f')
+    return ''.join(parts)
+
+
+def iter_pages(fh, profile=None):
+    """Yield (ltpage, page_text) for each page of an open PDF as it is laid out.
+
+    Pages are processed lazily, so a caller that stops iterating early
+    never pays for the layout of the remaining pages. ``profile`` names an
+    entry of EXTRACTION_PROFILES and defaults to the configured one.
+    """
+    laparams = get_laparams(profile)
+    render = render_glyph_text if laparams is None else render_page_text
+    rsrcmgr = PDFResourceManager()
+    device = PDFPageAggregator(rsrcmgr, laparams=laparams)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    try:
+        for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
+            interpreter.process_page(page)
+            ltpage = device.get_result()
+            yield ltpage, render(ltpage)
+    finally:
+        device.close()
+
+
+def count_pages(fh):
+    """Count the pages of an open PDF without laying any of them out."""
+    fh.seek(0)
+    return sum(1 for _ in PDFPage.get_pages(fh, caching=True, check_extractable=False))
+
+
+class ResumeDocument:
+    """A PDF resume opened and laid out exactly once.
+
+    Page count, full text and per-page text are all produced by the same
+    pass over the document, so callers that need more than one of them
+    never parse the file again. With ``max_pages`` only the first pages
+    are laid out; ``no_of_pages`` still reports the whole document and
+    ``truncated`` says whether any text was skipped. The pdfminer layout
+    objects are kept only when ``keep_layouts`` is set, and ``profile``
+    selects the text extraction profile. ``on_page`` is called with the
+    number of pages laid out so far after each page, for progress reporting.
+    """
+
+    def __init__(self, resume_path, max_pages=None, keep_layouts=False, profile=None,
+                 on_page=None):
+        self.resume_path = resume_path
+        self.max_pages = max_pages
+        self.keep_layouts = keep_layouts
+        self.profile = profile
+        self.on_page = on_page
+        self.layouts = []
+        self.page_texts = []
+        self.truncated = False
+        self.no_of_pages = 0
+        if resume_path is not None:
+            self._load()
+        self.text = ''.join(self.page_texts)
+
+    @classmethod
+    def from_pages(cls, page_texts, no_of_pages=None):
+        """Build a document from already extracted page texts."""
+        document = cls(None)
+        document.page_texts = list(page_texts)
+        document.no_of_pages = no_of_pages or len(document.page_texts)
+        document.truncated = document.no_of_pages > len(document.page_texts)
+        document.text = ''.join(document.page_texts)
+        return document
+
+    def _load(self):
+        with open(self.resume_path, 'rb') as fh:
+            for ltpage, page_text in iter_pages(fh, self.profile):
+                if self.keep_layouts:
+                    self.layouts.append(ltpage)
+                self.page_texts.append(page_text)
+                if self.on_page:
+                    self.on_page(len(self.page_texts))
+                if self.max_pages and len(self.page_texts) >= self.max_pages:
+                    break
+
+            self.no_of_pages = len(self.page_texts)
+            if self.max_pages and self.no_of_pages >= self.max_pages:
+                self.no_of_pages = count_pages(fh)
+                self.truncated = self.no_of_pages > len(self.page_texts)
+
+
+class PageStream:
+    """Lay out a PDF page by page and hand each page to subscribers.
+
+    A subscriber is a callable ``handler(page_number, page_text)`` that
+    returns None until it has found what it needs. Layout stops as soon
+    as every subscriber has an answer or ``max_pages`` pages have been
+    read, so long documents cost no more than the pages actually used.
+    """
+
+    def __init__(self, resume_path, max_pages=None, profile=None):
+        self.resume_path = resume_path
+        self.max_pages = max_pages
+        self.profile = profile
+        self.subscribers = {}
+        self.page_texts = []
+
+    def subscribe(self, name, handler):
+        self.subscribers[name] = handler
+
+    @property
+    def pages_read(self):
+        return len(self.page_texts)
+
+    def run(self):
+        """Stream pages to the subscribers and return {name: answer}."""
+        results = {}
+        pending = dict(self.subscribers)
+        if not pending:
+            return results
+        with open(self.resume_path, 'rb') as fh:
+            for page_number, (_, page_text) in enumerate(iter_pages(fh, self.profile), 1):
+                self.page_texts.append(page_text)
+                for name, handler in list(pending.items()):
+                    answer = handler(page_number, page_text)
+                    if answer is not None:
+                        results[name] = answer
+                        del pending[name]
+                if not pending or (self.max_pages and page_number >= self.max_pages):
+                    break
+        return results
@@ -1,27 +1,75 @@
+import re
+import numpy as np
+import pandas as pd
+from skill_taxonomy import get_taxonomy
+
+# Keyword tables shared by the per-resume and batch scoring paths
+LEADERSHIP_TERMS = ['lead', 'senior', 'manager', 'supervisor', 'head', 'chief', 'director']
+
+DEGREE_WEIGHTS = {
+    'phd': 100,
+    'doctorate': 100,
+    'master': 90,
+    'mba': 90,
+    'bachelor': 80,
+    'btech': 80,
+    'bsc': 80,
+    'associate': 70,
+    'diploma': 60,
+    'certification': 50
+}
+
+PRESTIGIOUS_TERMS = [
+    'distinction', 'honors', 'first class',
+    'magna cum laude', 'summa cum laude',
+    'high distinction', 'merit', 'dean\'s list'
+]
+
+GRADE_TERMS = ['gpa', 'cgpa', '%', 'percent']
+
+COMPLETENESS_SECTIONS = {
+    'name': 10,
+    'email': 10,
+    'mobile_number': 10,
+    'skills': 20,
+    'experience': 25,
+    'education': 25
+}
+
+SCORE_WEIGHTS = {
+    'experience_score': 0.35,
+    'skills_score': 0.30,
+    'education_score': 0.20,
+    'completeness_score': 0.15
+}
+
 class ResumeScorer:
     def __init__(self):
-        # Define skill categories
-        self.technical_skills = {
-            'programming': ['python', 'java', 'javascript', 'c++', 'ruby', 'php', 'swift', 'kotlin', 'golang'],
-            'web': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring'],
-            'database': ['sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'elasticsearch'],
-            'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'jenkins'],
-            'ai_ml': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'nlp']
-        }
+        # Skill categories come from the shared taxonomy
+        taxonomy = get_taxonomy()
+        self.technical_skills = taxonomy.categories_in_group('technical')
+        self.soft_skills = taxonomy.skills_in_groups('soft')
+        self.domain_skills = taxonomy.categories_in_group('domain')
         
-        self.soft_skills = [
-            'communication', 'leadership', 'teamwork', 'problem solving', 'critical thinking',
-            'time management', 'adaptability', 'creativity', 'project management', 'analytical',
-            'collaboration', 'presentation', 'negotiation', 'organization', 'decision making'
+        # Spelling variants are fixed per taxonomy, so build them once
+        self._soft_variations = [
+            (skill, {skill, skill.replace(' ', ''), skill.replace('-', ''), skill.replace(' ', '-')})
+            for skill in self.soft_skills
         ]
         
-        self.domain_skills = {
-            'finance': ['financial analysis', 'trading', 'investment', 'risk management', 'portfolio management'],
-            'marketing': ['digital marketing', 'seo', 'social media', 'content marketing', 'brand management'],
-            'healthcare': ['clinical', 'patient care', 'medical records', 'healthcare management'],
-            'consulting': ['business strategy', 'management consulting', 'process improvement'],
-            'sales': ['sales management', 'business development', 'account management', 'crm']
-        }
+        # Batch scoring encodes each (category, skill) pair as a column;
+        # variant_columns maps every accepted spelling to its columns
+        self._columns = []
+        self._variant_columns = {}
+        for group, category_dict in (('technical', self.technical_skills),
+                                     ('domain', self.domain_skills)):
+            for category, category_skills in category_dict.items():
+                for skill in category_skills:
+                    column = len(self._columns)
+                    self._columns.append(group)
+                    for variant in {skill, skill.replace(' ', ''), skill.replace('.', '')}:
+                        self._variant_columns.setdefault(variant, []).append(column)
+        self._technical_columns = np.array([group == 'technical' for group in self._columns], dtype=bool)
 
     def score_resume(self, resume_data):
         """Score a resume based on multiple criteria."""
@@ -33,14 +81,7 @@ class ResumeScorer:
         }
         
         # Calculate total score with weights
-        weights = {
-            'experience_score': 0.35,
-            'skills_score': 0.30,
-            'education_score': 0.20,
-            'completeness_score': 0.15
-        }
-        
-        total_score = sum(scores[key] * weights[key] for key in weights)
+        total_score = sum(scores[key] * SCORE_WEIGHTS[key] for key in SCORE_WEIGHTS)
         scores['total_score'] = round(total_score)
         
         # Determine experience level
@@ -52,6 +93,136 @@ class ResumeScorer:
         
         return scores
 
+    def score_many(self, resumes, index=None):
+        """Score a batch of resumes with array operations.
+
+        Produces the same experience, skills, education, completeness and
+        total scores (and experience level) as score_resume, one row per
+        resume, but encodes the whole batch into NumPy arrays once instead
+        of looping per resume. Skill breakdowns are not included.
+        """
+        resumes = list(resumes)
+        n = len(resumes)
+        columns = ['experience_score', 'skills_score', 'education_score',
+                   'completeness_score', 'total_score', 'experience_level']
+        if n == 0:
+            return pd.DataFrame(columns=columns, index=index)
+
+        experience_score, experience_count = self._batch_experience_scores(resumes)
+        scores = {
+            'experience_score': experience_score,
+            'skills_score': self._batch_skills_scores(resumes),
+            'education_score': self._batch_education_scores(resumes),
+            'completeness_score': self._batch_completeness_scores(resumes)
+        }
+
+        total = 0
+        for key, weight in SCORE_WEIGHTS.items():
+            total = total + scores[key] * weight
+        scores['total_score'] = np.round(total).astype(int)
+        scores['experience_level'] = np.select(
+            [(total >= 85) & (experience_count >= 3), (total >= 70) & (experience_count >= 2)],
+            ['Expert', 'Intermediate'],
+            default='Beginner'
+        )
+        return pd.DataFrame(scores, columns=columns, index=index)
+
+    @staticmethod
+    def _flatten_entries(resumes, key):
+        """Return (row index per entry, lowercased entries) for a list field."""
+        rows, entries = [], []
+        for i, resume_data in enumerate(resumes):
+            for entry in resume_data.get(key, []) or []:
+                rows.append(i)
+                entries.append(entry)
+        return np.array(rows, dtype=int), pd.Series(entries, dtype=object).str.lower()
+
+    def _batch_experience_scores(self, resumes):
+        n = len(resumes)
+        rows, entries = self._flatten_entries(resumes, 'experience')
+        counts = np.bincount(rows, minlength=n)
+        if len(rows) == 0:
+            return np.zeros(n, dtype=int), counts
+
+        detailed = entries.str.split().str.len().to_numpy() > 10
+        leadership = entries.str.contains('|'.join(map(re.escape, LEADERSHIP_TERMS))).to_numpy()
+        points = 20 + 10 * detailed + 15 * leadership
+        totals = np.bincount(rows, weights=points, minlength=n)
+        return np.minimum(100, totals).astype(int), counts
+
+    def _batch_skills_scores(self, resumes):
+        n = len(resumes)
+        skill_sets = [set(skill.lower() for skill in r.get('skills', [])) for r in resumes]
+        skill_counts = np.array([len(skills) for skills in skill_sets])
+
+        # Encode (resume, matched column) pairs and scatter them into a
+        # resumes x columns indicator matrix in one step
+        rows, cols = [], []
+        for i, skills in enumerate(skill_sets):
+            for skill in skills:
+                for column in self._variant_columns.get(skill, ()):
+                    rows.append(i)
+                    cols.append(column)
+        matched = np.zeros((n, len(self._columns)), dtype=bool)
+        matched[rows, cols] = True
+
+        tech_matches = matched[:, self._technical_columns].sum(axis=1)
+        domain_matches = matched[:, ~self._technical_columns].sum(axis=1)
+        tech_score = np.minimum(100, (tech_matches / 5) * 100)
+        domain_score = np.minimum(100, (domain_matches / 5) * 100)
+
+        # Soft skills are substring matches over the joined skill list
+        joined = pd.Series([' '.join(skills).lower() for skills in skill_sets], dtype=object)
+        soft_matches = np.zeros(n, dtype=int)
+        for _, variations in self._soft_variations:
+            found = np.zeros(n, dtype=bool)
+            for var in variations:
+                found |= joined.str.contains(var, regex=False).to_numpy()
+            soft_matches += found
+        soft_score = np.minimum(100, (soft_matches / 3) * 100)
+
+        base_score = np.minimum(skill_counts * 10, 40)
+        weighted = (tech_score * 0.3) + (soft_score * 0.15) + (domain_score * 0.15) + base_score
+        return np.where(skill_counts > 0, np.round(np.minimum(weighted, 100)), 0).astype(int)
+
+    def _batch_education_scores(self, resumes):
+        n = len(resumes)
+        rows, entries = self._flatten_entries(resumes, 'education')
+        score = np.where(np.bincount(rows, minlength=n) > 0, 40, 0)
+        if len(rows) == 0:
+            return score
+
+        # Weight of the first degree keyword (in DEGREE_WEIGHTS order) per entry
+        degree_hits = np.column_stack([entries.str.contains(degree, regex=False).to_numpy()
+                                       for degree in DEGREE_WEIGHTS])
+        weights = np.array(list(DEGREE_WEIGHTS.values()))
+        entry_weight = np.where(degree_hits.any(axis=1), weights[degree_hits.argmax(axis=1)], 0)
+        prestige = entries.str.contains('|'.join(map(re.escape, PRESTIGIOUS_TERMS))).to_numpy()
+        grade = entries.str.contains('|'.join(map(re.escape, GRADE_TERMS))).to_numpy()
+        bonus = 10 * prestige + 5 * grade
+
+        # Entries are applied in order, so fold position by position across
+        # all resumes at once
+        starts = np.searchsorted(rows, rows)
+        position = np.arange(len(rows)) - starts
+        for k in range(position.max() + 1):
+            at = position == k
+            r = rows[at]
+            score[r] = np.minimum(np.maximum(score[r], entry_weight[at]) + bonus[at], 100)
+        return score
+
+    def _batch_completeness_scores(self, resumes):
+        n = len(resumes)
+        score = np.zeros(n, dtype=int)
+        for section, weight in COMPLETENESS_SECTIONS.items():
+            present = np.array([bool(r.get(section)) for r in resumes])
+            score = score + weight * present
+            if section in ['skills', 'experience', 'education']:
+                detailed = present & np.array([isinstance(r.get(section), list) and len(r.get(section)) >= 3
+                                               for r in resumes])
+                score = np.where(detailed, np.minimum(score + 5, 100), score)
+        return score
+
     def _calculate_experience_score(self, resume_data):
         """Calculate experience score based on work history."""
         experience_list = resume_data.get('experience', [])
@@ -68,8 +239,7 @@ class ResumeScorer:
                 total_score += 10
                 
             # Points for leadership/senior terms
-            leadership_terms = ['lead', 'senior', 'manager', 'supervisor', 'head', 'chief', 'director']
-            if any(term in exp.lower() for term in leadership_terms):
+            if any(term in exp.lower() for term in LEADERSHIP_TERMS):
                 total_score += 15
         
         return min(100, total_score)
@@ -108,16 +278,10 @@ class ResumeScorer:
 
     def _calculate_soft_skills_score(self, skills):
         """Calculate soft skills score."""
+        joined = ' '.join(skills).lower()
         matches = 0
-        for skill in self.soft_skills:
-            # Check for variations of the skill
-            variations = [
-                skill,
-                skill.replace(' ', ''),
-                skill.replace('-', ''),
-                skill.replace(' ', '-')
-            ]
-            if any(var in ' '.join(skills).lower() for var in variations):
+        for skill, variations in self._soft_variations:
+            if any(var in joined for var in variations):
                 matches += 1
         
         # More lenient scoring for soft skills
@@ -132,56 +296,29 @@ class ResumeScorer:
         
         score = 40  # Base score for having any education
         
-        degree_weights = {
-            'phd': 100,
-            'doctorate': 100,
-            'master': 90,
-            'mba': 90,
-            'bachelor': 80,
-            'btech': 80,
-            'bsc': 80,
-            'associate': 70,
-            'diploma': 60,
-            'certification': 50
-        }
-        
         for edu in education:
             edu_lower = edu.lower()
             
             # Check for degree level
-            for degree, weight in degree_weights.items():
+            for degree, weight in DEGREE_WEIGHTS.items():
                 if degree in edu_lower:
                     score = max(score, weight)
                     break
             
             # Additional points for prestigious terms
-            prestigious_terms = [
-                'distinction', 'honors', 'first class', 
-                'magna cum laude', 'summa cum laude',
-                'high distinction', 'merit', 'dean\'s list'
-            ]
-            if any(term in edu_lower for term in prestigious_terms):
+            if any(term in edu_lower for term in PRESTIGIOUS_TERMS):
                 score = min(score + 10, 100)
             
             # Points for GPA or percentage if mentioned
-            if any(term in edu_lower for term in ['gpa', 'cgpa', '%', 'percent']):
+            if any(term in edu_lower for term in GRADE_TERMS):
                 score = min(score + 5, 100)
         
         return score
 
     def _calculate_completeness_score(self, resume_data):
         """Calculate completeness score based on resume sections."""
-        sections = {
-            'name': 10,
-            'email': 10,
-            'mobile_number': 10,
-            'skills': 20,
-            'experience': 25,
-            'education': 25
-        }
-        
         score = 0
-        for section, weight in sections.items():
+        for section, weight in COMPLETENESS_SECTIONS.items():
             if resume_data.get(section):
                 score += weight
                 
@@ -0,0 +1,93 @@
+"""Single-pass segmentation of resume text into sections.
+
+Every line is classified exactly once: a short line that reads like a
+section heading ("Work Experience", "EDUCATION:", "Technical Skills")
+opens that section, and every following line belongs to it until the
+next heading. Lines before the first heading form the contact block.
+Extractors then read only the span they care about.
+"""
+
+import re
+
+# Heading phrases per section; a heading line must start with one of them
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'profile', 'professional profile',
+                'objective', 'career objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience',
+                   'employment', 'employment history', 'work history', 'career history',
+                   'professional background', 'internships', 'internship'],
+    'education': ['education', 'educational qualifications', 'academic qualifications',
+                  'academic background', 'qualifications', 'academics'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'technologies'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'other': ['achievements', 'awards', 'certifications', 'certificates', 'publications',
+              'languages', 'interests', 'hobbies', 'references', 'activities',
+              'extracurricular activities', 'volunteering'],
+}
+SECTIONS = ['contact'] + list(SECTION_HEADINGS)
+
+# Headings are short; longer lines that merely mention a keyword are content
+MAX_HEADING_WORDS = 5
+
+# One alternation over every heading phrase, longest first so
+# "work experience" wins over "work"; the group name is the section
+HEADING_PATTERN = re.compile(
+    '(?:' + '|'.join(
+        f"(?P<{section}>{'|'.join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))})"
+        for section, phrases in SECTION_HEADINGS.items()
+    ) + r')(?![a-z])'
+)
+_HEADING_STRIP = re.compile(r'^[^a-z]+|[^a-z]+$')
+
+
+def heading_section(line):
+    """Return the section a line is a heading for, or None."""
+    if len(line.split()) > MAX_HEADING_WORDS:
+        return None
+    text = _HEADING_STRIP.sub('', line.lower())
+    match = HEADING_PATTERN.match(text)
+    return match.lastgroup if match else None
+
+
+class ResumeSections:
+    """Sections of a resume as spans of line indexes.
+
+    ``spans`` maps a section to a list of ``(start, end)`` ranges over
+    ``lines`` (end exclusive, heading line excluded); a section that
+    appears more than once has several spans. ``labels`` holds the
+    section of every line, with headings labelled by the section they open.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.labels = []
+        self.spans = {}
+        self.headings = []
+
+        current, start = 'contact', 0
+        for index, line in enumerate(lines):
+            section = heading_section(line)
+            if section is None:
+                self.labels.append(current)
+                continue
+            self._close(current, start, index)
+            self.headings.append((index, section))
+            self.labels.append(section)
+            current, start = section, index + 1
+        self._close(current, start, len(lines))
+
+    def _close(self, section, start, end):
+        if end > start:
+            self.spans.setdefault(section, []).append((start, end))
+
+    def has(self, section):
+        return section in self.spans
+
+    def section_lines(self, section):
+        """Return the lines of a section, in document order."""
+        return [line
+                for start, end in self.spans.get(section, [])
+                for line in self.lines[start:end]]
+
+    def section_text(self, section):
+        return '\n'.join(self.section_lines(section))
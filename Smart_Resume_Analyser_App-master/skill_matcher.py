@@ -0,0 +1,93 @@
+"""Compiled multi-pattern skill matching for resume text."""
+
+import re
+from collections import Counter
+
+
+def normalize_term(term):
+    """Lowercase a skill or matched span and collapse internal whitespace."""
+    return ' '.join(term.lower().split())
+
+
+def _build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node):
+    """Turn a character trie into a regex whose alternations share prefixes.
+
+    Because every branch point only ever offers distinct next characters,
+    the regex engine never re-scans a common prefix, so matching stays
+    linear in the text no matter how many skills are loaded.
+    """
+    if list(node) == ['']:
+        return None
+
+    branches = []
+    for ch in sorted(k for k in node if k):
+        # A space in a multi-word skill matches any run of whitespace,
+        # so "machine\nlearning" from a wrapped PDF line still counts
+        piece = r'\s+' if ch == ' ' else re.escape(ch)
+        sub = _trie_to_regex(node[ch])
+        branches.append(piece if sub is None else piece + sub)
+
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+class SkillMatcher:
+    """Find every known skill in a text with a single linear scan.
+
+    ``skills`` is an iterable of canonical skill names; ``aliases`` maps
+    alternative spellings to their canonical name. Matches must sit on
+    word boundaries, so "r" no longer matches inside "react" and "java"
+    no longer matches inside "javascript".
+    """
+
+    def __init__(self, skills, aliases=None):
+        self.canonical = {}
+        for skill in skills:
+            self._add(skill, skill)
+        for alias, skill in (aliases or {}).items():
+            self._add(alias, skill)
+
+        pattern = _trie_to_regex(_build_trie(self.canonical))
+        self.regex = re.compile(r'(?<!\w)' + pattern + r'(?!\w)', re.IGNORECASE)
+
+    def _add(self, term, skill):
+        term = normalize_term(term)
+        self.canonical[term] = skill
+        # Also accept the spelling without dots, e.g. "aspnet" for "asp.net"
+        undotted = term.replace('.', '')
+        if undotted and undotted != term:
+            self.canonical.setdefault(undotted, skill)
+
+    def finditer(self, text):
+        """Yield (skill, start, end) for every match in text."""
+        for match in self.regex.finditer(text):
+            skill = self.canonical.get(normalize_term(match.group()))
+            if skill is not None:
+                yield skill, match.start(), match.end()
+
+    def scan(self, text):
+        """Return {skill: [(start, end), ...]} for every skill found in text."""
+        positions = {}
+        for skill, start, end in self.finditer(text):
+            positions.setdefault(skill, []).append((start, end))
+        return positions
+
+    def count(self, text):
+        """Return a Counter of how many times each skill occurs in text."""
+        return Counter(skill for skill, _, _ in self.finditer(text))
+
+    def find(self, text):
+        """Return the distinct skills found in text, in order of first occurrence."""
+        return list(self.scan(text))
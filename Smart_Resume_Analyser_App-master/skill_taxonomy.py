@@ -0,0 +1,109 @@
+"""Skill taxonomy shared by the parser, scorer and recommenders.
+
+The vocabulary lives in skill_taxonomy.json and is compiled once per
+process into lookup indexes, so consumers query dictionaries instead of
+rebuilding literal lists on every call.
+"""
+
+import json
+from functools import lru_cache
+from constants import TAXONOMY_FILE
+from skill_matcher import SkillMatcher, normalize_term
+
+
+class SkillTaxonomy:
+    """In-memory indexes over a loaded taxonomy file.
+
+    Categories belong to a group: ``stack`` and ``education`` form the
+    vocabulary extracted from resumes, ``technical``, ``soft`` and
+    ``domain`` drive scoring, and any category may carry courses.
+    """
+
+    def __init__(self, data):
+        self.version = data.get('version', 1)
+        self.categories = data['categories']
+        self.fields = data.get('fields', {})
+        self.related_skills = data.get('related_skills', {})
+
+        # alias -> canonical skill
+        self.aliases = {normalize_term(alias): skill
+                        for alias, skill in data.get('aliases', {}).items()}
+
+        # category -> skills, canonical skill -> categories, group -> categories
+        self.category_skills = {}
+        self.skill_categories = {}
+        self.group_categories = {}
+        # category -> [(title, url), ...]
+        self.category_courses = {}
+        for name, category in self.categories.items():
+            skills = [normalize_term(skill) for skill in category.get('skills', [])]
+            self.category_skills[name] = skills
+            for skill in skills:
+                self.skill_categories.setdefault(skill, []).append(name)
+            self.group_categories.setdefault(category.get('group', ''), []).append(name)
+            if category.get('courses'):
+                self.category_courses[name] = [tuple(course) for course in category['courses']]
+
+        # field keyword -> field; the first field listing a keyword wins
+        self.keyword_fields = {}
+        for field, info in self.fields.items():
+            for keyword in info.get('keywords', []):
+                self.keyword_fields.setdefault(normalize_term(keyword), field)
+
+    @classmethod
+    def load(cls, path=TAXONOMY_FILE):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def canonicalize(self, term):
+        """Map an alias or differently cased spelling to its canonical skill."""
+        term = normalize_term(term)
+        return self.aliases.get(term, term)
+
+    def categories_in_group(self, group):
+        """Return {category: [skills]} for every category in a group."""
+        return {name: self.category_skills[name]
+                for name in self.group_categories.get(group, [])}
+
+    def skills_in_groups(self, *groups):
+        """Return the distinct skills of the given groups, in file order."""
+        skills = {}
+        for group in groups:
+            for name in self.group_categories.get(group, []):
+                for skill in self.category_skills[name]:
+                    skills.setdefault(skill, None)
+        return list(skills)
+
+    @lru_cache(maxsize=None)
+    def matcher(self, *groups):
+        """Return a compiled SkillMatcher over the given groups' skills."""
+        skills = self.skills_in_groups(*groups)
+        known = set(skills)
+        aliases = {alias: skill for alias, skill in self.aliases.items() if skill in known}
+        return SkillMatcher(skills, aliases)
+
+    def field_for_skill(self, skill):
+        """Return the career field a skill points to, or None."""
+        return self.keyword_fields.get(self.canonicalize(skill))
+
+    def field_courses(self, field):
+        return [list(course) for course in self.fields.get(field, {}).get('courses', [])]
+
+    def field_recommended_skills(self, field):
+        return list(self.fields.get(field, {}).get('recommended_skills', []))
+
+    @lru_cache(maxsize=4096)
+    def related_skills_for(self, skill):
+        """Return skills worth learning next for a skill the candidate has."""
+        skill = normalize_term(skill)
+        related = []
+        for trigger, skills in self.related_skills.items():
+            if trigger in skill or skill in trigger:
+                related.extend(skills)
+        return tuple(related)
+
+
+@lru_cache(maxsize=1)
+def get_taxonomy():
+    """Load the taxonomy file once per process."""
+    return SkillTaxonomy.load()
@@ -0,0 +1,9 @@
+"""Test setup: import the app's flat modules and keep databases out of the tree."""
+
+import os
+import sys
+import tempfile
+
+# constants reads RESUME_DATA_DIR at import, so this must run before any app module loads
+os.environ['RESUME_DATA_DIR'] = tempfile.mkdtemp(prefix='resume_tests_')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
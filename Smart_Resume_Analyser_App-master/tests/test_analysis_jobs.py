@@ -0,0 +1,35 @@
+import json
+import os
+
+import analysis_jobs
+from analysis_jobs import claim_job, finish_job, get_job, prune_finished_jobs, submit_job
+from constants import USERS_DB
+from data_access import migrate, transaction
+from login import USERS_MIGRATIONS
+
+
+def test_prune_deletes_old_jobs_and_unused_uploads(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_jobs, 'UPLOAD_DIR', str(tmp_path / 'uploads'))
+    db_path = str(tmp_path / 'analysis_jobs.db')
+    migrate(USERS_DB, USERS_MIGRATIONS)
+
+    jobs = [submit_job('resume.pdf', b'%PDF-1.4', 'jane', db_path) for _ in range(3)]
+    for _ in jobs:
+        job_id, _, _, worker = claim_job(db_path)
+        finish_job(job_id, worker, {'notes': []}, db_path)
+    old, applied, recent = jobs
+    with transaction(db_path) as conn:
+        conn.execute('UPDATE analysis_jobs SET finished_at = 0 WHERE id != ?', (recent,))
+    # A company can still download the resume sent with an application
+    applied_path = os.path.join(analysis_jobs.UPLOAD_DIR, applied, 'resume.pdf')
+    with transaction(USERS_DB) as conn:
+        application_id = conn.execute('''INSERT INTO applications
+                                         (applicant_username, company_username, resume_score)
+                                         VALUES ('jane', 'acme', '70')''').lastrowid
+        conn.execute('INSERT INTO application_resumes VALUES (?, ?)',
+                     (application_id, json.dumps({'original_resume_path': applied_path})))
+
+    assert prune_finished_jobs(db_path=db_path) == 2
+    assert [get_job(job_id, 'jane', db_path) is not None for job_id in jobs] == [False, False, True]
+    assert [os.path.isdir(os.path.join(analysis_jobs.UPLOAD_DIR, job_id)) for job_id in jobs] == \
+        [False, True, True]
@@ -0,0 +1,42 @@
+from company_stats import check_company_stats, rebuild_company_stats
+from data_access import get_connection, migrate, transaction
+from login import USERS_MIGRATIONS
+
+STATS_QUERIES = [
+    'SELECT * FROM company_status_stats WHERE applications != 0 ORDER BY company_username, status',
+    'SELECT * FROM company_daily_stats WHERE applications != 0 ORDER BY company_username, day',
+]
+
+
+def _stats(conn):
+    return [conn.execute(query).fetchall() for query in STATS_QUERIES]
+
+
+def test_triggers_match_rebuild_after_insert_update_and_delete(tmp_path):
+    db_path = str(tmp_path / 'users.db')
+    migrate(db_path, USERS_MIGRATIONS)
+    conn = get_connection(db_path)
+
+    changes = [
+        ('''INSERT INTO applications
+            (applicant_username, company_username, resume_score, application_date, status)
+            VALUES (?, ?, ?, ?, ?)''', [
+            ('jane', 'acme', '72', '2024-01-02 10:00:00', 'pending'),
+            ('raj', 'acme', '55.5', '2024-01-02 15:00:00', 'pending'),
+            ('lee', 'acme', '', '2024-01-03 09:00:00', 'pending'),
+            ('jane', 'globex', None, '2024-01-03 11:00:00', 'pending'),
+        ]),
+        ('UPDATE applications SET status = ? WHERE id = ?', [('accepted', 1), ('rejected', 3)]),
+        ('UPDATE applications SET resume_score = ? WHERE id = ?', [('90', 3), ('', 2)]),
+        ('UPDATE applications SET company_username = ?, application_date = ? WHERE id = ?',
+         [('globex', '2024-02-01 08:00:00', 2)]),
+        ('DELETE FROM applications WHERE id = ?', [(1,), (4,)]),
+    ]
+    for statement, rows in changes:
+        with transaction(db_path) as conn:
+            conn.executemany(statement, rows)
+        assert check_company_stats(conn) == []
+        maintained = _stats(conn)
+        with transaction(db_path) as conn:
+            rebuild_company_stats(conn)
+        assert _stats(conn) == maintained, statement
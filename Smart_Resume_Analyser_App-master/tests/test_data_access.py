@@ -0,0 +1,39 @@
+import threading
+
+from data_access import get_connection
+
+
+def _in_thread(target):
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def test_connections_outlive_the_threads_that_used_them(tmp_path):
+    db_path = str(tmp_path / 'pool.db')
+    used = []
+
+    def rerun():
+        conn = get_connection(db_path)
+        conn.execute('SELECT 1')
+        used.append(conn)
+
+    # Like Streamlit reruns: one short-lived thread after another
+    for _ in range(3):
+        _in_thread(rerun)
+    assert used[0] is used[1] is used[2]
+
+    # Threads running at the same time never share a connection
+    ready = threading.Barrier(2)
+    concurrent = []
+
+    def session():
+        concurrent.append(get_connection(db_path))
+        ready.wait()
+
+    threads = [threading.Thread(target=session) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert concurrent[0] is not concurrent[1]
@@ -0,0 +1,60 @@
+import sqlite3
+
+from company_stats import check_company_stats, get_company_stats
+from data_access import get_connection, migrate
+from login import USERS_MIGRATIONS, decode_resume_data
+
+# users.db as created before the versioned migrations, at user_version 0
+BASELINE_SCHEMA = [
+    '''CREATE TABLE users
+       (username TEXT PRIMARY KEY,
+        password TEXT NOT NULL,
+        user_type TEXT NOT NULL)''',
+    '''CREATE TABLE applications
+       (id INTEGER PRIMARY KEY AUTOINCREMENT,
+        applicant_username TEXT NOT NULL,
+        company_username TEXT NOT NULL,
+        resume_data TEXT NOT NULL,
+        resume_score TEXT,
+        application_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'pending',
+        FOREIGN KEY (applicant_username) REFERENCES users(username),
+        FOREIGN KEY (company_username) REFERENCES users(username))''',
+]
+
+
+def test_users_migrations_upgrade_a_baseline_database(tmp_path):
+    db_path = str(tmp_path / 'users.db')
+    legacy_resume = {'name': 'Jane Doe', 'skills': ['python', 'sql'], 'no_of_pages': 1}
+    conn = sqlite3.connect(db_path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    conn.executemany('INSERT INTO users VALUES (?, ?, ?)',
+                     [('jane', 'x', 'normal'), ('acme', 'x', 'admin')])
+    # Older versions stored the resume with str(dict)
+    conn.executemany('''INSERT INTO applications
+                        (applicant_username, company_username, resume_data, resume_score,
+                         application_date, status)
+                        VALUES (?, ?, ?, ?, ?, ?)''', [
+        ('jane', 'acme', str(legacy_resume), '72', '2024-01-02 10:00:00', 'pending'),
+        ('jane', 'acme', '{"name": "Jane Doe"}', '', '2024-01-03 09:30:00', 'accepted'),
+    ])
+    conn.commit()
+    conn.close()
+
+    migrate(db_path, USERS_MIGRATIONS)
+
+    conn = get_connection(db_path)
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == USERS_MIGRATIONS[-1][0]
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(applications)')]
+    assert 'resume_data' not in columns
+    assert conn.execute('SELECT COUNT(*) FROM applications').fetchone()[0] == 2
+
+    payloads = dict(conn.execute('SELECT application_id, resume_data FROM application_resumes'))
+    assert decode_resume_data(payloads[1]) == legacy_resume
+    assert decode_resume_data(payloads[2]) == {'name': 'Jane Doe'}
+
+    assert check_company_stats(conn) == []
+    stats = get_company_stats(db_path, 'acme')
+    assert stats['by_status'] == {'pending': 1, 'accepted': 1}
+    assert stats['scored'] == 1 and stats['mean'] == 72
@@ -0,0 +1,50 @@
+import pytest
+
+from resume_analysis import build_analysis, get_or_build_analysis, load_analysis, resume_hash
+from resume_scorer import ResumeScorer
+
+RESUME = {
+    'name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'mobile_number': '+1 555-000-0000',
+    'skills': ['Python', 'SQL', 'Machine Learning', 'Leadership'],
+    'experience': ['Senior data engineer leading a team of five building pipelines on AWS'],
+    'education': ['Master of Science in Computer Science, GPA 3.9'],
+    'no_of_pages': 2,
+}
+
+
+class CountingScorer(ResumeScorer):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def score_resume(self, resume_data):
+        self.calls += 1
+        return super().score_resume(resume_data)
+
+
+def test_analysis_cannot_be_changed():
+    analysis = build_analysis(dict(RESUME), ResumeScorer())
+
+    with pytest.raises(AttributeError):
+        analysis.total_score = 100
+    with pytest.raises(TypeError):
+        analysis.score_details['total_score'] = 100
+    with pytest.raises(AttributeError):
+        analysis.strengths.append({})
+
+
+def test_stored_analysis_round_trips_and_is_reused(tmp_path):
+    db_path = str(tmp_path / 'resume_analyses.db')
+    scorer = CountingScorer()
+
+    built = get_or_build_analysis(dict(RESUME, original_resume_path='/tmp/a.pdf'), scorer, db_path)
+    # The upload path does not change the resume's identity
+    again = get_or_build_analysis(dict(RESUME, original_resume_path='/tmp/b.pdf'), scorer, db_path)
+
+    assert scorer.calls == 1
+    assert built.resume_hash == resume_hash(RESUME)
+    assert again.to_dict() == built.to_dict()
+    assert load_analysis(built.resume_hash, db_path).to_dict() == built.to_dict()
+    assert load_analysis(resume_hash(dict(RESUME, name='John Doe')), db_path) is None
@@ -0,0 +1,41 @@
+import random
+
+from resume_scorer import ResumeScorer, DEGREE_WEIGHTS, PRESTIGIOUS_TERMS, LEADERSHIP_TERMS
+from skill_taxonomy import get_taxonomy
+
+SCORE_COLUMNS = ['experience_score', 'skills_score', 'education_score',
+                 'completeness_score', 'total_score', 'experience_level']
+
+
+def _random_resume(rng, skills):
+    experience = [' '.join(rng.choice(['built', 'services', 'for', 'the', 'team'] + LEADERSHIP_TERMS)
+                           for _ in range(rng.randint(2, 14)))
+                  for _ in range(rng.randint(0, 5))]
+    education = [f"{rng.choice(list(DEGREE_WEIGHTS) + ['school'])} "
+                 f"{rng.choice(PRESTIGIOUS_TERMS + ['', 'GPA 3.8', '85%'])}"
+                 for _ in range(rng.randint(0, 3))]
+    return {
+        'name': rng.choice(['Jane Doe', '']),
+        'email': rng.choice(['jane@example.com', None]),
+        'mobile_number': rng.choice(['+1 555-000-0000', '']),
+        'skills': rng.sample(skills, rng.randint(0, 12)),
+        'experience': experience,
+        'education': education,
+    }
+
+
+def test_score_many_matches_score_resume():
+    rng = random.Random(6)
+    taxonomy = get_taxonomy()
+    skills = sorted(taxonomy.skills_in_groups('technical', 'soft', 'domain'))
+    skills += ['Python', 'node.js', 'Team Work', 'unknown skill']
+    resumes = [_random_resume(rng, skills) for _ in range(300)]
+    resumes += [{}, {'skills': [], 'experience': [], 'education': []}]
+
+    scorer = ResumeScorer()
+    batch = scorer.score_many(resumes)
+
+    assert len(batch) == len(resumes)
+    for i, resume in enumerate(resumes):
+        single = scorer.score_resume(resume)
+        assert batch.iloc[i].tolist() == [single[column] for column in SCORE_COLUMNS], resume
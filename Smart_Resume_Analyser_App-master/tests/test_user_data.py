@@ -0,0 +1,62 @@
+from data_access import get_connection, migrate, transaction
+from database_utils import USER_DATA_MIGRATIONS, _upsert_analysed_user_data
+from dedupe_user_data import dedupe_user_data, find_duplicates
+
+ROW = {
+    'Analysis_ID': 'a' * 64,
+    'Name': 'Jane Doe',
+    'Email': 'jane@example.com',
+    'Resume_Score': 72,
+    'Total_Page': 1,
+    'Predicted_Field': 'Data Science',
+    'User_Level': 'Mid Level',
+    'Actual_Skills': 'python, sql',
+    'Recommended_Skills': 'pandas',
+    'Recommended_Courses': '',
+    'PDF_Name': 'jane.pdf',
+}
+CONTENT = 'Name, Email, Resume_Score, Predicted_Field, User_Level, PDF_Name'
+
+
+def _user_data_db(tmp_path):
+    db_path = str(tmp_path / 'resume_data.db')
+    migrate(db_path, USER_DATA_MIGRATIONS)
+    return db_path
+
+
+def test_upsert_is_idempotent(tmp_path):
+    db_path = _user_data_db(tmp_path)
+    query = f'SELECT Analysis_ID, {CONTENT} FROM user_data'
+
+    _upsert_analysed_user_data(db_path, ROW)
+    first = get_connection(db_path).execute(query).fetchall()
+    _upsert_analysed_user_data(db_path, ROW)
+    assert get_connection(db_path).execute(query).fetchall() == first
+
+    _upsert_analysed_user_data(db_path, dict(ROW, Resume_Score=80))
+    rows = get_connection(db_path).execute('SELECT Resume_Score FROM user_data').fetchall()
+    assert rows == [(80,)]
+
+
+def test_find_duplicates_keeps_the_latest_row(tmp_path):
+    db_path = _user_data_db(tmp_path)
+    # Rows written before Analysis_ID existed, one copy per page rerun
+    with transaction(db_path) as conn:
+        conn.execute('DROP INDEX idx_user_data_analysis')
+        conn.executemany(f'''INSERT INTO user_data ({CONTENT}, Analysis_ID)
+                             VALUES (?, ?, ?, ?, ?, ?, ?)''', [
+            ('Jane Doe', 'jane@example.com', 72, 'Data Science', 'Mid Level', 'jane.pdf', None),
+            ('Raj Patel', 'raj@example.com', 60, 'Web', 'Entry Level', 'raj.pdf', None),
+            ('Jane Doe', 'jane@example.com', 72, 'Data Science', 'Mid Level', 'jane.pdf', None),
+            ('Jane Doe', 'jane@example.com', 75, 'Data Science', 'Mid Level', 'jane.pdf', 'b' * 64),
+            ('Jane Doe', 'jane@example.com', 78, 'Data Science', 'Mid Level', 'jane.pdf', 'b' * 64),
+        ])
+
+    rows, duplicates = find_duplicates(get_connection(db_path))
+    assert rows == 5
+    assert sorted(duplicates) == [1, 4]
+
+    assert dedupe_user_data(db_path) == (5, 2)
+    kept = get_connection(db_path).execute(
+        'SELECT rowid, Name, Resume_Score FROM user_data ORDER BY rowid').fetchall()
+    assert kept == [(2, 'Raj Patel', 60), (3, 'Jane Doe', 72), (5, 'Jane Doe', 78)]
@@ -1,7 +1,6 @@
 """UI utility functions for the resume analyzer."""
 
 import streamlit as st
-import base64
 from constants import TYPING_MESSAGES
 
 def get_custom_css():
@@ -129,13 +128,6 @@ def show_header():
         </div>
     ''', unsafe_allow_html=True)
 
-def get_table_download_link(df, filename, text):
-    """Generate a link to download the dataframe as CSV."""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'data:file/csv;base64,{b64}'
-    return f'<a href="{href}" download="{filename}">{text}</a>'
-
 def create_score_bar(label, score, color):
     """Create a compact score bar with label and value."""
     st.markdown(f"""
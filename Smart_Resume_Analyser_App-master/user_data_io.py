@@ -0,0 +1,236 @@
+"""Stream analysis results (the user_data table) to and from CSV or Parquet.
+
+Usage:
+    python user_data_io.py export results.parquet --min-score 60 --field "Data Science"
+    python user_data_io.py export results.csv --since 2024-01-01 --level Expert
+    python user_data_io.py import results.parquet
+
+Rows move between SQLite and the file EXPORT_CHUNK_ROWS at a time, so
+memory use does not grow with the table. Imported rows that carry an
+Analysis_ID replace the row with the same id; other rows are appended
+unless the table already has a row with the same content (see
+dedupe_user_data), so importing a file twice adds nothing. Parquet files
+need pyarrow.
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from itertools import islice
+from data_access import get_connection, migrate, transaction
+from database_utils import get_resume_db_path, query_user_data, USER_DATA_MIGRATIONS
+from db_migrations import run_migrations
+from dedupe_user_data import content_columns, content_key
+from constants import EXPORT_CHUNK_ROWS, EXPORT_DIR, EXPORT_MAX_AGE_SECONDS
+
+FORMATS = ('csv', 'parquet')
+
+# Parquet column types by declared SQLite type; anything else is a string
+_ARROW_TYPES = {'INTEGER': 'int64', 'REAL': 'float64'}
+
+
+def infer_format(path, fmt=None):
+    """Return the file format, from fmt or else the file extension."""
+    fmt = fmt or path.rsplit('.', 1)[-1].lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'; use one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _user_data_columns(db_path):
+    """Return [(column, declared type)] of the user_data table."""
+    migrate(db_path, USER_DATA_MIGRATIONS)
+    return [(row[1], row[2].upper()) for row in
+            get_connection(db_path).execute('PRAGMA table_info(user_data)')]
+
+
+def _as_number(value, kind):
+    # SQLite does not enforce column types; older rows may hold numbers as text
+    if value is None or value == '':
+        return None
+    try:
+        return int(float(value)) if kind == 'int64' else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _write_csv(path, columns, chunks):
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            written += len(rows)
+    return written
+
+
+def _write_parquet(path, columns, chunks, declared):
+    pa = _pyarrow()
+    kinds = [_ARROW_TYPES.get(declared.get(column), 'string') for column in columns]
+    schema = pa.schema([(column, kind) for column, kind in zip(columns, kinds)])
+    written = 0
+    with pa.parquet.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            arrays = []
+            for index, kind in enumerate(kinds):
+                values = [row[index] for row in rows]
+                if kind == 'string':
+                    values = [None if value is None else str(value) for value in values]
+                else:
+                    values = [_as_number(value, kind) for value in values]
+                arrays.append(pa.array(values, type=kind))
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            written += len(rows)
+    return written
+
+
+def export_user_data(path, fmt=None, chunk_size=EXPORT_CHUNK_ROWS, **filters):
+    """Write the matching user_data rows to path; return the number written.
+
+    filters are the arguments of database_utils.user_data_filters.
+    """
+    fmt = infer_format(path, fmt)
+    declared = dict(_user_data_columns(get_resume_db_path()))
+    columns, chunks = query_user_data(chunk_size, **filters)
+    if fmt == 'csv':
+        return _write_csv(path, columns, chunks)
+    return _write_parquet(path, columns, chunks, declared)
+
+
+def prune_exports(directory=EXPORT_DIR, max_age=EXPORT_MAX_AGE_SECONDS):
+    """Delete files in directory last modified more than max_age seconds ago."""
+    cutoff = time.time() - max_age
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _read_csv(path, chunk_size):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield rows
+
+
+def _read_parquet(path, chunk_size):
+    pa = _pyarrow()
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+def _content_keys(conn, columns):
+    """Return the content keys of the user_data rows, over the given columns."""
+    query = 'SELECT rowid{} FROM user_data'.format(''.join(f', "{column}"' for column in columns))
+    return {content_key(values) for _, *values in conn.execute(query)}
+
+
+def import_user_data(path, fmt=None, chunk_size=EXPORT_CHUNK_ROWS):
+    """Load rows from a CSV or Parquet export into user_data.
+
+    Columns that user_data does not have, and ID, are ignored; empty
+    values are stored as NULL. Rows without an Analysis_ID whose content
+    matches a stored or earlier imported row are skipped. Returns
+    (rows loaded, duplicates skipped).
+    """
+    fmt = infer_format(path, fmt)
+    db_path = get_resume_db_path()
+    known = [column for column, _ in _user_data_columns(db_path) if column != 'ID']
+    chunks = _read_csv(path, chunk_size) if fmt == 'csv' else _read_parquet(path, chunk_size)
+
+    loaded = skipped = 0
+    statement = columns = content = seen = None
+    for rows in chunks:
+        if statement is None:
+            columns = [column for column in known if column in rows[0]]
+            if not columns:
+                raise ValueError(f"{path} has none of the user_data columns")
+            content = content_columns(columns)
+            statement = 'INSERT INTO user_data ({}) VALUES ({})'.format(
+                ', '.join(columns), ', '.join('?' for _ in columns))
+            updates = [f'{column} = excluded.{column}' for column in columns if column != 'Analysis_ID']
+            if 'Analysis_ID' in columns:
+                statement += (' ON CONFLICT (Analysis_ID) DO UPDATE SET ' + ', '.join(updates)
+                              if updates else ' ON CONFLICT (Analysis_ID) DO NOTHING')
+        values = []
+        for row in rows:
+            if not row.get('Analysis_ID'):
+                # Keys of the stored rows are only read once a row needs them
+                if seen is None:
+                    seen = _content_keys(get_connection(db_path), content)
+                key = content_key(row.get(column) for column in content)
+                if key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+            values.append(tuple(None if row.get(column) == '' else row.get(column)
+                                for column in columns))
+        with transaction(db_path) as conn:
+            conn.executemany(statement, values)
+        loaded += len(values)
+    return loaded, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export or import analysis results.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='Write user_data rows to a CSV or Parquet file')
+    export.add_argument('path', help='Output file (.csv or .parquet)')
+    export.add_argument('--min-score', type=float, help='Lowest resume score to include')
+    export.add_argument('--max-score', type=float, help='Highest resume score to include')
+    export.add_argument('--since', dest='date_from', help='First day to include (YYYY-MM-DD)')
+    export.add_argument('--until', dest='date_to', help='Last day to include (YYYY-MM-DD)')
+    export.add_argument('--field', dest='fields', action='append',
+                        help='Predicted field to include; repeat for several')
+    export.add_argument('--level', dest='levels', action='append',
+                        help='Candidate level to include; repeat for several')
+
+    load = commands.add_parser('import', help='Load user_data rows from a CSV or Parquet file')
+    load.add_argument('path', help='Input file (.csv or .parquet)')
+
+    for command in (export, load):
+        command.add_argument('--format', choices=FORMATS,
+                             help='File format (default: inferred from the extension)')
+        command.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_ROWS,
+                             help=f'Rows per chunk (default: {EXPORT_CHUNK_ROWS})')
+    args = parser.parse_args(argv)
+
+    run_migrations()
+    try:
+        if args.command == 'export':
+            count = export_user_data(
+                args.path, args.format, args.chunk_size,
+                min_score=args.min_score, max_score=args.max_score,
+                date_from=args.date_from, date_to=args.date_to,
+                fields=args.fields, levels=args.levels)
+            print(f"Exported {count} rows to {args.path}")
+        else:
+            count, skipped = import_user_data(args.path, args.format, args.chunk_size)
+            print(f"Imported {count} rows from {args.path}, skipped {skipped} duplicates")
+    except (ImportError, ValueError, OSError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
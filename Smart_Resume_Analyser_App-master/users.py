@@ -1,37 +0,0 @@
-import sqlite3
-import hashlib
-import os
-
-def init_db():
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (username TEXT PRIMARY KEY, password TEXT, email TEXT)''')
-    conn.commit()
-    conn.close()
-
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def add_user(username, password, email):
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    try:
-        hashed_pw = hash_password(password)
-        c.execute("INSERT INTO users VALUES (?, ?, ?)", (username, hashed_pw, email))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
-    finally:
-        conn.close()
-
-def verify_user(username, password):
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute("SELECT password FROM users WHERE username=?", (username,))
-    result = c.fetchone()
-    conn.close()
-    if result:
-        return result[0] == hash_password(password)
-    return False